@@ -59,4 +59,17 @@ user_not_found_exception = HTTPException(
 update_ban_status_exception = HTTPException(
     status_code=status.HTTP_400_BAD_REQUEST,
     detail="Failed to update user's ban status"
+)
+
+
+update_password_hash_exception = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Failed to update user's password hash"
+)
+
+
+password_hashing_busy_exception = HTTPException(
+    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    detail="Too many password checks in progress, try again later",
+    headers={"Retry-After": "1"},
 )
\ No newline at end of file
@@ -0,0 +1,48 @@
+import base64
+import binascii
+import json
+from typing import Sequence
+
+from fastapi import HTTPException, Response, status
+
+
+# Заголовок с курсором следующей страницы
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(after_id: int) -> str:
+    payload = json.dumps({"after_id": after_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        after_id = payload["after_id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        after_id = None
+    if not isinstance(after_id, int) or after_id < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return after_id
+
+
+def resolve_after_id(cursor: str | None, skip: int) -> int | None:
+    """Курсор переключает выборку на keyset (WHERE id > after_id) вместо OFFSET."""
+    if cursor is None:
+        return None
+    if skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' and 'skip' can not be used together"
+        )
+    return decode_cursor(cursor)
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    # Неполная страница - последняя, курсор не нужен
+    if items and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable
+
+from auth.custom_exceptions import password_hashing_busy_exception
+from auth.utils import get_password_rounds, hash_password, validate_password
+from config import settings
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """bcrypt в отдельном пуле процессов.
+
+    Хэширование и проверка пароля занимают CPU на сотни миллисекунд; в пуле
+    процессов они не держат event loop и потоки Starlette. Очередь ограничена:
+    если в работе уже max_pending операций, новая сразу получает 429,
+    а не ждет в очереди за всей пачкой входов.
+    """
+    executor: ProcessPoolExecutor | None = None
+
+    def __init__(self, rounds: int, workers: int, max_pending: int) -> None:
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        # Счетчик меняется только в event loop, блокировка не нужна
+        self.pending = 0
+
+    def start(self) -> None:
+        if self.executor is None:
+            # spawn: дочерние процессы не наследуют потоки и соединения с БД родителя
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers or None,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("Password hashing pool started")
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+            logger.info("Password hashing pool stopped")
+
+    async def run(self, func: Callable, *args):
+        if self.pending >= self.max_pending:
+            raise password_hashing_busy_exception
+        self.start()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args))
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> bytes:
+        return await self.run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: bytes) -> bool:
+        return await self.run(validate_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        return get_password_rounds(hashed_password) != self.rounds
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.password_hashing.bcrypt_rounds,
+    workers=settings.password_hashing.workers,
+    max_pending=settings.password_hashing.max_pending,
+)
+
+
+# Зависимость для получения пула хэширования паролей
+def get_password_hasher() -> PasswordHasher:
+    return password_hasher
@@ -7,7 +7,7 @@ from fastapi import (
     Depends,
     status
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import db_helper
 from service.user_service import UserService, get_user_service
 from auth.schemas import TokenInfo, UserIn, UserOut
@@ -46,13 +46,13 @@ router = APIRouter(
     summary="Create new user",
     status_code=status.HTTP_201_CREATED,
 )
-def create_user_handler(
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+async def create_user_handler(
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     user_service: Annotated[UserService, Depends(get_user_service)],
     user_in: UserIn
 ):
     # Get user by email
-    user: UserOut = user_service.get_user_by_email(
+    user: UserOut = await user_service.get_user_by_email(
         session=session,
         email=user_in.email
     )
@@ -63,7 +63,7 @@ def create_user_handler(
         raise user_already_exists_exception
     try:
         # Create user using repository for user
-        user_id = user_service.register_user(
+        user_id = await user_service.register_user(
             session=session,
             user_in=user_in
         )
@@ -84,12 +84,12 @@ def create_user_handler(
     summary="Create access and refresh tokens for user", 
     response_model=TokenInfo
 )
-def login_handler(
+async def login_handler(
     user: Annotated[UserOut, Depends(validate_auth_user)],
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     user_service: Annotated[UserService, Depends(get_user_service)]
 ) -> TokenInfo:
-    is_admin: bool = user_service.check_user_is_admin(
+    is_admin: bool = await user_service.check_user_is_admin(
         session=session, 
         user_in=user
     )
@@ -115,7 +115,7 @@ def login_handler(
     status_code=status.HTTP_201_CREATED,
     summary="Create new access token"
 )
-def auth_refresh_jwt(
+async def auth_refresh_jwt(
     user: Annotated[UserOut, Depends(get_current_auth_user_for_refresh)]
 ) -> TokenInfo: 
     # можно выпускать еще refresh токен при обновлении access (некоторые так делают)
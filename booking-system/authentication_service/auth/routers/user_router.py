@@ -6,12 +6,14 @@ from fastapi import (
     APIRouter, 
     Depends,
     Query, 
+    Response,
     status
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import db_helper
 from service.user_service import UserService, get_user_service
 from auth.schemas import UserIn, UserOut
+from auth.pagination import resolve_after_id, set_next_cursor
 
 
 from auth.validation import (
@@ -39,7 +41,7 @@ router = APIRouter(
     "/me/", 
     summary="Get user info",
 )
-def auth_user_check_self_info(
+async def auth_user_check_self_info(
     payload: Annotated[dict, Depends(get_current_token_payload)],
     user: Annotated[UserOut, Depends(get_current_active_auth_user)]
 ):
@@ -55,19 +57,24 @@ def auth_user_check_self_info(
     response_model=list[UserOut],
     summary="Get all users info"
 )
-def get_all_users(
+async def get_all_users(
+    response: Response,
     user_service: Annotated[UserService, Depends(get_user_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     admin: Annotated[UserIn, Depends(get_current_active_auth_user_admin)],
     skip: int = Query(0, ge=0), 
     limit: int = Query(10, ge=1),
+    cursor: str | None = Query(None),
 ) -> list[UserOut]:
     if admin:
-        return user_service.list_users(
+        users = await user_service.list_users(
             session=session,
             skip=skip,
-            limit=limit
+            limit=limit,
+            after_id=resolve_after_id(cursor=cursor, skip=skip)
         )
+        set_next_cursor(response=response, items=users, limit=limit)
+        return users
 
 
 @router.post(
@@ -75,13 +82,13 @@ def get_all_users(
     status_code=status.HTTP_202_ACCEPTED,
     summary="Ban user by email (only for admin)",
 )
-def ban_user(
+async def ban_user(
     user_service: Annotated[UserService, Depends(get_user_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     admin: Annotated[UserOut, Depends(get_current_active_auth_user_admin)],
     email: str
 ):
-    return user_service.update_user_ban_status_by_email(
+    return await user_service.update_user_ban_status_by_email(
         session=session, 
         admin=admin, 
         email=email,
@@ -93,13 +100,13 @@ def ban_user(
     status_code=status.HTTP_202_ACCEPTED,
     summary="Unban user by email (only for admin)",
 )
-def unban_user(
+async def unban_user(
     user_service: Annotated[UserService, Depends(get_user_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     admin: Annotated[UserOut, Depends(get_current_active_auth_user_admin)],
     email: str
 ):
-    return user_service.update_user_ban_status_by_email(
+    return await user_service.update_user_ban_status_by_email(
         session=session, 
         admin=admin, 
         email=email,
@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from auth.schemas import UserOut
+from config import settings
+
+
+class UserCache:
+    """Ограниченный LRU-кэш пользователей по email с коротким TTL.
+
+    Запросы с токеном (/users/me/, /auth/refresh/, админские ручки) берут
+    пользователя отсюда и не ходят в Postgres. Бан/разбан сбрасывает запись
+    сразу в этом процессе; другие реплики увидят изменение не позже чем
+    через ttl секунд.
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries: OrderedDict[str, tuple[float, UserOut]] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, email: str) -> UserOut | None:
+        with self.lock:
+            entry = self.entries.get(email)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self.entries[email]
+                return None
+            self.entries.move_to_end(email)
+            return user
+
+    def put(self, user: UserOut) -> None:
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries[user.email] = (time.monotonic() + self.ttl, user)
+            self.entries.move_to_end(user.email)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, email: str) -> None:
+        with self.lock:
+            self.entries.pop(email, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache(
+    ttl=settings.auth_jwt.user_cache_ttl,
+    maxsize=settings.auth_jwt.user_cache_size,
+)
+
+
+# Зависимость для получения кэша пользователей
+def get_user_cache() -> UserCache:
+    return user_cache
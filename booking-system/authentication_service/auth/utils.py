@@ -49,8 +49,9 @@ def decode_jwt(
 
 def hash_password(
     password: str,
+    rounds: int = settings.password_hashing.bcrypt_rounds,
 ) -> bytes:
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds)
     pwd_bytes: bytes = password.encode()
     return bcrypt.hashpw(password=pwd_bytes, salt=salt)
 
@@ -63,3 +64,10 @@ def validate_password(
         password=password.encode(),
         hashed_password=hashed_password
     )
+
+
+def get_password_rounds(
+    hashed_password: bytes
+) -> int:
+    # Хэш bcrypt: $2b$<стоимость>$<соль и хэш>
+    return int(hashed_password.split(b"$")[2])
@@ -1,16 +1,13 @@
 import logging
 from typing import Annotated
 
-from fastapi import Depends, Form
+from fastapi import Depends, Form, HTTPException
 from fastapi.security import OAuth2PasswordBearer #, OAuth2PasswordRequestForm
 from jwt import InvalidTokenError
-from auth.utils import (
-    validate_password,
-    decode_jwt
-)
+from auth.utils import decode_jwt
 from database import db_helper
 from auth.schemas import UserOut
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from auth.custom_exceptions import (
     unactive_user_exception,
     unauthed_user_exception,
@@ -27,6 +24,8 @@ from auth.actions import (
 )
 
 from service.user_service import UserService, get_user_service
+from auth.user_cache import UserCache, get_user_cache
+from auth.password_hasher import PasswordHasher, get_password_hasher
 
 # Logger setup
 logging.basicConfig(
@@ -45,21 +44,23 @@ oauth2_scheme = OAuth2PasswordBearer(
 
 
 # Проверка, что юзер зарегистрирован
-def validate_auth_user(
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+async def validate_auth_user(
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     user_service: Annotated[UserService, Depends(get_user_service)],
+    password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)],
     username: str = Form(),
     password: str = Form(),
 ):
     # Get user by username
     if not (
-        user := user_service.get_user_by_email(
+        user := await user_service.get_user_by_email(
             session=session, email=username
         )
     ):
         raise unauthed_user_exception
 
-    if not validate_password(
+    # bcrypt - в пуле процессов; при переполненной очереди - 429
+    if not await password_hasher.verify(
         password=password,
         hashed_password=user.password_hash,
     ):
@@ -68,7 +69,18 @@ def validate_auth_user(
 
     if not user.active:
         raise unactive_user_exception
-    
+
+    if password_hasher.needs_rehash(user.password_hash):
+        try:
+            await user_service.rehash_password(
+                session=session,
+                email=user.email,
+                password=password
+            )
+        except HTTPException as ex:
+            # Вход не зависит от пересчета хэша - попробуем при следующем входе
+            logger.warning(f"Failed to rehash password for '{user.email}': {ex.detail}")
+
     logger.info(f"Login attempt with username: {user.username}")
     return user
 
@@ -97,15 +109,21 @@ def get_current_token_payload(
 
 
 # Получение пользователя по полю sub из токена
-def get_user_by_token_sub(
+async def get_user_by_token_sub(
     payload: dict,
+    session: AsyncSession,
     user_service: UserService = get_user_service(),
+    user_cache: UserCache = get_user_cache(),
 ) -> UserOut:
     email: str | None = payload.get("sub")
-    user: UserOut = user_service.get_user_by_email(
-        session=db_helper.session_factory(), 
-        email=email
-    )
+    user: UserOut | None = user_cache.get(email) if email else None
+    if user is None:
+        user = await user_service.get_user_by_email(
+            session=session,
+            email=email
+        )
+        if user:
+            user_cache.put(user)
     if user and user.active:
         return user
     raise token_not_found_exception
@@ -114,14 +132,17 @@ def get_user_by_token_sub(
 # фабрика для создания функций (вводится тип токена, который ожидается)
 def get_auth_user_from_token_of_type(token_type: str):
     # Функция для получения информации с токена 
-    def get_auth_user_from_token(
+    async def get_auth_user_from_token(
         # получаем токен с заголовков
-        payload: Annotated[dict, Depends(get_current_token_payload)]
+        payload: Annotated[dict, Depends(get_current_token_payload)],
+        # сессия запроса: соединение из пула берется только при промахе кэша
+        # и возвращается в пул по завершении запроса
+        session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
     ) -> UserOut:
         # проверяем, совпадает ли введенный токен с токеном в заголовке
         validate_token_type(payload=payload, token_type=token_type)
         # получаем данные по токену
-        return get_user_by_token_sub(payload)
+        return await get_user_by_token_sub(payload=payload, session=session)
     return get_auth_user_from_token
 
 
@@ -11,6 +11,17 @@ public_key_path: Path = AUTHENTICATION_SERVICE_DIR / "certs" / "jwt-public.pem"
 
 class PostgresDatabaseURL(BaseModel):
     url: str
+    echo: bool = False
+    echo_pool: bool = False
+    # Пул соединений; у sync и async engine пулы отдельные, с одинаковыми параметрами
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Сколько секунд ждать свободное соединение до TimeoutError (QueuePool limit)
+    pool_timeout: float = 30.0
+    # Соединения старше стольких секунд переоткрываются; -1 - никогда
+    pool_recycle: int = 1800
+    # Перед выдачей из пула соединение проверяется (разорванные не достаются сессии)
+    pool_pre_ping: bool = True
 
 
 class AuthJWT(BaseModel):
@@ -20,6 +31,18 @@ class AuthJWT(BaseModel):
     access_token_expire_minutes: int = 15
     # refresh_token_expire_minutes: int = 60 * 24 * 30
     refresh_token_expire_days: int = 30
+    # Пользователи, найденные по токену, кэшируются по email (см. auth/user_cache.py); 0 - без кэша
+    user_cache_ttl: float = 30.0
+    user_cache_size: int = 10_000
+
+
+class PasswordHashing(BaseModel):
+    # Стоимость bcrypt (2^rounds итераций); хэши с другой стоимостью пересчитываются при входе
+    bcrypt_rounds: int = 12
+    # Процессы для bcrypt; 0 - по числу CPU
+    workers: int = 0
+    # Сколько операций может ждать пула процессов; сверх этого - 429
+    max_pending: int = 32
 
 
 class Settings(BaseSettings):
@@ -29,6 +52,7 @@ class Settings(BaseSettings):
         env_nested_delimiter="__"
     )
     auth_jwt: AuthJWT = AuthJWT()
+    password_hashing: PasswordHashing = PasswordHashing()
     db: PostgresDatabaseURL
 
 
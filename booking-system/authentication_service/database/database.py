@@ -1,7 +1,17 @@
-from typing import Generator
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from config import settings
+from database.metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine
+)
 
 
 class DatabaseHelper:
@@ -12,14 +22,24 @@ class DatabaseHelper:
             echo_pool: bool = False,
             pool_size: int = 5,
             max_overflow: int = 10,
+            pool_timeout: float = 30.0,
+            pool_recycle: int = -1,
+            pool_pre_ping: bool = False,
+            async_driver: str = "postgresql+asyncpg",
     ) -> None:
         self.engine: Engine = create_engine(
             url=url,
             echo=echo,
             echo_pool=echo_pool,
             pool_size=pool_size,
-            max_overflow=max_overflow
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name="sync"
         )
+        instrument_engine(self.engine)
 
         self.session_factory: sessionmaker[Session] = sessionmaker(
             bind=self.engine,
@@ -28,14 +48,50 @@ class DatabaseHelper:
             expire_on_commit=False
         )
 
+        # Тот же URL, но с асинхронным драйвером (asyncpg)
+        self.async_engine: AsyncEngine = create_async_engine(
+            url=make_url(url).set(drivername=async_driver),
+            echo=echo,
+            echo_pool=echo_pool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_logging_name="async"
+        )
+        instrument_engine(self.async_engine.sync_engine)
+
+        self.async_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            bind=self.async_engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False
+        )
+
     def dispose(self) -> None:
         self.engine.dispose()
 
+    async def async_dispose(self) -> None:
+        await self.async_engine.dispose()
+
     def session_getter(self):
         with self.session_factory() as session:
             yield session
 
+    async def async_session_getter(self):
+        async with self.async_session_factory() as session:
+            yield session
+
 
 db_helper = DatabaseHelper(
-    url=str(settings.db.url)
-)
\ No newline at end of file
+    url=str(settings.db.url),
+    echo=settings.db.echo,
+    echo_pool=settings.db.echo_pool,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+)
@@ -1,15 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
+from auth.password_hasher import password_hasher
 from auth.routers import router as user_auth_router
+from database import db_helper
+from database.metrics import router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Процессы для bcrypt поднимаются до первого входа
+    password_hasher.start()
+    yield
+    await run_in_threadpool(password_hasher.close)
+    # Закрываем пул соединений asyncpg
+    await db_helper.async_dispose()
 
 
 # An instance of FastAPI (for authentication service)
-authentication_app = FastAPI()
+authentication_app = FastAPI(lifespan=lifespan)
 
 
 # Attaching routers to authentication_app
 authentication_app.include_router(user_auth_router)
+# Метрики пула соединений с БД (Prometheus)
+authentication_app.include_router(metrics_router)
 
 # Middleware for logging requests (optional, for debugging)
 @authentication_app.middleware("http")
@@ -29,4 +47,5 @@ authentication_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
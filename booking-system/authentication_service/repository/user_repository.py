@@ -2,11 +2,12 @@ from abc import ABC, abstractmethod
 
 from sqlalchemy import select, update
 from auth.schemas import UserOut
-from database.database import Session
-from auth.utils import hash_password
+from database.database import AsyncSession
+from auth.password_hasher import password_hasher
 from auth.custom_exceptions import (
     UserCreateException,
-    update_ban_status_exception
+    update_ban_status_exception,
+    update_password_hash_exception
 )
 from auth.models import User
 from auth.enums import UserAction
@@ -33,53 +34,65 @@ class AbstractRepository(ABC):
     def update_user_ban_status():
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def update_password_hash():
+        raise NotImplementedError
+
 
 class UserRepository(AbstractRepository):
     @staticmethod
-    def create_user(
-        session: Session,
+    async def create_user(
+        session: AsyncSession,
         username: str,
         email: str,
         password_hash: str
     ) -> int:
+        # bcrypt - в пуле процессов; при переполненной очереди будет 429, а не ошибка создания
+        hashed_password: bytes = await password_hasher.hash(password_hash)
         try:
             new_user: User = User(
                 username=username,
                 email=email,
-                password_hash=hash_password(password_hash)
+                password_hash=hashed_password
             )
             session.add(new_user)
-            session.commit()
+            await session.commit()
             return new_user.id
         except Exception:
             raise UserCreateException()
         
     @staticmethod
-    def get_user_by_email(session: Session, email: str) -> User | None:
+    async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
         stmt = select(User).where(User.email==email)
-        user: User = session.scalars(stmt).one_or_none()
+        user: User = (await session.scalars(stmt)).one_or_none()
         return user
     
     
     @staticmethod
-    def get_all_users(
-        session: Session,
+    async def get_all_users(
+        session: AsyncSession,
         skip: int,
-        limit: int
+        limit: int,
+        after_id: int | None = None
     ) -> list[User]:
         stmt = (
             select(User)
-            .offset(skip)
             .limit(limit)
             .order_by(User.id)
         )
-        users: list[User] = session.scalars(stmt).all()
+        # Курсор - keyset по первичному ключу, без OFFSET
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        users: list[User] = (await session.scalars(stmt)).all()
         return users
 
 
     @staticmethod
-    def update_user_ban_status(
-        session: Session,  
+    async def update_user_ban_status(
+        session: AsyncSession,  
         user: UserOut,
         action: UserAction
     ) -> User:
@@ -91,15 +104,35 @@ class UserRepository(AbstractRepository):
                     .where(User.email==user.email)
                     .execution_options(synchronize_session="fetch")
                 )
-            session.scalars(stmt)
-            session.commit()
+            await session.execute(stmt)
+            await session.commit()
             # Получение обновленного объекта
-            updated_user = session.query(User).filter_by(email=user.email).one()
+            updated_user = (
+                await session.scalars(select(User).filter_by(email=user.email))
+            ).one()
             return updated_user
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise update_ban_status_exception
 
+    @staticmethod
+    async def update_password_hash(
+        session: AsyncSession,
+        email: str,
+        password_hash: bytes
+    ) -> None:
+        try:
+            stmt = (
+                update(User)
+                .values(password_hash=password_hash)
+                .where(User.email==email)
+            )
+            await session.execute(stmt)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise update_password_hash_exception
+
         
 
 
@@ -5,7 +5,9 @@ from repository.user_repository import (
     UserRepository, 
     get_user_repository
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from auth.user_cache import UserCache, get_user_cache
+from auth.password_hasher import PasswordHasher, get_password_hasher
 from auth.schemas import UserIn, UserOut
 from auth.custom_exceptions import (
     UserCreateException, 
@@ -42,16 +44,21 @@ class AbstractUserService(ABC):
     def check_user_is_admin():
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def rehash_password():
+        raise NotImplementedError
+
 
 class UserService(AbstractUserService):
     @staticmethod
-    def register_user(
-        session: Session, 
+    async def register_user(
+        session: AsyncSession, 
         user_in: UserIn,
         user_repository: UserRepository = get_user_repository()
     ) -> int:
         try:
-            new_user_id = user_repository.create_user(
+            new_user_id = await user_repository.create_user(
                 session=session,
                 **user_in.model_dump()
             )
@@ -60,12 +67,12 @@ class UserService(AbstractUserService):
             return f"{ex}: failure to create new user"
 
     @staticmethod
-    def get_user_by_email(
-        session: Session, 
+    async def get_user_by_email(
+        session: AsyncSession, 
         email: str,
         user_repository: UserRepository = get_user_repository(),
     ) -> UserOut:
-        user: User | None = user_repository.get_user_by_email(
+        user: User | None = await user_repository.get_user_by_email(
             session=session, 
             email=email
         )
@@ -75,35 +82,38 @@ class UserService(AbstractUserService):
     
 
     @staticmethod
-    def list_users(
-        session: Session,
+    async def list_users(
+        session: AsyncSession,
         skip: int,
         limit: int,
+        after_id: int | None = None,
         user_repository: UserRepository = get_user_repository()
     ) -> list[UserOut]:
-        users = user_repository.get_all_users(
+        users = await user_repository.get_all_users(
             session=session,
             skip=skip,
-            limit=limit
+            limit=limit,
+            after_id=after_id
         )
         users_schemas = [UserOut.model_validate(user, from_attributes=True) for user in users]
         return users_schemas
     
 
     @staticmethod
-    def update_user_ban_status_by_email(
-        session: Session, 
+    async def update_user_ban_status_by_email(
+        session: AsyncSession, 
         admin: UserOut, 
         email: str,
         action: UserAction,
         user_repository: UserRepository = get_user_repository(),
+        user_cache: UserCache = get_user_cache(),
     ) -> UserOut:
         # Get user by email
-        user: UserOut = UserService.get_user_by_email(
+        user: UserOut = await UserService.get_user_by_email(
             session=session,
             email=email
         )
-        admin: UserOut = UserService.get_user_by_email(
+        admin: UserOut = await UserService.get_user_by_email(
             session=session,
             email=admin.email
         )
@@ -111,11 +121,13 @@ class UserService(AbstractUserService):
             raise not_enough_rights_exception
         if not user:
             raise user_not_found_exception
-        user = user_repository.update_user_ban_status(
+        user = await user_repository.update_user_ban_status(
             session=session,
             user=user,
             action=action
         )
+        # Забаненный не должен проходить по токену до истечения TTL кэша
+        user_cache.invalidate(email)
         user_schema = UserOut.model_validate(obj=user, from_attributes=True)
         return {
             "action": action,
@@ -129,15 +141,33 @@ class UserService(AbstractUserService):
         }
 
     @staticmethod
-    def check_user_is_admin(
+    async def check_user_is_admin(
         user_in: UserIn,
-        session: Session,
+        session: AsyncSession,
     ) -> bool:
-        user = UserService.get_user_by_email(
+        user = await UserService.get_user_by_email(
             session=session, 
             email=user_in.email
         )
         return user.admin
+
+    @staticmethod
+    async def rehash_password(
+        session: AsyncSession,
+        email: str,
+        password: str,
+        user_repository: UserRepository = get_user_repository(),
+        password_hasher: PasswordHasher = get_password_hasher(),
+        user_cache: UserCache = get_user_cache(),
+    ) -> None:
+        # Хэш со старой стоимостью bcrypt пересчитываем, пока известен пароль
+        password_hash: bytes = await password_hasher.hash(password)
+        await user_repository.update_password_hash(
+            session=session,
+            email=email,
+            password_hash=password_hash
+        )
+        user_cache.invalidate(email)
         
 
 # Зависимость для получения сервиса
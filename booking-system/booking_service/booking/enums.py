@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class SagaState(Enum):
+    STARTED = "started"                 # запрос принят, бронирования еще нет
+    BOOKING_CREATED = "booking_created" # бронирование записано, даты в room_service резервируются
+    COMPLETED = "completed"             # даты зарезервированы, уведомление в outbox
+    COMPENSATING = "compensating"       # бронирование удалено, даты нужно вернуть номеру
+    FAILED = "failed"                   # все шаги отменены
@@ -1,5 +1,6 @@
-from sqlalchemy import MetaData, UniqueConstraint
-from datetime import date
+from sqlalchemy import TIMESTAMP, Computed, Enum, Index, MetaData, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import DATERANGE, JSONB, ExcludeConstraint, Range
+from datetime import date, datetime
 
 from sqlalchemy.orm import (
     Mapped,
@@ -8,6 +9,7 @@ from sqlalchemy.orm import (
     declared_attr,
 )
 
+from booking.enums import SagaState
 from config import settings
 
 
@@ -30,8 +32,65 @@ class Booking(Base):
     user_id: Mapped[int]
     check_in_date: Mapped[date]
     check_out_date: Mapped[date]
+    # Период проживания (обе даты включительно) - вычисляет сам Postgres
+    stay: Mapped[Range[date]] = mapped_column(
+        DATERANGE,
+        Computed("daterange(check_in_date, check_out_date, '[]')", persisted=True)
+    )
 
     __table_args__ = (
-        UniqueConstraint('room_id', 'check_in_date', 'check_out_date'),
+        # Один номер нельзя забронировать дважды на пересекающиеся даты (нужен btree_gist)
+        ExcludeConstraint(
+            ('room_id', '='),
+            ('stay', '&&'),
+            name='excl_booking_room_id_stay',
+            using='gist'
+        ),
+        # Запросы по датам без room_id
+        Index('ix_booking_stay', 'stay', postgresql_using='gist'),
     )
 
+
+class OutboxMessage(Base):
+    """Сообщение для RabbitMQ, записанное в той же транзакции, что и бронирование.
+
+    Фоновый relay (messaging/outbox_relay.py) публикует такие строки
+    и удаляет их после подтверждения брокером.
+    """
+    __tablename__ = "outbox_message"
+
+    routing_key: Mapped[str]
+    payload: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+
+
+class BookingSaga(Base):
+    """Состояние оркестрации одного запроса на создание бронирования.
+
+    Каждый шаг (запись брони, резерв дат в room_service, outbox) фиксирует
+    новое состояние, поэтому после сбоя понятно, какие действия нужно
+    компенсировать. Завершенная сага хранит ответ для повторов
+    с тем же Idempotency-Key.
+    """
+    __tablename__ = "booking_saga"
+
+    idempotency_key: Mapped[str]
+    user_email: Mapped[str]
+    # sha256 тела запроса: тот же ключ с другим телом - ошибка клиента
+    request_hash: Mapped[str]
+    state: Mapped[Enum] = mapped_column(Enum(SagaState), default=SagaState.STARTED)
+    room_id: Mapped[int]
+    check_in_date: Mapped[date]
+    check_out_date: Mapped[date]
+    booking_id: Mapped[int | None]
+    # Ответ, который вернется на повтор запроса: BookingOut или {"detail": ...}
+    status_code: Mapped[int | None]
+    response: Mapped[dict | None] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('user_email', 'idempotency_key'),
+        # Поиск зависших саг фоновой задачей
+        Index('ix_booking_saga_state_updated_at', 'state', 'updated_at'),
+    )
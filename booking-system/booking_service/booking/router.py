@@ -2,11 +2,15 @@ from datetime import date
 import logging
 from typing import Annotated
 from service.booking_service import BookingService, get_booking_service
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from service.booking_batch_service import BookingBatchService, get_booking_batch_service
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import db_helper
-from booking.schemas import User, BookingIn, BookingOut
-from booking.utils import get_current_active_user, reusable_oauth
+from config import settings
+from booking.schemas import User, ServiceTokenPayload, BookingIn, BookingOut, BookingBatchItemOut, BookingConflictsIn, BookingConflictsOut
+from booking.utils import get_current_active_user, get_user_or_service, reusable_oauth
+from booking.auth import BOOKING_CONFLICTS_SCOPE
+from booking.pagination import resolve_after_id, set_next_cursor
 
 # Logger setup
 logging.basicConfig(
@@ -25,50 +29,101 @@ router = APIRouter(
 
 
 @router.get("/", response_model=list[BookingOut])
-def get_bookings(
+async def get_bookings(
+    response: Response,
     booking_service: Annotated[BookingService, Depends(get_booking_service)],
     user: Annotated[User, Depends(get_current_active_user)],
-    session : Annotated[Session, Depends(db_helper.session_getter)],
+    session : Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     check_date: date | None = Query(default=None),
+    room_id: int | None = Query(default=None, ge=0),
+    date_from: date | None = Query(default=None),
+    date_to: date | None = Query(default=None),
     skip: int = Query(default=0, ge=0),
-    limit: int = Query(default=10, ge=1)
+    limit: int = Query(default=10, ge=1),
+    cursor: str | None = Query(default=None)
 ) -> list[BookingOut]:
     if user:
-        return booking_service.get_bookings_by_date(
+        bookings = await booking_service.get_bookings_by_date(
             session=session,
             check_date=check_date,
+            room_id=room_id,
+            date_from=date_from,
+            date_to=date_to,
             skip=skip,               
-            limit=limit    
+            limit=limit,
+            after_id=resolve_after_id(cursor=cursor, skip=skip)
+        )
+        set_next_cursor(response=response, items=bookings, limit=limit)
+        return bookings
+
+
+@router.post("/conflicts/", response_model=BookingConflictsOut)
+async def get_conflicting_dates(
+    conflicts_in: BookingConflictsIn,
+    # room_service передает токен своего вызывающего: пользователя или booking_service (восстановление саги)
+    user: Annotated[User | ServiceTokenPayload, Depends(get_user_or_service(BOOKING_CONFLICTS_SCOPE))],
+    booking_service: Annotated[BookingService, Depends(get_booking_service)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
+) -> BookingConflictsOut:
+    # Для room_service: на какие из переданных дат номер уже забронирован
+    if user:
+        return await booking_service.get_conflicting_dates(
+            session=session,
+            conflicts_in=conflicts_in
         )
 
 
 @router.post("/", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
-def create_booking(
+async def create_booking(
     booking_in: BookingIn,
     user: Annotated[User, Depends(get_current_active_user)],
     token: Annotated[str, Depends(reusable_oauth)],
     booking_service: Annotated[BookingService, Depends(get_booking_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
+    # Повтор с тем же ключом вернет сохраненный ответ, не создавая вторую бронь
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None
 ) -> BookingOut:
     if user:
-        return booking_service.create_booking(
+        return await booking_service.create_booking(
             booking_in=booking_in,
             session=session,
             user=user,
-            token=token
+            token=token,
+            idempotency_key=idempotency_key
+        )
+
+
+@router.post("/batch/", response_model=list[BookingBatchItemOut])
+async def create_bookings(
+    bookings_in: Annotated[list[BookingIn], Body(min_length=1, max_length=settings.batch.max_size)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    token: Annotated[str, Depends(reusable_oauth)],
+    booking_batch_service: Annotated[BookingBatchService, Depends(get_booking_batch_service)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
+    # Позиция повтора с тем же ключом отвечает сохраненным результатом
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None
+) -> list[BookingBatchItemOut]:
+    # Результат по каждой позиции (status_code 201 - бронь создана), сам ответ всегда 200
+    if user:
+        return await booking_batch_service.create_bookings(
+            bookings_in=bookings_in,
+            session=session,
+            user=user,
+            token=token,
+            idempotency_key=idempotency_key
         )
 
 
 @router.delete("/{booking_id}/", status_code=status.HTTP_204_NO_CONTENT)
-def delete_booking(
+async def delete_booking(
     booking_id: int,
     user: Annotated[User, Depends(get_current_active_user)],
     token: Annotated[str, Depends(reusable_oauth)],
     booking_service: Annotated[BookingService, Depends(get_booking_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
 ) -> None:
     if user:
-        return booking_service.delete_booking(
+        return await booking_service.delete_booking(
             booking_id=booking_id,
             session=session,
             token=token
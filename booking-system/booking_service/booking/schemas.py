@@ -1,4 +1,5 @@
 from datetime import date
+from typing import Any, Literal
 from pydantic import BaseModel, ConfigDict, EmailStr
 
 
@@ -19,6 +20,25 @@ class BookingOut(BookingIn):
     id: int
 
 
+class BookingBatchItemOut(BaseModel):
+    # Позиция брони в запросе
+    index: int
+    status_code: int
+    booking: BookingOut | None = None
+    detail: Any = None
+
+
+class BookingConflictsIn(BaseModel):
+    room_id: int
+    dates: list[date]
+
+
+class BookingConflictsOut(BaseModel):
+    room_id: int
+    # Только даты из запроса, на которые номер уже забронирован
+    dates: list[date]
+
+
 class BookingUpdate(BaseModel):
     check_in_date: date | None = None
     check_out_date: date | None = None
@@ -37,6 +57,18 @@ class TokenPayload(BaseModel):
     iat: int
 
 
+class ServiceTokenPayload(BaseModel):
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+    type: Literal["service"]
+    # Имя сервиса, а не пользователя
+    sub: str
+    scope: list[str]
+    exp: int
+    jti: str
+    iat: int
+
+
 class User(BaseModel):
     model_config = ConfigDict(from_attributes=True, strict=True)
 
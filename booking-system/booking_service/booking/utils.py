@@ -7,7 +7,8 @@ from datetime import (
     datetime
 )
 
-from booking.schemas import User, TokenPayload
+from booking.schemas import ServiceTokenPayload, User
+from booking.auth import decode_service_token, decode_token, is_service_token
 
 
 from fastapi import (
@@ -23,7 +24,6 @@ from pydantic import (
     ValidationError
 )
 
-from config import settings
 
 
 
@@ -35,13 +35,7 @@ reusable_oauth = OAuth2PasswordBearer(
 
 def get_current_user(token: str = Depends(reusable_oauth)) -> User:
     try:
-        payload = jwt.decode(
-            jwt=token,
-            key=settings.auth_jwt.public_key,
-            algorithms=[settings.auth_jwt.algorithm]
-        )
-
-        token_data: TokenPayload = TokenPayload(**payload)
+        token_data, user = decode_token(token)
         if datetime.fromtimestamp(token_data.exp) < datetime.now():
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,12 +48,6 @@ def get_current_user(token: str = Depends(reusable_oauth)) -> User:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user: User = User(
-        username=token_data.username,
-        email=token_data.email,
-        admin=token_data.admin
-    )
-
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -84,3 +72,25 @@ def get_admin_user(user: Annotated[User, Depends(get_current_active_user)]) -> U
         status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
         detail="Not enough rights"
     )
+
+
+def get_user_or_service(scope: str):
+    """Зависимость для межсервисных эндпоинтов: активный пользователь или сервис с правом scope."""
+    def get_caller(token: str = Depends(reusable_oauth)) -> User | ServiceTokenPayload:
+        if not is_service_token(token):
+            return get_current_active_user(get_current_user(token))
+        try:
+            service = decode_service_token(token)
+        except (jwt.PyJWTError, ValidationError):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if scope not in service.scope:
+            raise HTTPException(
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                detail="Not enough rights"
+            )
+        return service
+    return get_caller
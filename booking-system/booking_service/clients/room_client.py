@@ -0,0 +1,191 @@
+import logging
+from datetime import date
+
+import httpx
+from fastapi import HTTPException, status
+
+from config import settings
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+ROOM_AVAILABLE_DATE = "room/available_date"
+
+
+class RoomServiceClient:
+    """Один общий httpx.AsyncClient на процесс (keep-alive пул соединений до room_service).
+
+    Открывается и закрывается в lifespan приложения, поэтому запросы
+    не платят за TCP-рукопожатие на каждый вызов.
+    """
+    client: httpx.AsyncClient | None = None
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool,
+    ) -> None:
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        # HTTP/2 используется только если сервер его согласует (ALPN по TLS),
+        # иначе клиент работает по HTTP/1.1 с тем же пулом соединений
+        self.http2 = http2
+
+    async def start(self) -> None:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            logger.info(f"Room service client started: {self.base_url}")
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            logger.info("Room service client closed")
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        token: str,
+        **kwargs
+    ) -> httpx.Response:
+        if self.client is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Room service client is not started"
+            )
+        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            return await self.client.request(
+                method=method,
+                url=url,
+                headers=headers,
+                **kwargs
+            )
+        except httpx.HTTPError as exc:
+            # Отказ соединения, таймауты, обрыв протокола: вызывающая сага
+            # получает HTTPException и успевает откатиться в том же запросе
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Room service unavailable: {exc!r}"
+            )
+
+    async def hold_room_available_dates(
+        self,
+        room_id: int,
+        date_from: date,
+        date_to: date,
+        ttl: int,
+        token: str
+    ) -> dict:
+        # Атомарно захватывает даты на ttl секунд; 409 - часть дат занята или захвачена другим
+        response = await self.request(
+            method="POST",
+            url=f"/{ROOM_AVAILABLE_DATE}/{room_id}/hold/",
+            token=token,
+            json={
+                'date_from': date_from.isoformat(),
+                'date_to': date_to.isoformat(),
+                'ttl': ttl
+            }
+        )
+        if response.status_code == status.HTTP_409_CONFLICT:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=response.json().get('detail')
+            )
+        if response.is_error:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Room service error: {response.text}"
+            )
+        return response.json()
+
+    async def release_room_available_dates_hold(
+        self,
+        room_id: int,
+        hold_id: str,
+        token: str
+    ) -> None:
+        # Не критично: захват все равно истечет сам
+        try:
+            response = await self.request(
+                method="DELETE",
+                url=f"/{ROOM_AVAILABLE_DATE}/{room_id}/hold/{hold_id}/",
+                token=token
+            )
+        except HTTPException as exc:
+            logger.warning(f"Can not release hold {hold_id}: {exc.detail}")
+            return
+        if response.is_error:
+            logger.warning(f"Can not release hold {hold_id}: {response.status_code}")
+
+    async def delete_room_available_dates(
+        self,
+        room_id: int,
+        dates: list[str],
+        token: str,
+        hold_id: str | None = None
+    ) -> httpx.Response:
+        return await self.request(
+            method="DELETE",
+            url=f"/{ROOM_AVAILABLE_DATE}/{room_id}/",
+            token=token,
+            json={
+                'dates': dates,
+                'hold_id': hold_id
+            }
+        )
+
+    async def restore_room_available_dates(
+        self,
+        room_id: int,
+        date_from: date,
+        date_to: date,
+        token: str
+    ) -> httpx.Response:
+        return await self.request(
+            method="POST",
+            url=f"/{ROOM_AVAILABLE_DATE}/{room_id}/bulk/",
+            token=token,
+            json={
+                'date_from': date_from.isoformat(),
+                'date_to': date_to.isoformat()
+            }
+        )
+
+
+room_client = RoomServiceClient(
+    base_url=settings.room_service.url,
+    timeout=settings.room_service.timeout,
+    max_connections=settings.room_service.max_connections,
+    max_keepalive_connections=settings.room_service.max_keepalive_connections,
+    keepalive_expiry=settings.room_service.keepalive_expiry,
+    http2=settings.room_service.http2,
+)
+
+
+# Зависимость для получения клиента room_service
+def get_room_client() -> RoomServiceClient:
+    return room_client
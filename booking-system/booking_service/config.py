@@ -7,10 +7,24 @@ BOOKING_SERVICE_DIR = Path(__file__).parent
 
 private_key_path: Path = BOOKING_SERVICE_DIR / "certs" / "jwt-private.pem"
 public_key_path: Path = BOOKING_SERVICE_DIR / "certs" / "jwt-public.pem"
+# Собственная пара ключей booking_service для сервисных токенов (не ключ authentication_service)
+service_private_key_path: Path = BOOKING_SERVICE_DIR / "certs" / "booking-service-private.pem"
+service_public_key_path: Path = BOOKING_SERVICE_DIR / "certs" / "booking-service-public.pem"
 
 
 class PostgresDatabaseURL(BaseModel):
     url: str
+    echo: bool = False
+    echo_pool: bool = False
+    # Пул соединений; у sync и async engine пулы отдельные, с одинаковыми параметрами
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Сколько секунд ждать свободное соединение до TimeoutError (QueuePool limit)
+    pool_timeout: float = 30.0
+    # Соединения старше стольких секунд переоткрываются; -1 - никогда
+    pool_recycle: int = 1800
+    # Перед выдачей из пула соединение проверяется (разорванные не достаются сессии)
+    pool_pre_ping: bool = True
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
         "uq": "uq_%(table_name)s_%(column_0_N_name)s",
@@ -24,6 +38,53 @@ class AuthJWT(BaseModel):
     private_key: str = private_key_path.read_text()
     public_key: str = public_key_path.read_text()
     algorithm: str = "RS256"
+    # Сколько проверенных токенов держать в памяти (см. booking/auth.py)
+    token_cache_size: int = 10_000
+    # Сервисный токен для фоновых вызовов room_service (восстановление саг):
+    # type "service", подписан ключом booking_service, права - в scope
+    service_name: str = "booking_service"
+    service_private_key: str = service_private_key_path.read_text()
+    service_public_key: str = service_public_key_path.read_text()
+    service_token_ttl: int = 60
+
+
+class RoomServiceAPI(BaseModel):
+    url: str = "http://room_service:8002"
+    timeout: float = 5.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    # На сколько секунд бронирование захватывает даты номера (POST .../hold/)
+    hold_ttl: int = 30
+
+
+class RabbitMQ(BaseModel):
+    host: str = "rabbitmq"
+    port: int = 5672
+    exchange: str = "services"
+    queue: str = "GET_BOOKING_INFORMATION"
+    heartbeat: int = 60
+    blocked_connection_timeout: float = 30.0
+
+
+class Outbox(BaseModel):
+    batch_size: int = 100
+    poll_interval: float = 1.0
+
+
+class Saga(BaseModel):
+    # Незавершенная сага старше стольких секунд считается брошенной и откатывается
+    stale_after: float = 60.0
+    recovery_interval: float = 30.0
+    batch_size: int = 50
+    # Сколько секунд хранить ответы по Idempotency-Key
+    idempotency_ttl: int = 86_400
+
+
+class Batch(BaseModel):
+    # Сколько броней принимает POST /booking/batch/ за раз
+    max_size: int = 500
 
 
 class Settings(BaseSettings):
@@ -33,6 +94,11 @@ class Settings(BaseSettings):
         env_nested_delimiter="__"
     )
     auth_jwt: AuthJWT = AuthJWT()
+    room_service: RoomServiceAPI = RoomServiceAPI()
+    rabbitmq: RabbitMQ = RabbitMQ()
+    outbox: Outbox = Outbox()
+    saga: Saga = Saga()
+    batch: Batch = Batch()
     db: PostgresDatabaseURL
 
 
@@ -1,14 +1,56 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from booking.router import router
+from clients.room_client import room_client
+from config import settings
+from database import db_helper
+from database.metrics import router as metrics_router
+from messaging.producer import producer
+from messaging.outbox_relay import outbox_relay
+from service.saga_recovery import saga_recovery
+
+
+async def keep_producer_alive() -> None:
+    # pika обслуживает heartbeat только при обращении к соединению
+    while True:
+        await asyncio.sleep(max(settings.rabbitmq.heartbeat / 2, 1))
+        await run_in_threadpool(producer.keepalive)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Общий пул HTTP-соединений до room_service живет все время работы приложения
+    await room_client.start()
+    # Одно соединение с RabbitMQ на процесс вместо рукопожатия на каждое бронирование
+    await run_in_threadpool(producer.connect)
+    keepalive_task = asyncio.create_task(keep_producer_alive())
+    # Уведомления уходят в RabbitMQ из outbox, а не из запроса
+    await outbox_relay.start()
+    # Брошенные саги бронирования откатываются в фоне, без ручной чистки
+    await saga_recovery.start()
+    yield
+    await saga_recovery.stop()
+    await outbox_relay.stop()
+    keepalive_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await keepalive_task
+    await run_in_threadpool(producer.close)
+    await room_client.close()
+    await db_helper.async_dispose()
 
 
 # An instance of FastAPI (for authentication service)
-booking_app = FastAPI()
+booking_app = FastAPI(lifespan=lifespan)
 
 # Attaching routers to authentication_app
 booking_app.include_router(router)
+# Метрики пула соединений с БД (Prometheus)
+booking_app.include_router(metrics_router)
 
 # CORS for frontend(soon)
 origins = []
@@ -18,4 +60,5 @@ booking_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+from contextlib import suppress
+
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+from database import db_helper
+from messaging.producer import ProducerNotification, get_producer
+from repository.outbox_repository import OutboxRepository, get_outbox_repository
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Фоновая задача, которая переносит outbox в RabbitMQ пачками.
+
+    Строка удаляется только после подтверждения брокером, поэтому при
+    падении брокера или процесса сообщение не теряется (доставка
+    at-least-once). Между пачками relay ждет poll_interval секунд
+    либо сигнала wake_up() от только что закоммиченного бронирования.
+    """
+    task: asyncio.Task | None = None
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        producer: ProducerNotification = get_producer(),
+        outbox_repository: OutboxRepository = get_outbox_repository(),
+    ) -> None:
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.producer = producer
+        self.outbox_repository = outbox_repository
+        self.wakeup = asyncio.Event()
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+            logger.info("Outbox relay started")
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+            logger.info("Outbox relay stopped")
+
+    def wake_up(self) -> None:
+        self.wakeup.set()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                published: int = await self.relay_batch()
+            except Exception as e:
+                logger.error(f"Outbox relay failed: {e}")
+                published = 0
+            # Полная пачка - в outbox, скорее всего, есть еще сообщения
+            if published == self.batch_size:
+                continue
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_interval)
+            self.wakeup.clear()
+
+    async def relay_batch(self) -> int:
+        async with db_helper.async_session_factory() as session:
+            messages = await self.outbox_repository.get_pending_messages(
+                session=session,
+                limit=self.batch_size
+            )
+            if not messages:
+                await session.commit()
+                return 0
+            # pika блокирующий, поэтому публикацию уводим из event loop в пул потоков
+            published: int = await run_in_threadpool(
+                self.producer.publish_batch,
+                [
+                    (message.routing_key, json.dumps(message.payload).encode())
+                    for message in messages
+                ]
+            )
+            await self.outbox_repository.delete_messages(
+                session=session,
+                message_ids=[message.id for message in messages[:published]]
+            )
+            if published < len(messages):
+                logger.error(f"Outbox relay published {published} of {len(messages)} messages")
+            return published
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.outbox.batch_size,
+    poll_interval=settings.outbox.poll_interval,
+)
+
+
+# Зависимость для получения relay
+def get_outbox_relay() -> OutboxRelay:
+    return outbox_relay
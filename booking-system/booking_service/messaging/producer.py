@@ -1,9 +1,16 @@
 import logging
+from threading import Lock
 
-import json
 import pika
-from pika.exceptions import AMQPConnectionError
+from pika.exceptions import (
+    AMQPChannelError,
+    AMQPConnectionError,
+    NackError,
+    UnroutableError
+)
 from booking.schemas import BookingOut
+from messaging.topology import Topology
+from config import settings
 
 # Logger setup
 logging.basicConfig(
@@ -17,66 +24,152 @@ logger = logging.getLogger(__name__)
 
 
 class ProducerNotification:
+    """Один долгоживущий издатель на процесс.
+
+    Соединение, канал и объявления exchange/очереди создаются один раз
+    (в lifespan приложения), после чего публикация - это одна запись
+    кадра в уже открытый канал. BlockingConnection не потокобезопасен,
+    а отправка идет из пула потоков, поэтому все обращения к pika - под lock.
+    """
     channel = None
     connection = None
-    def __init__(self):
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        exchange: str,
+        queue: str,
+        heartbeat: int,
+        blocked_connection_timeout: float,
+    ) -> None:
+        self.parameters = pika.ConnectionParameters(
+            host=host,
+            port=port,
+            heartbeat=heartbeat,
+            blocked_connection_timeout=blocked_connection_timeout
+        )
+        self.exchange = exchange
+        self.queue = queue
+        # Очереди повторов и dead-letter - от тех же имен, что и публикация
+        self.topology = Topology(exchange=exchange, queue=queue)
+        self.lock = Lock()
+
+    def connect(self) -> None:
+        with self.lock:
+            self._connect()
+
+    def _connect(self) -> None:
+        self._close()
         try:
-            self.connection = pika.BlockingConnection(
-                pika.ConnectionParameters(host="rabbitmq", port=5672)
-            )
+            self.connection = pika.BlockingConnection(self.parameters)
             self.channel = self.connection.channel()
-            self.channel.exchange_declare(
-                exchange="services", exchange_type="direct"
-            )
-            self.channel.queue_declare(queue="GET_BOOKING_INFORMATION", durable=True)
-            self.start_consuming()
-        except AMQPConnectionError as e:
+            # Брокер подтверждает каждое сообщение (publisher confirms)
+            self.channel.confirm_delivery()
+            # Основная очередь, очереди задержки для повторов и dead-letter
+            self.topology.declare(self.channel)
+            logger.info("RabbitMQ producer connected")
+        except (AMQPConnectionError, OSError) as e:
+            # OSError - например, имя хоста брокера не резолвится
             logger.error(f"Failed to connect to RabbitMQ: {e}!!!!!!!")
+            self._close()
+
+    def close(self) -> None:
+        with self.lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self.connection is not None and self.connection.is_open:
+            try:
+                self.connection.close()
+                logger.info("CONNECTION CLOSED")
+            except AMQPConnectionError:
+                pass
+        self.connection = None
+        self.channel = None
+
+    def is_connected(self) -> bool:
+        return (
+            self.connection is not None and self.connection.is_open
+            and self.channel is not None and self.channel.is_open
+        )
+
+    def keepalive(self) -> None:
+        # Обслуживаем heartbeat'ы, пока нет публикаций; упавшее соединение переоткрываем
+        with self.lock:
+            if not self.is_connected():
+                self._connect()
+                return
+            try:
+                self.connection.process_data_events(time_limit=0)
+            except (AMQPConnectionError, AMQPChannelError) as e:
+                logger.error(f"RabbitMQ connection lost: {e}")
+                self._connect()
 
-    def send_booking_information_to_notification_service(self, username: str, email: str, booking: BookingOut):
-        if self.connection is None:
-            logger.error("RabbitMQ connection is not established.")
-            return  # Можно обработать ошибку, если соединение не установлено
-        data = {
+    def publish(self, body: bytes, routing_key: str | None = None) -> bool:
+        with self.lock:
+            return self._publish(body=body, routing_key=routing_key or self.queue)
+
+    def publish_batch(self, messages: list[tuple[str, bytes]]) -> int:
+        """Публикует (routing_key, body) по порядку; возвращает, сколько подтверждено.
+
+        На первой неудаче останавливается, чтобы не нарушить порядок сообщений.
+        """
+        with self.lock:
+            for published, (routing_key, body) in enumerate(messages):
+                if not self._publish(body=body, routing_key=routing_key):
+                    return published
+            return len(messages)
+
+    def _publish(self, body: bytes, routing_key: str) -> bool:
+        # Одна повторная попытка после переподключения
+        for attempt in range(2):
+            if not self.is_connected():
+                self._connect()
+                if not self.is_connected():
+                    logger.error("RabbitMQ connection is not established.")
+                    return False
+            try:
+                self.channel.basic_publish(
+                    exchange=self.exchange,
+                    routing_key=routing_key,
+                    body=body,
+                    properties=pika.BasicProperties(
+                        delivery_mode=pika.DeliveryMode.Persistent
+                    ),
+                    mandatory=True
+                )
+                return True
+            except (UnroutableError, NackError) as e:
+                logger.error(f"Message was not confirmed by RabbitMQ: {e}")
+                return False
+            except (AMQPConnectionError, AMQPChannelError) as e:
+                logger.error(f"RabbitMQ publish failed (attempt {attempt + 1}): {e}")
+                self._close()
+        return False
+
+    @staticmethod
+    def booking_information_message(username: str, email: str, booking: BookingOut) -> dict:
+        # Формат, который ждет notification_service (даты - строками)
+        return {
             "username": username,
             "email": email,
             "booking": {
-                **booking.model_dump()
+                **booking.model_dump(mode="json")
             }
         }
-        message_body = json.dumps(data, default=str)
-        message_bytes = message_body.encode()
-
-        self.channel.basic_publish(
-            exchange='services',
-            routing_key="GET_BOOKING_INFORMATION",
-            body=message_bytes,
-            properties=pika.BasicProperties(
-                delivery_mode=pika.DeliveryMode.Persistent
-            )
-        )
-        logger.info(f"[x] Sent: {username} and {email}")
 
-    def start_consuming(self):
-        try:
-            self.channel.start_consuming()
-        except KeyboardInterrupt:
-            logger.info("Interrupted")
-            self.stop_consuming()
-
-
-    def stop_consuming(self):
-        if self.channel is not None:
-            logger.info("STOP CONSUMING")
-            self.channel.stop_consuming()
-        if self.connection is not None:
-            logger.info("CONNECTION CLOSED")
-            self.connection.close()
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.stop_consuming()
-        if exc_type:
-            logger.error(f"An exception occurred: {exc_val}")
\ No newline at end of file
+
+producer = ProducerNotification(
+    host=settings.rabbitmq.host,
+    port=settings.rabbitmq.port,
+    exchange=settings.rabbitmq.exchange,
+    queue=settings.rabbitmq.queue,
+    heartbeat=settings.rabbitmq.heartbeat,
+    blocked_connection_timeout=settings.rabbitmq.blocked_connection_timeout,
+)
+
+
+# Зависимость для получения издателя уведомлений
+def get_producer() -> ProducerNotification:
+    return producer
@@ -0,0 +1,73 @@
+"""Топология RabbitMQ для уведомлений о бронированиях.
+
+Файл одинаковый в booking_service и notification_service: обе стороны
+объявляют одни и те же exchange/очереди с одними и теми же аргументами,
+иначе брокер ответит PRECONDITION_FAILED.
+
+    <exchange> (direct) --<queue>--> <queue>
+    <exchange>.retry (direct) --> <queue>.retry.<n>
+        (x-message-ttl, по истечении - обратно в <exchange>/<queue>)
+    <exchange>.dead (direct) --> <queue>.dead
+
+Имена exchange и очереди берутся из настроек сервиса (по умолчанию
+services / GET_BOOKING_INFORMATION), имена очередей повторов и
+dead-letter выводятся из них.
+
+Аргументы основной очереди не меняются (она уже существует у брокера),
+поэтому в задержку и в dead-letter консьюмер переложит сообщение сам.
+"""
+
+# Номер попытки доставки (первая - 1)
+ATTEMPT_HEADER = "x-attempt"
+# Сколько всего попыток, после последней - в dead-letter
+MAX_ATTEMPTS = 5
+# Экспоненциальная задержка перед повтором: 5с, 25с, 125с, 625с
+RETRY_BASE_DELAY_MS = 5_000
+RETRY_BACKOFF_FACTOR = 5
+
+
+def retry_delay_ms(attempt: int) -> int:
+    # Задержка после неудачной попытки attempt (1..MAX_ATTEMPTS - 1)
+    return RETRY_BASE_DELAY_MS * RETRY_BACKOFF_FACTOR ** (attempt - 1)
+
+
+class Topology:
+    def __init__(self, exchange: str, queue: str) -> None:
+        self.exchange = exchange
+        self.queue = queue
+        self.retry_exchange = f"{exchange}.retry"
+        self.dead_letter_exchange = f"{exchange}.dead"
+        self.dead_letter_queue = f"{queue}.dead"
+
+    def retry_queue(self, attempt: int) -> str:
+        return f"{self.queue}.retry.{attempt}"
+
+    def declare(self, channel) -> None:
+        channel.exchange_declare(exchange=self.exchange, exchange_type="direct")
+        channel.queue_declare(queue=self.queue, durable=True)
+        channel.queue_bind(queue=self.queue, exchange=self.exchange, routing_key=self.queue)
+
+        channel.exchange_declare(exchange=self.retry_exchange, exchange_type="direct", durable=True)
+        for attempt in range(1, MAX_ATTEMPTS):
+            channel.queue_declare(
+                queue=self.retry_queue(attempt),
+                durable=True,
+                arguments={
+                    "x-message-ttl": retry_delay_ms(attempt),
+                    "x-dead-letter-exchange": self.exchange,
+                    "x-dead-letter-routing-key": self.queue,
+                }
+            )
+            channel.queue_bind(
+                queue=self.retry_queue(attempt),
+                exchange=self.retry_exchange,
+                routing_key=self.retry_queue(attempt)
+            )
+
+        channel.exchange_declare(exchange=self.dead_letter_exchange, exchange_type="direct", durable=True)
+        channel.queue_declare(queue=self.dead_letter_queue, durable=True)
+        channel.queue_bind(
+            queue=self.dead_letter_queue,
+            exchange=self.dead_letter_exchange,
+            routing_key=self.dead_letter_queue
+        )
@@ -0,0 +1,32 @@
+"""add outbox message
+
+Revision ID: 8d4f0a6c2e71
+Revises: 230f50bd7e74
+Create Date: 2026-10-18 15:20:42.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f0a6c2e71'
+down_revision: Union[str, None] = '230f50bd7e74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_message',
+    sa.Column('routing_key', sa.String(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_outbox_message'))
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('outbox_message')
@@ -0,0 +1,47 @@
+"""add booking stay range and exclusion constraint
+
+Revision ID: 3b9e1f7c4d20
+Revises: 8d4f0a6c2e71
+Create Date: 2026-10-18 17:10:05.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1f7c4d20'
+down_revision: Union[str, None] = '8d4f0a6c2e71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Оператор = для integer в GiST-индексе дает расширение btree_gist
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.add_column('booking', sa.Column(
+        'stay',
+        postgresql.DATERANGE(),
+        sa.Computed("daterange(check_in_date, check_out_date, '[]')", persisted=True),
+        nullable=False
+    ))
+    # Уже существующие пересекающиеся брони не дадут создать ограничение - их нужно разобрать вручную
+    op.create_exclude_constraint(
+        'excl_booking_room_id_stay',
+        'booking',
+        ('room_id', '='),
+        ('stay', '&&'),
+        using='gist'
+    )
+    op.create_index('ix_booking_stay', 'booking', ['stay'], unique=False, postgresql_using='gist')
+    # Ограничение-исключение строже уникальности по (room_id, check_in_date, check_out_date)
+    op.drop_constraint(op.f('uq_booking_room_id_check_in_date_check_out_date'), 'booking', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint(op.f('uq_booking_room_id_check_in_date_check_out_date'), 'booking', ['room_id', 'check_in_date', 'check_out_date'])
+    op.drop_index('ix_booking_stay', table_name='booking', postgresql_using='gist')
+    op.drop_constraint('excl_booking_room_id_stay', 'booking')
+    op.drop_column('booking', 'stay')
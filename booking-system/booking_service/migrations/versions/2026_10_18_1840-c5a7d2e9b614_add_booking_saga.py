@@ -0,0 +1,45 @@
+"""add booking saga
+
+Revision ID: c5a7d2e9b614
+Revises: 3b9e1f7c4d20
+Create Date: 2026-10-18 18:40:27.905516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a7d2e9b614'
+down_revision: Union[str, None] = '3b9e1f7c4d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('booking_saga',
+    sa.Column('idempotency_key', sa.String(), nullable=False),
+    sa.Column('user_email', sa.String(), nullable=False),
+    sa.Column('request_hash', sa.String(), nullable=False),
+    sa.Column('state', sa.Enum('STARTED', 'BOOKING_CREATED', 'COMPLETED', 'COMPENSATING', 'FAILED', name='sagastate'), nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('check_in_date', sa.Date(), nullable=False),
+    sa.Column('check_out_date', sa.Date(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('response', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_booking_saga')),
+    sa.UniqueConstraint('user_email', 'idempotency_key', name=op.f('uq_booking_saga_user_email_idempotency_key'))
+    )
+    op.create_index('ix_booking_saga_state_updated_at', 'booking_saga', ['state', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_booking_saga_state_updated_at', table_name='booking_saga')
+    op.drop_table('booking_saga')
+    sa.Enum(name='sagastate').drop(op.get_bind(), checkfirst=False)
@@ -2,10 +2,12 @@ from abc import ABC, abstractmethod
 from datetime import date
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Date, Row, bindparam, delete, exists, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, Range, insert
+from sqlalchemy.exc import IntegrityError
 from booking.models import Booking
 from booking.schemas import BookingIn, BookingUpdate
-from database.database import Session
+from database.database import AsyncSession
 
 
 class AbstractRepository(ABC):
@@ -14,6 +16,11 @@ class AbstractRepository(ABC):
     def get_bookings_by_date():
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def get_conflicting_dates():
+        raise NotImplementedError
+
     @staticmethod
     @abstractmethod
     def get_booking_by_id():
@@ -24,79 +31,164 @@ class AbstractRepository(ABC):
     def create_booking():
         raise NotImplementedError
     
+    @staticmethod
+    @abstractmethod
+    def create_bookings():
+        raise NotImplementedError
+    
     @staticmethod
     @abstractmethod
     def delete_booking():
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def delete_bookings():
+        raise NotImplementedError
+
 
 class BookingRepository(AbstractRepository):
     @staticmethod
-    def get_bookings_by_date(
-        session: Session,
+    async def get_bookings_by_date(
+        session: AsyncSession,
         check_date: date | None = None,
+        room_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        after_id: int | None = None
     ) -> list[Booking]:
+        stmt = select(Booking)
+        # Условия по датам - операторами диапазонов, чтобы работал GiST-индекс по stay
         if check_date:
-            stmt = (
-                select(Booking)
-                .where(Booking.check_in_date <= check_date, Booking.check_out_date >= check_date)
-                .offset(skip)
-                .limit(limit)
-                .order_by(Booking.id)
-            )
-        else: 
-            stmt = (
-                select(Booking)
-                .offset(skip)
-                .limit(limit)
-                .order_by(Booking.id)
-            )
-        bookings: list[Booking] = session.scalars(stmt).all()
+            stmt = stmt.where(Booking.stay.contains(check_date))
+        if room_id:
+            stmt = stmt.where(Booking.room_id == room_id)
+        # Пересечение с диапазоном [date_from, date_to] (границы включительные, любая может быть открытой)
+        if date_from or date_to:
+            stmt = stmt.where(Booking.stay.overlaps(Range(date_from, date_to, bounds="[]")))
+        # Курсор - keyset по первичному ключу, без OFFSET
+        if after_id is not None:
+            stmt = stmt.where(Booking.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        stmt = (
+            stmt
+            .limit(limit)
+            .order_by(Booking.id)
+        )
+        bookings: list[Booking] = (await session.scalars(stmt)).all()
         return bookings
     
     @staticmethod
-    def get_booking_by_id(
-        session: Session,
+    async def get_conflicting_dates(
+        session: AsyncSession,
+        room_id: int,
+        dates: list[date]
+    ) -> list[date]:
+        # Один запрос на весь набор дат: unnest + EXISTS по индексу (room_id, stay)
+        day = func.unnest(bindparam("dates", dates, type_=ARRAY(Date))).column_valued("day")
+        stmt = (
+            select(day)
+            .where(
+                exists().where(
+                    Booking.room_id == room_id,
+                    Booking.stay.contains(day)
+                )
+            )
+            .distinct()
+            .order_by(day)
+        )
+        return (await session.scalars(stmt)).all()
+
+    @staticmethod
+    async def get_booking_by_id(
+        session: AsyncSession,
         booking_id: int
-    ) -> Booking:
-        return session.get(Booking, booking_id)
+    ) -> Booking | None:
+        return await session.get(Booking, booking_id)
 
 
     @staticmethod
-    def create_booking(
-        session: Session,
+    async def create_booking(
+        session: AsyncSession,
         booking_in: BookingIn
     ) -> Booking:
+        # Только flush: коммит делается вместе с записью в outbox,
+        # после того как room_service зарезервировал даты
         try:
             booking = Booking(**booking_in.model_dump())
             session.add(booking)
-            session.commit()
+            await session.flush()
             return booking
+        except IntegrityError:
+            # Сработало ограничение excl_booking_room_id_stay: даты уже заняты
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Room is already booked for some of these dates"
+            )
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not add new booking"
             )    
         
     @staticmethod
-    def delete_booking(
-        session: Session,
+    async def create_bookings(
+        session: AsyncSession,
+        bookings_in: list[BookingIn]
+    ) -> list[Row]:
+        # Один многострочный INSERT без commit; строки, нарушившие
+        # excl_booking_room_id_stay, пропускаются и не попадают в RETURNING
+        stmt = (
+            insert(Booking)
+            .values([booking_in.model_dump() for booking_in in bookings_in])
+            .on_conflict_do_nothing()
+            .returning(
+                Booking.id,
+                Booking.room_id,
+                Booking.user_id,
+                Booking.check_in_date,
+                Booking.check_out_date
+            )
+        )
+        try:
+            return (await session.execute(stmt)).all()
+        except Exception:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not add new bookings"
+            )
+        
+    @staticmethod
+    async def delete_booking(
+        session: AsyncSession,
         booking_id: int
     ) -> None:
         try:
-            booking: Booking = session.get(Booking, booking_id)
-            session.delete(booking)
-            session.commit()
+            booking: Booking = await session.get(Booking, booking_id)
+            await session.delete(booking)
+            await session.commit()
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not delete booking"
             )
 
+    @staticmethod
+    async def delete_bookings(
+        session: AsyncSession,
+        booking_ids: list[int]
+    ) -> None:
+        # Без commit: удаление фиксируется вместе с состояниями саг
+        if booking_ids:
+            await session.execute(delete(Booking).where(Booking.id.in_(booking_ids)))
+
 # Зависимость для получения репозитория
 def get_booking_repository() -> BookingRepository:
     return BookingRepository
\ No newline at end of file
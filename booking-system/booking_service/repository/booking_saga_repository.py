@@ -0,0 +1,264 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from booking.enums import SagaState
+from booking.models import BookingSaga
+from booking.schemas import BookingIn
+from database.database import AsyncSession
+
+
+class AbstractRepository(ABC):
+    @staticmethod
+    @abstractmethod
+    def get_saga():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def create_saga():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def get_sagas():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def create_sagas():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def update_sagas():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def restart_saga():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def update_saga():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def claim_stale_sagas():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def delete_finished_sagas():
+        raise NotImplementedError
+
+
+class BookingSagaRepository(AbstractRepository):
+    """Состояния саг бронирования.
+
+    Сага адресуется по id, а не ORM-объектом: после rollback в шаге
+    саги объекты сессии просрочены, а id остается валидным.
+    """
+
+    @staticmethod
+    async def get_saga(
+        session: AsyncSession,
+        user_email: str,
+        idempotency_key: str
+    ) -> BookingSaga | None:
+        stmt = select(BookingSaga).where(
+            BookingSaga.user_email == user_email,
+            BookingSaga.idempotency_key == idempotency_key
+        )
+        return await session.scalar(stmt)
+
+    @staticmethod
+    async def create_saga(
+        session: AsyncSession,
+        user_email: str,
+        idempotency_key: str,
+        request_hash: str,
+        booking_in: BookingIn
+    ) -> int | None:
+        # None - параллельный запрос с тем же ключом успел создать сагу первым
+        stmt = (
+            insert(BookingSaga)
+            .values(
+                user_email=user_email,
+                idempotency_key=idempotency_key,
+                request_hash=request_hash,
+                state=SagaState.STARTED,
+                room_id=booking_in.room_id,
+                check_in_date=booking_in.check_in_date,
+                check_out_date=booking_in.check_out_date
+            )
+            .on_conflict_do_nothing(index_elements=["user_email", "idempotency_key"])
+            .returning(BookingSaga.id)
+        )
+        try:
+            saga_id: int | None = await session.scalar(stmt)
+            await session.commit()
+            return saga_id
+        except Exception:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not start booking"
+            )
+
+    @staticmethod
+    async def get_sagas(
+        session: AsyncSession,
+        user_email: str,
+        idempotency_keys: list[str]
+    ) -> list[BookingSaga]:
+        stmt = select(BookingSaga).where(
+            BookingSaga.user_email == user_email,
+            BookingSaga.idempotency_key.in_(idempotency_keys)
+        )
+        return (await session.scalars(stmt)).all()
+
+    @staticmethod
+    async def create_sagas(
+        session: AsyncSession,
+        user_email: str,
+        sagas: list[tuple[str, str, BookingIn]]
+    ) -> dict[str, int]:
+        # (idempotency_key, request_hash, бронь) -> {idempotency_key: id} только для новых саг
+        stmt = (
+            insert(BookingSaga)
+            .values([
+                {
+                    "user_email": user_email,
+                    "idempotency_key": idempotency_key,
+                    "request_hash": request_hash,
+                    "state": SagaState.STARTED,
+                    "room_id": booking_in.room_id,
+                    "check_in_date": booking_in.check_in_date,
+                    "check_out_date": booking_in.check_out_date,
+                }
+                for idempotency_key, request_hash, booking_in in sagas
+            ])
+            .on_conflict_do_nothing(index_elements=["user_email", "idempotency_key"])
+            .returning(BookingSaga.idempotency_key, BookingSaga.id)
+        )
+        try:
+            created: dict[str, int] = dict((await session.execute(stmt)).all())
+            await session.commit()
+            return created
+        except Exception:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not start bookings"
+            )
+
+    @staticmethod
+    async def update_sagas(
+        session: AsyncSession,
+        sagas: list[dict],
+        commit: bool = True
+    ) -> None:
+        # Пакетный UPDATE по первичному ключу: в каждом словаре есть id и новые значения
+        if sagas:
+            await session.execute(update(BookingSaga), sagas)
+        if commit:
+            await session.commit()
+
+    @staticmethod
+    async def restart_saga(
+        session: AsyncSession,
+        saga_id: int
+    ) -> bool:
+        # Повторно запускается только сага, упавшая на сбое сервера (5xx);
+        # условие в WHERE не даст двум повторам стартовать одновременно
+        stmt = (
+            update(BookingSaga)
+            .where(
+                BookingSaga.id == saga_id,
+                BookingSaga.state == SagaState.FAILED,
+                BookingSaga.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            .values(
+                state=SagaState.STARTED,
+                booking_id=None,
+                status_code=None,
+                response=None
+            )
+        )
+        result = await session.execute(stmt)
+        await session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    async def update_saga(
+        session: AsyncSession,
+        saga_id: int,
+        state: SagaState,
+        commit: bool = True,
+        **values
+    ) -> None:
+        # commit=False - состояние фиксируется вместе со следующим шагом саги
+        await session.execute(
+            update(BookingSaga)
+            .where(BookingSaga.id == saga_id)
+            .values(state=state, **values)
+        )
+        if commit:
+            await session.commit()
+
+    @staticmethod
+    async def claim_stale_sagas(
+        session: AsyncSession,
+        older_than: timedelta,
+        limit: int
+    ) -> list[BookingSaga]:
+        # Отобранные саги сразу "продлеваются" (updated_at = now()): другой экземпляр
+        # сервиса не возьмет их ближайшие stale_after секунд; SKIP LOCKED - без ожидания
+        stale_ids = (
+            select(BookingSaga.id)
+            .where(
+                BookingSaga.state.in_([
+                    SagaState.STARTED,
+                    SagaState.BOOKING_CREATED,
+                    SagaState.COMPENSATING
+                ]),
+                BookingSaga.updated_at < func.now() - older_than
+            )
+            .order_by(BookingSaga.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(BookingSaga)
+            .where(BookingSaga.id.in_(stale_ids))
+            .values(updated_at=func.now())
+            .returning(BookingSaga)
+        )
+        sagas: list[BookingSaga] = (await session.scalars(stmt)).all()
+        await session.commit()
+        return sagas
+
+    @staticmethod
+    async def delete_finished_sagas(
+        session: AsyncSession,
+        older_than: timedelta
+    ) -> int:
+        result = await session.execute(
+            delete(BookingSaga).where(
+                BookingSaga.state.in_([SagaState.COMPLETED, SagaState.FAILED]),
+                BookingSaga.updated_at < func.now() - older_than
+            )
+        )
+        await session.commit()
+        return result.rowcount
+
+
+# Зависимость для получения репозитория
+def get_booking_saga_repository() -> BookingSagaRepository:
+    return BookingSagaRepository
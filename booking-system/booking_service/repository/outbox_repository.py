@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select
+from booking.models import OutboxMessage
+from database.database import AsyncSession
+
+
+class AbstractRepository(ABC):
+    @staticmethod
+    @abstractmethod
+    def create_message():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def create_messages():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def get_pending_messages():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def delete_messages():
+        raise NotImplementedError
+
+
+class OutboxRepository(AbstractRepository):
+    @staticmethod
+    async def create_message(
+        session: AsyncSession,
+        routing_key: str,
+        payload: dict
+    ) -> OutboxMessage:
+        # Коммитит всю транзакцию сессии - вместе с бронированием
+        try:
+            message = OutboxMessage(routing_key=routing_key, payload=payload)
+            session.add(message)
+            await session.commit()
+            return message
+        except Exception:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not add new booking"
+            )
+
+    @staticmethod
+    async def create_messages(
+        session: AsyncSession,
+        messages: list[tuple[str, dict]]
+    ) -> None:
+        # (routing_key, payload) одним INSERT; коммитит всю транзакцию сессии
+        try:
+            if messages:
+                await session.execute(
+                    insert(OutboxMessage).values([
+                        {"routing_key": routing_key, "payload": payload}
+                        for routing_key, payload in messages
+                    ])
+                )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not add new bookings"
+            )
+
+    @staticmethod
+    async def get_pending_messages(
+        session: AsyncSession,
+        limit: int
+    ) -> list[OutboxMessage]:
+        # SKIP LOCKED - несколько воркеров не заберут одну и ту же пачку
+        stmt = (
+            select(OutboxMessage)
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        messages: list[OutboxMessage] = (await session.scalars(stmt)).all()
+        return messages
+
+    @staticmethod
+    async def delete_messages(
+        session: AsyncSession,
+        message_ids: list[int]
+    ) -> None:
+        if message_ids:
+            await session.execute(
+                delete(OutboxMessage).where(OutboxMessage.id.in_(message_ids))
+            )
+        await session.commit()
+
+
+# Зависимость для получения репозитория
+def get_outbox_repository() -> OutboxRepository:
+    return OutboxRepository
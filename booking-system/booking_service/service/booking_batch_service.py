@@ -0,0 +1,297 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import date, timedelta
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from booking.enums import SagaState
+from booking.schemas import BookingBatchItemOut, BookingIn, BookingOut, User
+from repository.booking_repository import BookingRepository, get_booking_repository
+from repository.booking_saga_repository import BookingSagaRepository, get_booking_saga_repository
+from repository.outbox_repository import OutboxRepository, get_outbox_repository
+from messaging.producer import ProducerNotification, get_producer
+from messaging.outbox_relay import OutboxRelay, get_outbox_relay
+from clients.room_client import RoomServiceClient, get_room_client
+from service.booking_service import BookingService, get_booking_service
+
+
+def get_booking_dates(booking_in: BookingIn) -> list[date]:
+    # Обе даты включительно, как и в одиночном бронировании
+    days: int = (booking_in.check_out_date - booking_in.check_in_date).days + 1
+    return [booking_in.check_in_date + timedelta(days=day) for day in range(days)]
+
+
+class AbstractBookingBatchService(ABC):
+    @staticmethod
+    @abstractmethod
+    def create_bookings():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def reserve_room_dates():
+        raise NotImplementedError
+
+
+class BookingBatchService(AbstractBookingBatchService):
+    """Пакетное создание броней (интеграция с channel manager).
+
+    Те же шаги саги, что и у POST /booking/, но каждый шаг - одна
+    операция на весь пакет: саги и брони пишутся многострочными INSERT,
+    даты резервируются одним вызовом room_service на номер, уведомления
+    уходят в outbox одной транзакцией. Результат - по каждой позиции.
+    """
+
+    @staticmethod
+    async def create_bookings(
+        session: AsyncSession,
+        bookings_in: list[BookingIn],
+        token: str,
+        user: User,
+        idempotency_key: str | None = None,
+        booking_service: BookingService = get_booking_service(),
+        booking_repository: BookingRepository = get_booking_repository(),
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
+        outbox_repository: OutboxRepository = get_outbox_repository(),
+        producer: ProducerNotification = get_producer(),
+        outbox_relay: OutboxRelay = get_outbox_relay(),
+    ) -> list[BookingBatchItemOut]:
+        results: dict[int, BookingBatchItemOut] = {}
+        # Позиция в пакете -> id саги, которую нужно пройти
+        pending: dict[int, int] = {}
+        # Ключ позиции - "<Idempotency-Key>:<номер>": повтор пакета повторяет и позиции
+        idempotency_key = idempotency_key or str(uuid4())
+        item_keys: dict[int, str] = {}
+        for index, booking_in in enumerate(bookings_in):
+            if booking_in.check_out_date < booking_in.check_in_date:
+                results[index] = BookingBatchItemOut(
+                    index=index,
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="'check_out_date' must not be earlier than 'check_in_date'"
+                )
+            else:
+                item_keys[index] = f"{idempotency_key}:{index}"
+        request_hashes: dict[int, str] = {
+            index: booking_service.get_request_hash(booking_in=bookings_in[index])
+            for index in item_keys
+        }
+        created_sagas: dict[str, int] = {}
+        if item_keys:
+            created_sagas = await saga_repository.create_sagas(
+                session=session,
+                user_email=user.email,
+                sagas=[(item_keys[index], request_hashes[index], bookings_in[index]) for index in item_keys]
+            )
+        for index, key in item_keys.items():
+            if key in created_sagas:
+                pending[index] = created_sagas[key]
+        # Повторы: сохраненный результат или перезапуск саги, упавшей на сбое сервера
+        replayed: dict[str, int] = {key: index for index, key in item_keys.items() if index not in pending}
+        if replayed:
+            for saga in await saga_repository.get_sagas(
+                session=session,
+                user_email=user.email,
+                idempotency_keys=list(replayed)
+            ):
+                index = replayed[saga.idempotency_key]
+                try:
+                    booking_out: BookingOut | None = await booking_service.resume_saga(
+                        session=session,
+                        saga=saga,
+                        request_hash=request_hashes[index]
+                    )
+                except HTTPException as exc:
+                    results[index] = BookingBatchItemOut(index=index, status_code=exc.status_code, detail=exc.detail)
+                    continue
+                if booking_out is not None:
+                    results[index] = BookingBatchItemOut(index=index, status_code=status.HTTP_201_CREATED, booking=booking_out)
+                else:
+                    pending[index] = saga.id
+            # Сагу успели удалить между вставкой и чтением (очистка по idempotency_ttl):
+            # результата нет, позицию можно просто повторить
+            for index in replayed.values():
+                if index not in results and index not in pending:
+                    results[index] = BookingBatchItemOut(
+                        index=index,
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Idempotency-Key state is no longer available, please retry"
+                    )
+
+        saga_updates: list[dict] = []
+
+        def fail(index: int, status_code: int, detail, state: SagaState = SagaState.FAILED) -> None:
+            results[index] = BookingBatchItemOut(index=index, status_code=status_code, detail=detail)
+            saga_updates.append({
+                "id": pending[index],
+                "state": state,
+                "status_code": status_code,
+                "response": {"detail": detail}
+            })
+
+        # Пересечения внутри пакета отсекаем до базы: позиции проверяются по порядку
+        # против уже принятых броней того же номера, выигрывает более ранняя позиция
+        accepted: dict[int, list[BookingIn]] = defaultdict(list)
+        for index in sorted(pending):
+            booking_in = bookings_in[index]
+            if any(
+                booking_in.check_in_date <= other.check_out_date and other.check_in_date <= booking_in.check_out_date
+                for other in accepted[booking_in.room_id]
+            ):
+                fail(index, status.HTTP_409_CONFLICT, "Overlaps another booking in this batch")
+                del pending[index]
+            else:
+                accepted[booking_in.room_id].append(booking_in)
+
+        # Шаг 1: все брони одним INSERT, вместе с переходом саг в BOOKING_CREATED
+        bookings: dict[int, BookingOut] = {}
+        if pending:
+            rows = await booking_repository.create_bookings(
+                session=session,
+                bookings_in=[bookings_in[index] for index in pending]
+            )
+            # После отсечения пересечений (номер, заезд) внутри пакета уникален
+            inserted: dict[tuple[int, date], BookingOut] = {
+                (row.room_id, row.check_in_date): BookingOut.model_validate(row, from_attributes=True)
+                for row in rows
+            }
+            for index in list(pending):
+                booking_out = inserted.get((bookings_in[index].room_id, bookings_in[index].check_in_date))
+                if booking_out is None:
+                    fail(index, status.HTTP_409_CONFLICT, "Room is already booked for some of these dates")
+                    del pending[index]
+                else:
+                    bookings[index] = booking_out
+                    saga_updates.append({
+                        "id": pending[index],
+                        "state": SagaState.BOOKING_CREATED,
+                        "booking_id": booking_out.id
+                    })
+        await saga_repository.update_sagas(session=session, sagas=saga_updates)
+        saga_updates.clear()
+
+        # Шаг 2: резерв дат - один вызов room_service на номер, номера параллельно
+        by_room: dict[int, list[int]] = defaultdict(list)
+        for index in pending:
+            by_room[bookings_in[index].room_id].append(index)
+        reservations = await asyncio.gather(*[
+            BookingBatchService.reserve_room_dates(
+                room_id=room_id,
+                items={index: get_booking_dates(bookings_in[index]) for index in indexes},
+                token=token
+            )
+            for room_id, indexes in by_room.items()
+        ])
+        reserved: list[int] = []
+        # Позиции, по которым неизвестно, сняты ли даты: их нужно вернуть номеру
+        uncertain: list[int] = []
+        for room_reserved, room_failed, room_uncertain in reservations:
+            reserved.extend(room_reserved)
+            for index, exc in room_failed.items():
+                fail(index, exc.status_code, exc.detail)
+            for index, exc in room_uncertain.items():
+                fail(index, exc.status_code, exc.detail, state=SagaState.COMPENSATING)
+                uncertain.append(index)
+
+        # Шаг 3: компенсации и завершение - одной транзакцией с уведомлениями
+        await booking_repository.delete_bookings(
+            session=session,
+            booking_ids=[bookings[index].id for index in pending if index not in reserved]
+        )
+        messages: list[tuple[str, dict]] = []
+        for index in reserved:
+            booking_out = bookings[index]
+            results[index] = BookingBatchItemOut(index=index, status_code=status.HTTP_201_CREATED, booking=booking_out)
+            saga_updates.append({
+                "id": pending[index],
+                "state": SagaState.COMPLETED,
+                "status_code": status.HTTP_201_CREATED,
+                "response": booking_out.model_dump(mode="json")
+            })
+            messages.append((
+                producer.queue,
+                producer.booking_information_message(
+                    username=user.username,
+                    email=user.email,
+                    booking=booking_out
+                )
+            ))
+        await saga_repository.update_sagas(session=session, sagas=saga_updates, commit=False)
+        await outbox_repository.create_messages(session=session, messages=messages)
+        if messages:
+            outbox_relay.wake_up()
+        for index in uncertain:
+            await booking_service.restore_saga_dates(
+                session=session,
+                saga_id=pending[index],
+                room_id=bookings[index].room_id,
+                date_from=bookings[index].check_in_date,
+                date_to=bookings[index].check_out_date,
+                token=token
+            )
+        return [results[index] for index in range(len(bookings_in))]
+
+
+    @staticmethod
+    async def reserve_room_dates(
+        room_id: int,
+        items: dict[int, list[date]],
+        token: str,
+        room_client: RoomServiceClient = get_room_client(),
+    ) -> tuple[list[int], dict[int, HTTPException], dict[int, HTTPException]]:
+        """Резервирует даты всех позиций одного номера одним вызовом room_service.
+
+        room_service резервирует все или ничего, поэтому при 409 позиции
+        с занятыми датами отбрасываются и вызов повторяется один раз.
+        Возвращает (зарезервированные, отклоненные, с неизвестным исходом).
+        """
+        failed: dict[int, HTTPException] = {}
+        pending: dict[int, list[date]] = dict(items)
+        for attempt in range(2):
+            dates: list[str] = sorted({day.isoformat() for days in pending.values() for day in days})
+            try:
+                response = await room_client.delete_room_available_dates(
+                    room_id=room_id,
+                    dates=dates,
+                    token=token
+                )
+            except HTTPException as exc:
+                # Клиент уже превратил сетевые ошибки в 503; снялись ли даты - неизвестно
+                return [], failed, {index: exc for index in pending}
+            if response.status_code == 200:
+                return list(pending), failed, {}
+            if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                exc = HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Room service error: {response.text}")
+                return [], failed, {index: exc for index in pending}
+            # Тело разбираем только у 409 от room_service: прочие 4xx (например,
+            # HTML-страница прокси) могут быть не JSON
+            detail = response.json().get('detail') if response.status_code == status.HTTP_409_CONFLICT else None
+            if not isinstance(detail, dict):
+                for index in pending:
+                    failed[index] = HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Can not delete dates from room service"
+                    )
+                return [], failed, {}
+            # room_service ничего не зарезервировал: отбрасываем позиции с занятыми датами
+            missing_dates: set[date] = {date.fromisoformat(day) for day in detail.get('missing_dates', [])}
+            for index, days in list(pending.items()):
+                conflicting = sorted(missing_dates.intersection(days))
+                if conflicting or attempt == 1:
+                    failed[index] = HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail={
+                            "message": "Not all dates are available",
+                            "missing_dates": [day.isoformat() for day in conflicting]
+                        }
+                    )
+                    del pending[index]
+            if not pending:
+                break
+        return [], failed, {}
+
+
+# Зависимость для получения сервиса
+def get_booking_batch_service() -> BookingBatchService:
+    return BookingBatchService
@@ -1,17 +1,20 @@
-import json
-import httpx
+import hashlib
 import logging
 from abc import ABC, abstractmethod
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta
+from uuid import uuid4
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from booking.schemas import BookingIn, BookingOut, User
-from booking.models import Booking
+from sqlalchemy.ext.asyncio import AsyncSession
+from booking.schemas import BookingConflictsIn, BookingConflictsOut, BookingIn, BookingOut, User
+from booking.enums import SagaState
+from booking.models import Booking, BookingSaga
 from repository.booking_repository import BookingRepository, get_booking_repository
-from messaging.producer import ProducerNotification
-
-ROOM_MICROSERVICE_URL = "http://room_service:8002"
-ROOM_AVAILABLE_DATE = "room/available_date"
+from repository.booking_saga_repository import BookingSagaRepository, get_booking_saga_repository
+from repository.outbox_repository import OutboxRepository, get_outbox_repository
+from messaging.producer import ProducerNotification, get_producer
+from messaging.outbox_relay import OutboxRelay, get_outbox_relay
+from config import settings
+from clients.room_client import RoomServiceClient, get_room_client
 
 class AbstractBookingService(ABC):
     @staticmethod
@@ -19,11 +22,26 @@ class AbstractBookingService(ABC):
     def get_bookings_by_date():
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def get_conflicting_dates():
+        raise NotImplementedError
+
     @staticmethod
     @abstractmethod
     def create_booking():
         raise NotImplementedError
     
+    @staticmethod
+    @abstractmethod
+    def run_booking_saga():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def compensate_booking_saga():
+        raise NotImplementedError
+
     @staticmethod
     @abstractmethod
     def delete_booking():
@@ -32,137 +50,398 @@ class AbstractBookingService(ABC):
 
 class BookingService(AbstractBookingService):
     @staticmethod
-    def get_bookings_by_date(
-        session: Session,
+    async def get_bookings_by_date(
+        session: AsyncSession,
         booking_repository: BookingRepository = get_booking_repository(),
         check_date: date | None = None,
+        room_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        after_id: int | None = None
     ) -> list[BookingOut]:
-        bookings: list[Booking] = booking_repository.get_bookings_by_date(
+        # Перевернутый диапазон Postgres не построит (daterange требует lower <= upper)
+        if date_from and date_to and date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'date_to' must not be earlier than 'date_from'"
+            )
+        bookings: list[Booking] = await booking_repository.get_bookings_by_date(
             session=session,
             check_date=check_date,
+            room_id=room_id,
+            date_from=date_from,
+            date_to=date_to,
             skip=skip,            
-            limit=limit
+            limit=limit,
+            after_id=after_id
         )
         bookings_schemas: list[BookingOut] = [BookingOut.model_validate(booking, from_attributes=True) for booking in bookings]
         return bookings_schemas
 
 
     @staticmethod
-    def create_booking(
-        session: Session,
+    async def get_conflicting_dates(
+        session: AsyncSession,
+        conflicts_in: BookingConflictsIn,
+        booking_repository: BookingRepository = get_booking_repository(),
+    ) -> BookingConflictsOut:
+        conflicting_dates: list[date] = await booking_repository.get_conflicting_dates(
+            session=session,
+            room_id=conflicts_in.room_id,
+            dates=conflicts_in.dates
+        )
+        return BookingConflictsOut(
+            room_id=conflicts_in.room_id,
+            dates=conflicting_dates
+        )
+
+
+    @staticmethod
+    async def create_booking(
+        session: AsyncSession,
         booking_in: BookingIn,
         token: str,
         user: User,
-        booking_repository: BookingRepository = get_booking_repository(),
+        idempotency_key: str | None = None,
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
     ) -> BookingOut:
-        with httpx.Client() as client:
-            url = f"{ROOM_MICROSERVICE_URL}/{ROOM_AVAILABLE_DATE}/{booking_in.room_id}/"
-            headers = {"Authorization": f"Bearer {token}"}
-            # Генерим даты от начала до конца бронирования
-            booking_dates = [(booking_in.check_in_date + timedelta(days=day)).strftime("%Y-%m-%d") for day in range((booking_in.check_out_date - booking_in.check_in_date).days + 1)]
-            logging.info(f"Dates: {booking_dates}")
-            try:
-                logging.info(f"Connecting to URL: {url} with params: {booking_in.room_id} and headers: {headers}")
-                response = client.get(
-                    url=url,
-                    headers=headers
-                )
-                response.raise_for_status()
-                response_data = response.json()
-                room_dates = [room.get('date') for room in response_data]
-                logging.info(f"Response data: {response_data}")  # Отладочная информация
-            except httpx.HTTPStatusError as exc:
-                raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
-            except httpx.ConnectError as exc:
-                raise HTTPException(status_code=500, detail=f"Connection refused: {str(exc)}")
-        # Проверка все ли даты есть в room
-        if not all(date in room_dates for date in booking_dates):
-            raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Not all desired days for booking are available"
-        )
-        booking: Booking = booking_repository.create_booking(
+        # Без Idempotency-Key сага все равно пишется (для компенсаций), но повтор ее не найдет
+        idempotency_key = idempotency_key or str(uuid4())
+        request_hash: str = BookingService.get_request_hash(booking_in=booking_in)
+        saga_id: int | None = await saga_repository.create_saga(
             session=session,
+            user_email=user.email,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
             booking_in=booking_in
         )
-        with httpx.Client() as client:
-            headers = {"Authorization": f"Bearer {token}"}
-            url = f"{ROOM_MICROSERVICE_URL}/{ROOM_AVAILABLE_DATE}/{booking.room_id}/"
-            try:
-                response = client.request(
-                    method="DELETE",
-                    url=url,
-                    headers=headers,
-                    json={
-                        'dates': room_dates
-                    }
+        if saga_id is None:
+            # Повтор запроса: отвечаем сохраненным результатом, ничего не выполняя
+            saga: BookingSaga = await saga_repository.get_saga(
+                session=session,
+                user_email=user.email,
+                idempotency_key=idempotency_key
+            )
+            booking_out: BookingOut | None = await BookingService.resume_saga(
+                session=session,
+                saga=saga,
+                request_hash=request_hash
+            )
+            if booking_out is not None:
+                return booking_out
+            saga_id = saga.id
+        return await BookingService.run_booking_saga(
+            saga_id=saga_id,
+            session=session,
+            booking_in=booking_in,
+            token=token,
+            user=user
+        )
+
+
+    @staticmethod
+    def get_request_hash(booking_in: BookingIn) -> str:
+        return hashlib.sha256(booking_in.model_dump_json().encode()).hexdigest()
+
+
+    @staticmethod
+    async def resume_saga(
+        session: AsyncSession,
+        saga: BookingSaga,
+        request_hash: str,
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
+    ) -> BookingOut | None:
+        """Результат уже существующей саги с тем же Idempotency-Key.
+
+        Возвращает сохраненную бронь или поднимает сохраненную ошибку;
+        None - сага упала на сбое сервера и перезапущена, ее нужно пройти заново.
+        """
+        if saga.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key has already been used with a different request"
+            )
+        if saga.state == SagaState.COMPLETED:
+            return BookingOut.model_validate(saga.response)
+        if saga.state == SagaState.FAILED and saga.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+            raise HTTPException(status_code=saga.status_code, detail=saga.response.get("detail"))
+        # Сагу, упавшую на сбое сервера, можно пройти заново; незавершенную - нельзя
+        if saga.state != SagaState.FAILED or not await saga_repository.restart_saga(session=session, saga_id=saga.id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+                headers={"Retry-After": "1"}
+            )
+        return None
+
+
+    @staticmethod
+    async def run_booking_saga(
+        saga_id: int,
+        session: AsyncSession,
+        booking_in: BookingIn,
+        token: str,
+        user: User,
+        booking_repository: BookingRepository = get_booking_repository(),
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
+        outbox_repository: OutboxRepository = get_outbox_repository(),
+        room_client: RoomServiceClient = get_room_client(),
+        producer: ProducerNotification = get_producer(),
+        outbox_relay: OutboxRelay = get_outbox_relay(),
+    ) -> BookingOut:
+        # Генерим даты от начала до конца бронирования
+        booking_dates = [(booking_in.check_in_date + timedelta(days=day)).strftime("%Y-%m-%d") for day in range((booking_in.check_out_date - booking_in.check_in_date).days + 1)]
+        logging.info(f"Dates: {booking_dates}")
+        # Шаг 1: даты захватываются в room_service одним атомарным шагом -
+        # проигравший в гонке за номер получает 409 сразу, до записи брони
+        try:
+            hold: dict = await room_client.hold_room_available_dates(
+                room_id=booking_in.room_id,
+                date_from=booking_in.check_in_date,
+                date_to=booking_in.check_out_date,
+                ttl=settings.room_service.hold_ttl,
+                token=token
+            )
+        except HTTPException as exc:
+            # Отменять нечего
+            await BookingService.fail_saga(session=session, saga_id=saga_id, exc=exc)
+            raise
+        hold_id: str = hold['hold_id']
+        # Шаг 2: бронирование записывается вместе с переходом саги в BOOKING_CREATED
+        try:
+            booking: Booking = await booking_repository.create_booking(
+                session=session,
+                booking_in=booking_in
+            )
+            booking_out_schema = BookingOut.model_validate(obj=booking, from_attributes=True)
+            await saga_repository.update_saga(
+                session=session,
+                saga_id=saga_id,
+                state=SagaState.BOOKING_CREATED,
+                booking_id=booking_out_schema.id
+            )
+        except HTTPException as exc:
+            await session.rollback()
+            await room_client.release_room_available_dates_hold(
+                room_id=booking_in.room_id,
+                hold_id=hold_id,
+                token=token
+            )
+            await BookingService.fail_saga(session=session, saga_id=saga_id, exc=exc)
+            raise
+        # Шаг 3: захваченные даты забираются у номера
+        try:
+            response = await room_client.delete_room_available_dates(
+                room_id=booking_out_schema.room_id,
+                dates=booking_dates,
+                token=token,
+                hold_id=hold_id
+            )
+        except HTTPException as exc:
+            # Неизвестно, успел ли room_service снять даты - возвращаем их при компенсации
+            await BookingService.compensate_booking_saga(
+                session=session,
+                saga_id=saga_id,
+                booking=booking_out_schema,
+                exc=exc,
+                token=token,
+                hold_id=hold_id,
+                restore_dates=True
+            )
+            raise
+        if response.status_code != 200:
+            if response.status_code == 409:
+                # room_service ничего не зарезервировал: кто-то успел занять часть дат
+                exc = HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=response.json().get('detail')
                 )
-                if response.status_code == 204:
-                    booking_out_schema = BookingOut.model_validate(obj=booking, from_attributes=True)
-                    with ProducerNotification() as producer:
-                        producer.send_booking_information_to_notification_service(
-                            username=user.username, 
-                            email=user.email,
-                            booking=booking_out_schema
-                        )
-                    return booking_out_schema
-                raise HTTPException(
+            else:
+                exc = HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, 
                     detail="Can not delete dates from room service"
                 )
-            except httpx.HTTPStatusError as exc:
-                raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
-            except httpx.ConnectError as exc:
-                raise HTTPException(status_code=500, detail=f"Connection refused: {str(exc)}")
-        
+            await BookingService.compensate_booking_saga(
+                session=session,
+                saga_id=saga_id,
+                booking=booking_out_schema,
+                exc=exc,
+                token=token,
+                # Захват снимаем сразу, а не ждем hold_ttl: номер снова доступен другим
+                hold_id=hold_id,
+                # На 5xx даты могли успеть сняться
+                restore_dates=response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            raise exc
+        # Шаг 4: уведомление в outbox и ответ для повторов - одной транзакцией
+        try:
+            await saga_repository.update_saga(
+                session=session,
+                saga_id=saga_id,
+                state=SagaState.COMPLETED,
+                commit=False,
+                status_code=status.HTTP_201_CREATED,
+                response=booking_out_schema.model_dump(mode="json")
+            )
+            # Уведомление пишется в outbox той же транзакцией; в RabbitMQ его отправит фоновый relay
+            await outbox_repository.create_message(
+                session=session,
+                routing_key=producer.queue,
+                payload=producer.booking_information_message(
+                    username=user.username,
+                    email=user.email,
+                    booking=booking_out_schema
+                )
+            )
+        except HTTPException as exc:
+            await BookingService.compensate_booking_saga(
+                session=session,
+                saga_id=saga_id,
+                booking=booking_out_schema,
+                exc=exc,
+                token=token,
+                hold_id=hold_id,
+                restore_dates=True
+            )
+            raise
+        outbox_relay.wake_up()
+        return booking_out_schema
+
 
     @staticmethod
-    def delete_booking(
+    async def fail_saga(
+        session: AsyncSession,
+        saga_id: int,
+        exc: HTTPException,
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
+    ) -> None:
+        await saga_repository.update_saga(
+            session=session,
+            saga_id=saga_id,
+            state=SagaState.FAILED,
+            status_code=exc.status_code,
+            response={"detail": exc.detail}
+        )
+
+
+    @staticmethod
+    async def compensate_booking_saga(
+        session: AsyncSession,
+        saga_id: int,
+        booking: BookingOut,
+        exc: HTTPException,
+        token: str,
+        restore_dates: bool,
+        hold_id: str | None = None,
+        booking_repository: BookingRepository = get_booking_repository(),
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
+        room_client: RoomServiceClient = get_room_client(),
+    ) -> None:
+        await session.rollback()
+        # Бронирование удаляется одной транзакцией с переходом саги; удаление
+        # идемпотентно - бронь мог уже отменить пользователь
+        await booking_repository.delete_bookings(
+            session=session,
+            booking_ids=[booking.id]
+        )
+        await saga_repository.update_saga(
+            session=session,
+            saga_id=saga_id,
+            state=SagaState.COMPENSATING if restore_dates else SagaState.FAILED,
+            status_code=exc.status_code,
+            response={"detail": exc.detail}
+        )
+        if hold_id is not None:
+            # Если даты не были забраны, они свободны сразу, а не по истечении захвата
+            await room_client.release_room_available_dates_hold(
+                room_id=booking.room_id,
+                hold_id=hold_id,
+                token=token
+            )
+        if restore_dates:
+            await BookingService.restore_saga_dates(
+                session=session,
+                saga_id=saga_id,
+                room_id=booking.room_id,
+                date_from=booking.check_in_date,
+                date_to=booking.check_out_date,
+                token=token
+            )
+
+
+    @staticmethod
+    async def restore_saga_dates(
+        session: AsyncSession,
+        saga_id: int,
+        room_id: int,
+        date_from: date,
+        date_to: date,
+        token: str,
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
+        room_client: RoomServiceClient = get_room_client(),
+    ) -> bool:
+        # Если room_service недоступен, сага остается в COMPENSATING - ее доведет фоновая задача
+        try:
+            response = await room_client.restore_room_available_dates(
+                room_id=room_id,
+                date_from=date_from,
+                date_to=date_to,
+                token=token
+            )
+        except HTTPException as exc:
+            logging.error(f"Saga {saga_id}: can not restore room dates: {exc.detail}")
+            return False
+        # 409 - даты уже заняла другая бронь, возвращать нечего
+        if response.status_code not in (201, 409):
+            logging.error(f"Saga {saga_id}: room service answered {response.status_code} while restoring dates")
+            return False
+        await saga_repository.update_saga(
+            session=session,
+            saga_id=saga_id,
+            state=SagaState.FAILED
+        )
+        return True
+
+
+    @staticmethod
+    async def delete_booking(
         booking_id: int,
         token: str,
-        session: Session,
+        session: AsyncSession,
         booking_repository: BookingRepository = get_booking_repository(),
+        room_client: RoomServiceClient = get_room_client(),
     ) -> None:
-        booking: Booking = booking_repository.get_booking_by_id(
+        booking: Booking | None = await booking_repository.get_booking_by_id(
             session=session,
             booking_id=booking_id
         )
-        booking_repository.delete_booking(
+        if booking is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Booking not found"
+            )
+        await booking_repository.delete_booking(
             booking_id=booking_id,
             session=session,
         ) 
-        with httpx.Client() as client:
-            url = f"{ROOM_MICROSERVICE_URL}/{ROOM_AVAILABLE_DATE}/"
-            headers = {"Authorization": f"Bearer {token}"}
-            # Генерим даты от начала до конца бронирования
-            booking_dates = [
-                (booking.check_in_date + timedelta(days=day)).strftime("%Y-%m-%d") 
-                for day in range((booking.check_out_date - booking.check_in_date).days + 1)
-            ]
-            try:
-                logging.info(f"Connecting to URL: {url} with headers: {headers}")
-                for date in booking_dates:
-                    date = datetime.strptime(date, "%Y-%m-%d")
-                    if date > datetime.now():
-                        response = client.post(
-                            url=url,
-                            headers=headers,
-                            json={
-                                'room_id': booking.room_id,
-                                'date': date.date().isoformat()
-                            }
-                        )
-                        if response.status_code != 201:
-                            raise HTTPException(
-                                status_code=status.HTTP_400_BAD_REQUEST,
-                                detail="Can not create room available date while deleting booking"
-                            )
-            except httpx.HTTPStatusError as exc:
-                raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
-            except httpx.ConnectError as exc:
-                raise HTTPException(status_code=500, detail=f"Connection refused: {str(exc)}")
+        # Возвращаем в календарь только будущие даты бронирования
+        date_from: date = max(booking.check_in_date, date.today() + timedelta(days=1))
+        if date_from > booking.check_out_date:
+            return None
+        # Один запрос на весь диапазон вместо POST на каждую дату
+        response = await room_client.restore_room_available_dates(
+            room_id=booking.room_id,
+            date_from=date_from,
+            date_to=booking.check_out_date,
+            token=token
+        )
+        if response.status_code != 201:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not create room available date while deleting booking"
+            )
 
 
 # Зависимость для получения сервиса
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from booking.auth import issue_service_token
+from booking.enums import SagaState
+from booking.models import BookingSaga
+from config import settings
+from database import db_helper
+from repository.booking_repository import BookingRepository, get_booking_repository
+from repository.booking_saga_repository import BookingSagaRepository, get_booking_saga_repository
+from service.booking_service import BookingService, get_booking_service
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class SagaRecovery:
+    """Фоновая задача, которая доводит брошенные саги бронирования.
+
+    Сага, не менявшая состояние дольше stale_after секунд (процесс упал
+    посреди запроса или room_service не ответил на компенсацию),
+    откатывается: STARTED просто помечается FAILED, у BOOKING_CREATED
+    удаляется бронь, а даты COMPENSATING возвращаются номеру. Заодно
+    удаляются завершенные саги старше idempotency_ttl.
+    """
+    task: asyncio.Task | None = None
+
+    def __init__(
+        self,
+        stale_after: float,
+        interval: float,
+        batch_size: int,
+        idempotency_ttl: int,
+        booking_service: BookingService = get_booking_service(),
+        booking_repository: BookingRepository = get_booking_repository(),
+        saga_repository: BookingSagaRepository = get_booking_saga_repository(),
+    ) -> None:
+        self.stale_after = stale_after
+        self.interval = interval
+        self.batch_size = batch_size
+        self.idempotency_ttl = idempotency_ttl
+        self.booking_service = booking_service
+        self.booking_repository = booking_repository
+        self.saga_repository = saga_repository
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+            logger.info("Saga recovery started")
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+            logger.info("Saga recovery stopped")
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.recover_batch()
+                await self.delete_finished()
+            except Exception as e:
+                logger.error(f"Saga recovery failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def recover_batch(self) -> int:
+        # Возраст саги считает Postgres по своим часам (updated_at = now())
+        async with db_helper.async_session_factory() as session:
+            sagas: list[BookingSaga] = await self.saga_repository.claim_stale_sagas(
+                session=session,
+                older_than=timedelta(seconds=self.stale_after),
+                limit=self.batch_size
+            )
+        # Каждая сага - в своей сессии: сбой одной не откатывает остальные
+        for saga in sagas:
+            async with db_helper.async_session_factory() as session:
+                try:
+                    await self.recover_saga(session=session, saga=saga)
+                except Exception as e:
+                    logger.error(f"Saga {saga.id}: recovery failed: {e}")
+        if sagas:
+            logger.info(f"Saga recovery processed {len(sagas)} stale sagas")
+        return len(sagas)
+
+    async def recover_saga(
+        self,
+        session: AsyncSession,
+        saga: BookingSaga,
+    ) -> None:
+        exc = HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Booking was interrupted, please retry"
+        )
+        if saga.state == SagaState.STARTED:
+            await self.booking_service.fail_saga(session=session, saga_id=saga.id, exc=exc)
+            return
+        if saga.state == SagaState.BOOKING_CREATED:
+            # Резерв дат мог и пройти - бронь удаляем, даты возвращаем. Удаление
+            # идемпотентно (бронь мог уже отменить пользователь) и фиксируется
+            # одной транзакцией с переходом саги
+            await self.booking_repository.delete_bookings(
+                session=session,
+                booking_ids=[saga.booking_id]
+            )
+            await self.saga_repository.update_saga(
+                session=session,
+                saga_id=saga.id,
+                state=SagaState.COMPENSATING,
+                status_code=exc.status_code,
+                response={"detail": exc.detail}
+            )
+        await self.booking_service.restore_saga_dates(
+            session=session,
+            saga_id=saga.id,
+            room_id=saga.room_id,
+            date_from=saga.check_in_date,
+            date_to=saga.check_out_date,
+            token=issue_service_token()
+        )
+
+    async def delete_finished(self) -> int:
+        async with db_helper.async_session_factory() as session:
+            return await self.saga_repository.delete_finished_sagas(
+                session=session,
+                older_than=timedelta(seconds=self.idempotency_ttl)
+            )
+
+
+saga_recovery = SagaRecovery(
+    stale_after=settings.saga.stale_after,
+    interval=settings.saga.recovery_interval,
+    batch_size=settings.saga.batch_size,
+    idempotency_ttl=settings.saga.idempotency_ttl,
+)
+
+
+# Зависимость для получения задачи восстановления саг
+def get_saga_recovery() -> SagaRecovery:
+    return saga_recovery
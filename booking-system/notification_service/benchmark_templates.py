@@ -0,0 +1,68 @@
+"""Замер стоимости письма о бронировании на одно сообщение.
+
+Запуск: python benchmark_templates.py [количество писем]
+"""
+import sys
+import timeit
+from email.message import EmailMessage
+
+from templates import email_templates
+from utils import get_email_template_dashboard
+
+
+USERNAME = "Иван"
+EMAIL = "ivan@example.com"
+BOOKING = {
+    "id": 1,
+    "room_id": 101,
+    "user_id": 1,
+    "check_in_date": "2030-01-01",
+    "check_out_date": "2030-01-05",
+}
+
+
+def legacy_email_message(username, email, booking):
+    # Прежний вариант: f-строка и новый EmailMessage на каждое письмо
+    email_message = EmailMessage()
+    email_message['Subject'] = 'Подтверждение Бронирования Номера'
+    email_message['From'] = "noreply@example.com"
+    email_message['TO'] = email
+    email_message.set_content(
+        f'''
+        <div>
+            <h1 style="color: blue;">Здравствуйте, {username},</h1>
+            <p>Ваше бронирование подтверждено! Вот детали вашего бронирования:</p>
+            <ul>
+                <li><strong>Номер:</strong> {booking['room_id']}</li>
+                <li><strong>Дата заезда:</strong> {booking['check_in_date']}</li>
+                <li><strong>Дата выезда:</strong> {booking['check_out_date']}</li>
+            </ul>
+            <p>Спасибо, что выбрали нас!</p>
+            <img src="https://example.com/hotel-room.jpg" width="600" alt="Фото номера">
+        </div>
+        ''',
+        subtype='html'
+    )
+    return email_message
+
+
+def run(number: int) -> None:
+    load_time = timeit.timeit(email_templates.load, number=1)
+    print(f"load (compile all templates): {load_time * 1000:.2f} ms")
+    cases = {
+        "render only (ru)": lambda: email_templates.render(
+            name="booking_confirmation", locale="ru", username=USERNAME, booking=BOOKING
+        ),
+        "render only (unknown locale)": lambda: email_templates.render(
+            name="booking_confirmation", locale="de", username=USERNAME, booking=BOOKING
+        ),
+        "full message (jinja2)": lambda: get_email_template_dashboard(USERNAME, EMAIL, BOOKING, "ru"),
+        "full message (legacy f-string)": lambda: legacy_email_message(USERNAME, EMAIL, BOOKING),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=number, repeat=3))
+        print(f"{name}: {seconds / number * 1_000_000:.1f} us/message")
+
+
+if __name__ == "__main__":
+    run(number=int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 from dotenv import load_dotenv
 
@@ -12,4 +13,41 @@ SMTP_USER = os.getenv("SMTP_USER")  #
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")  #
 SMTP_HOST = os.getenv("SMTP_HOST")  #
 SMTP_PORT = os.getenv("SMTP_PORT")  #
-###################################################
\ No newline at end of file
+# false - обычный SMTP (например, локальный local_smtp_server.py)
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() == "true"  #
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))  #
+# Сколько авторизованных SMTP-сессий держать открытыми
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 8))  #
+# Сессию, простоявшую дольше, перед отправкой проверяем NOOP
+SMTP_HEALTHCHECK_INTERVAL = float(os.getenv("SMTP_HEALTHCHECK_INTERVAL", 30))  #
+###################################################
+
+###################################################
+RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "rabbitmq")  #
+RABBITMQ_PORT = int(os.getenv("RABBITMQ_PORT", 5672))  #
+# Должны совпадать с RABBITMQ__EXCHANGE / RABBITMQ__QUEUE в booking_service
+RABBITMQ_EXCHANGE = os.getenv("RABBITMQ_EXCHANGE", "services")  #
+RABBITMQ_QUEUE = os.getenv("RABBITMQ_QUEUE", "GET_BOOKING_INFORMATION")  #
+###################################################
+
+###################################################
+# Сколько неподтвержденных сообщений брокер отдает консьюмеру (basic_qos);
+# сообщения в открытых окнах дайджеста тоже не подтверждены, поэтому не меньше DIGEST_MAX_SIZE
+CONSUMER_PREFETCH = int(os.getenv("CONSUMER_PREFETCH", 64))  #
+# Сколько писем отправляется параллельно; 1 - обработка прямо в потоке соединения
+CONSUMER_WORKERS = int(os.getenv("CONSUMER_WORKERS", 8))  #
+###################################################
+
+###################################################
+# Шаблоны писем: <EMAIL_TEMPLATES_DIR>/<локаль>/<имя>.html
+EMAIL_TEMPLATES_DIR = os.getenv("EMAIL_TEMPLATES_DIR", str(Path(__file__).parent / "templates"))  #
+EMAIL_DEFAULT_LOCALE = os.getenv("EMAIL_DEFAULT_LOCALE", "ru")  #
+###################################################
+
+###################################################
+# Сообщения одному получателю копятся не дольше окна и отправляются одним письмом-дайджестом;
+# 0 - каждое бронирование отдельным письмом
+DIGEST_WINDOW_SECONDS = float(os.getenv("DIGEST_WINDOW_SECONDS", 2))  #
+# Дайджест отправляется сразу, как только в нем набралось столько бронирований
+DIGEST_MAX_SIZE = int(os.getenv("DIGEST_MAX_SIZE", 16))  #
+###################################################
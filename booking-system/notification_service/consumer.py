@@ -1,8 +1,23 @@
 import pika
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pika.exceptions import AMQPConnectionError
-from utils import send_email
+from config import (
+    CONSUMER_PREFETCH,
+    CONSUMER_WORKERS,
+    DIGEST_MAX_SIZE,
+    DIGEST_WINDOW_SECONDS,
+    RABBITMQ_EXCHANGE,
+    RABBITMQ_HOST,
+    RABBITMQ_PORT,
+    RABBITMQ_QUEUE
+)
+from digest import Delivery, DigestAggregator, DigestBatch
+from templates import email_templates
+from topology import ATTEMPT_HEADER, MAX_ATTEMPTS, Topology
+from utils import send_digest_email, send_email, smtp_pool
 
 # Logger setup
 logging.basicConfig(
@@ -14,46 +29,184 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Чем закончилась обработка сообщения
+PROCESSED = "processed"
+RETRY = "retry"
+DEAD = "dead"
+
+
 class ConsumerNotification:
+    """Консьюмер уведомлений о бронированиях.
+
+    При workers > 1 письма отправляются пулом потоков: брокер держит у нас
+    до prefetch_count неподтвержденных сообщений, а результат возвращается
+    в поток соединения через add_callback_threadsafe (канал pika
+    не потокобезопасен). При workers == 1 сообщение обрабатывается прямо
+    в потоке соединения, как раньше.
+
+    Неудачная отправка не возвращается в очередь сразу: сообщение уходит
+    в очередь задержки своей попытки, после MAX_ATTEMPTS или если его
+    нельзя разобрать - в dead-letter очередь.
+
+    Сообщения одному получателю собираются в окно (DIGEST_WINDOW_SECONDS /
+    DIGEST_MAX_SIZE) и отправляются одним письмом-дайджестом; все сообщения
+    пачки подтверждаются вместе, одним вызовом в потоке соединения,
+    и только после отправки письма.
+    """
     channel = None
     connection = None
-    def __init__(self):
+    executor = None
+    def __init__(
+        self,
+        prefetch_count: int = CONSUMER_PREFETCH,
+        workers: int = CONSUMER_WORKERS,
+        digest_window_seconds: float = DIGEST_WINDOW_SECONDS,
+        digest_max_size: int = DIGEST_MAX_SIZE,
+        exchange: str = RABBITMQ_EXCHANGE,
+        queue: str = RABBITMQ_QUEUE,
+    ):
+        self.topology = Topology(exchange=exchange, queue=queue)
+        self.digest = DigestAggregator(
+            window_seconds=digest_window_seconds,
+            max_size=digest_max_size
+        )
+        # Брокер не отдаст больше prefetch_count неподтвержденных сообщений: при меньшем
+        # значении дайджест никогда не наберется по размеру, а консьюмер простаивает до конца окна
+        if self.digest.enabled and prefetch_count < digest_max_size:
+            raise ValueError(
+                f"CONSUMER_PREFETCH ({prefetch_count}) must not be less than DIGEST_MAX_SIZE ({digest_max_size})"
+            )
+        # Шаблоны писем компилируются один раз, до первого сообщения
+        email_templates.load()
         try:
-            self.json_data = None
-            self.connection = pika.BlockingConnection(pika.ConnectionParameters(host="rabbitmq", port=5672))
+            self.connection = pika.BlockingConnection(pika.ConnectionParameters(host=RABBITMQ_HOST, port=RABBITMQ_PORT))
             self.channel = self.connection.channel()
-            # Обьявляем точку обмена
-            self.channel.exchange_declare(
-                exchange="services", exchange_type="direct"
-            )
-            # Обьявляем очередь
-            self.channel.queue_declare(queue="GET_BOOKING_INFORMATION", durable=True)
-            # Связываем очередь с обменником
-            self.channel.queue_bind(
-                queue="GET_BOOKING_INFORMATION", 
-                exchange="services", 
-                routing_key="GET_BOOKING_INFORMATION"
-            )
+            # Обьявляем точку обмена, очередь, очереди задержки для повторов и dead-letter
+            self.topology.declare(self.channel)
+            # Без qos брокер отдает всю очередь сразу; с qos - не больше prefetch_count
+            self.channel.basic_qos(prefetch_count=prefetch_count)
+            if workers > 1:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="notification-worker"
+                )
         except AMQPConnectionError as e:
             logging.error(f"Failed to connect to RabbitMQ: {e}!!!!!!!")
 
-    def callback(self, ch, method, properties, body):
+    @staticmethod
+    def decode_message(body) -> dict | None:
         try:
             message_str = body.decode()
-            self.json_data = json.loads(message_str)
-            logger.info(f" [x] Received {self.json_data['username']} and {self.json_data['email']} and {self.json_data['booking']}")
-            send_email(username=self.json_data['username'], email=self.json_data['email'], booking=self.json_data['booking'])
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-        except json.JSONDecodeError as e:
-            logger.info(f"Failed to decode JSON: {e}")
-            ch.basic_nack(delivery_tag=method.delivery_tag)
+            json_data = json.loads(message_str)
+            logger.info(f" [x] Received {json_data['username']} and {json_data['email']} and {json_data['booking']}")
+            return json_data
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as e:
+            # Битое сообщение повтор не исправит
+            logger.info(f"Failed to decode message: {e}")
+            return None
+
+    @staticmethod
+    def send_deliveries(deliveries: list[Delivery]) -> str:
+        # Все сообщения пачки адресованы одному получателю
+        first, last = deliveries[0].json_data, deliveries[-1].json_data
+        try:
+            if len(deliveries) == 1:
+                send_email(
+                    username=first['username'],
+                    email=first['email'],
+                    booking=first['booking'],
+                    locale=first.get('locale')
+                )
+            else:
+                send_digest_email(
+                    username=last['username'],
+                    email=first['email'],
+                    bookings=[delivery.json_data['booking'] for delivery in deliveries],
+                    locale=first.get('locale')
+                )
+            return PROCESSED
         except Exception as e:
             logger.info(f"An error occurred: {e}")
-            ch.basic_nack(delivery_tag=method.delivery_tag)
+            return RETRY
+
+    def callback(self, ch, method, properties, body):
+        json_data = self.decode_message(body)
+        if json_data is None:
+            self.settle(ch, method.delivery_tag, properties, body, DEAD)
+            return
+        delivery = Delivery(ch, method.delivery_tag, properties, body, json_data)
+        if not self.digest.enabled:
+            self.dispatch([delivery])
+            return
+        batch, opened = self.digest.add(json_data['email'], delivery)
+        if opened:
+            # Таймер срабатывает в потоке соединения, внутри start_consuming
+            self.connection.call_later(
+                self.digest.window_seconds,
+                partial(self.flush_batch, batch)
+            )
+        if self.digest.is_full(batch):
+            self.flush_batch(batch)
+
+    def flush_batch(self, batch: DigestBatch):
+        if self.digest.pop(batch):
+            self.dispatch(batch.deliveries)
+
+    def dispatch(self, deliveries: list[Delivery]):
+        if self.executor is None:
+            self.settle_batch(deliveries, self.send_deliveries(deliveries))
+            return
+        self.executor.submit(self.process_in_worker, deliveries)
+
+    def process_in_worker(self, deliveries: list[Delivery]):
+        outcome = self.send_deliveries(deliveries)
+        # ack и публикация возможны только из потока соединения
+        self.connection.add_callback_threadsafe(
+            partial(self.settle_batch, deliveries, outcome)
+        )
+
+    def settle_batch(self, deliveries: list[Delivery], outcome: str):
+        # Одно письмо - один исход для всех сообщений пачки
+        for delivery in deliveries:
+            self.settle(
+                delivery.channel,
+                delivery.delivery_tag,
+                delivery.properties,
+                delivery.body,
+                outcome
+            )
+
+    def settle(self, ch, delivery_tag, properties, body, outcome: str):
+        if not ch.is_open:
+            # Канал закрыт - брокер сам вернет сообщение в очередь
+            return
+        if outcome != PROCESSED:
+            headers = dict(properties.headers or {})
+            attempt = int(headers.get(ATTEMPT_HEADER, 1))
+            if outcome == RETRY and attempt < MAX_ATTEMPTS:
+                # Вместо мгновенного requeue - в очередь задержки этой попытки
+                exchange, routing_key = self.topology.retry_exchange, self.topology.retry_queue(attempt)
+                headers[ATTEMPT_HEADER] = attempt + 1
+                logger.info(f"Retrying message (attempt {attempt} of {MAX_ATTEMPTS})")
+            else:
+                exchange, routing_key = self.topology.dead_letter_exchange, self.topology.dead_letter_queue
+                logger.error(f"Message moved to {self.topology.dead_letter_queue} after {attempt} attempt(s)")
+            ch.basic_publish(
+                exchange=exchange,
+                routing_key=routing_key,
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=pika.DeliveryMode.Persistent,
+                    content_type=properties.content_type,
+                    headers=headers
+                )
+            )
+        # Исходное сообщение подтверждаем только после перекладывания
+        ch.basic_ack(delivery_tag=delivery_tag)
 
     def receive_booking_information_from_booking_service(self):
         logger.info(" [*] Waiting for messages. To exit press CTRL+C")
-        self.channel.basic_consume(queue='GET_BOOKING_INFORMATION', on_message_callback=self.callback)
+        self.channel.basic_consume(queue=self.topology.queue, on_message_callback=self.callback)
         try:
             self.channel.start_consuming()
         except KeyboardInterrupt:
@@ -63,6 +216,15 @@ class ConsumerNotification:
         if self.channel is not None:
             logger.info("STOP CONSUMING")
             self.channel.stop_consuming()
+        # Незакрытые окна отправляем сейчас, а не ждем повторной доставки
+        for batch in self.digest.pop_all():
+            self.dispatch(batch.deliveries)
+        if self.executor is not None:
+            # Дожидаемся писем в работе и отправляем их ack до закрытия соединения
+            self.executor.shutdown(wait=True)
+            if self.connection is not None and self.connection.is_open:
+                self.connection.process_data_events(time_limit=0)
+        smtp_pool.close()
         if self.connection is not None:
             logger.info("CONNECTION CLOSED")
             self.connection.close()
@@ -0,0 +1,61 @@
+import time
+from typing import NamedTuple
+
+
+class Delivery(NamedTuple):
+    """Полученное, но еще не подтвержденное сообщение."""
+    channel: object
+    delivery_tag: int
+    properties: object
+    body: bytes
+    json_data: dict
+
+
+class DigestBatch:
+    def __init__(self, email: str) -> None:
+        self.email = email
+        self.created_at = time.monotonic()
+        self.deliveries: list[Delivery] = []
+
+
+class DigestAggregator:
+    """Окно сообщений по получателю.
+
+    Пока окно открыто (не дольше window_seconds и не больше max_size
+    сообщений), письма одному email копятся в одной пачке; закрытая пачка
+    уходит одним письмом. Вызывается только из потока соединения pika,
+    поэтому блокировки не нужны.
+    """
+
+    def __init__(self, window_seconds: float, max_size: int) -> None:
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self.batches: dict[str, DigestBatch] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0 and self.max_size > 1
+
+    def add(self, email: str, delivery: Delivery) -> tuple[DigestBatch, bool]:
+        """Кладет сообщение в окно получателя; возвращает (пачка, открыта ли она сейчас)."""
+        batch = self.batches.get(email)
+        opened = batch is None
+        if opened:
+            batch = self.batches[email] = DigestBatch(email=email)
+        batch.deliveries.append(delivery)
+        return batch, opened
+
+    def is_full(self, batch: DigestBatch) -> bool:
+        return len(batch.deliveries) >= self.max_size
+
+    def pop(self, batch: DigestBatch) -> bool:
+        # Пачку могли уже закрыть по размеру - тогда таймер ничего не делает
+        if self.batches.get(batch.email) is not batch:
+            return False
+        del self.batches[batch.email]
+        return True
+
+    def pop_all(self) -> list[DigestBatch]:
+        batches = list(self.batches.values())
+        self.batches.clear()
+        return batches
@@ -0,0 +1,143 @@
+import base64
+import logging
+import socketserver
+import threading
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-диалог: EHLO/HELO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, NOOP, RSET, QUIT.
+
+    Письма не отправляются дальше, а складываются в server.messages.
+    """
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def readline(self) -> str:
+        return self.rfile.readline().decode().rstrip("\r\n")
+
+    def handle(self) -> None:
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply("220 localhost stand-in SMTP")
+        mail_from, recipients = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                # Клиент закрыл соединение
+                return
+            line = raw.decode().rstrip("\r\n")
+            command, _, argument = line.partition(" ")
+            command = command.upper()
+            if command == "EHLO":
+                self.reply("250-localhost")
+                self.reply("250-AUTH PLAIN LOGIN")
+                self.reply("250 8BITMIME")
+            elif command == "HELO":
+                self.reply("250 localhost")
+            elif command == "AUTH":
+                self.authenticate(argument)
+            elif command == "MAIL":
+                mail_from, recipients = argument, []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                recipients.append(argument)
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                self.receive_data(mail_from, recipients)
+                mail_from, recipients = None, []
+            elif command in ("NOOP", "RSET"):
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+    def authenticate(self, argument: str) -> None:
+        mechanism, _, initial = argument.partition(" ")
+        if mechanism.upper() == "PLAIN":
+            if not initial:
+                self.reply("334 ")
+                initial = self.readline()
+            _, username, password = base64.b64decode(initial).decode().split("\0")
+        elif mechanism.upper() == "LOGIN":
+            self.reply("334 " + base64.b64encode(b"Username:").decode())
+            username = base64.b64decode(self.readline()).decode()
+            self.reply("334 " + base64.b64encode(b"Password:").decode())
+            password = base64.b64decode(self.readline()).decode()
+        else:
+            self.reply("504 Unrecognized authentication type")
+            return
+        if self.server.credentials and self.server.credentials != (username, password):
+            self.reply("535 Authentication credentials invalid")
+            return
+        with self.server.lock:
+            self.server.logins += 1
+        self.reply("235 Authentication successful")
+
+    def receive_data(self, mail_from: str | None, recipients: list[str]) -> None:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if line in (b".\r\n", b".\n", b""):
+                break
+            # Снимаем dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        message: EmailMessage = message_from_bytes(b"".join(lines), policy=policy.default)
+        with self.server.lock:
+            self.server.messages.append(message)
+        logger.info(f"Stored message from {mail_from} to {recipients}")
+        self.reply("250 OK: queued")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """SMTP-заглушка для тестов и локальной разработки (без TLS).
+
+    Использование:
+        with LocalSMTPServer(("127.0.0.1", 0)) as server:
+            server.start()
+            ... SMTP_USE_SSL=false, SMTP_PORT=server.port ...
+            server.messages  # принятые письма
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], credentials: tuple[str, str] | None = None) -> None:
+        super().__init__(address, SMTPHandler)
+        self.credentials = credentials
+        self.messages: list[EmailMessage] = []
+        self.connections = 0
+        self.logins = 0
+        self.lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    with LocalSMTPServer(("0.0.0.0", 1025)) as server:
+        logger.info(f"Stand-in SMTP server listening on port {server.port}")
+        server.serve_forever()
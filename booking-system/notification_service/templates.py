@@ -0,0 +1,81 @@
+import logging
+from pathlib import Path
+from threading import Lock
+
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    TemplateNotFound,
+    select_autoescape
+)
+
+from config import EMAIL_TEMPLATES_DIR, EMAIL_DEFAULT_LOCALE
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class EmailTemplates:
+    """Скомпилированные Jinja2-шаблоны писем.
+
+    Шаблоны лежат в <templates_dir>/<локаль>/<имя>.html и компилируются
+    один раз при старте консьюмера (load). Тема письма задается в самом
+    шаблоне через {% set subject = "..." %}. Для каждой пары (имя, локаль)
+    запоминается уже найденный шаблон, включая откат на локаль по умолчанию,
+    поэтому на письмо остается только render.
+    """
+
+    def __init__(self, templates_dir: str, default_locale: str) -> None:
+        self.templates_dir = Path(templates_dir)
+        self.default_locale = default_locale
+        self.environment = Environment(
+            loader=FileSystemLoader(self.templates_dir),
+            autoescape=select_autoescape(["html"]),
+            undefined=StrictUndefined,
+            # Файлы шаблонов не перечитываются после загрузки
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self.cache: dict[tuple[str, str], Template] = {}
+        self.lock = Lock()
+
+    def load(self) -> None:
+        with self.lock:
+            for path in sorted(self.templates_dir.glob("*/*.html")):
+                locale, name = path.parent.name, path.stem
+                self.cache[(name, locale)] = self.environment.get_template(f"{locale}/{path.name}")
+        logger.info(f"Loaded {len(self.cache)} email templates from {self.templates_dir}")
+
+    def get_template(self, name: str, locale: str | None = None) -> Template:
+        locale = locale or self.default_locale
+        template = self.cache.get((name, locale))
+        if template is not None:
+            return template
+        with self.lock:
+            try:
+                template = self.environment.get_template(f"{locale}/{name}.html")
+            except TemplateNotFound:
+                # Неизвестная локаль тоже кэшируется - сразу на шаблон по умолчанию
+                template = self.environment.get_template(f"{self.default_locale}/{name}.html")
+            self.cache[(name, locale)] = template
+            return template
+
+    def render(self, name: str, locale: str | None = None, **context) -> tuple[str, str]:
+        """Возвращает (тему, html) письма."""
+        template = self.get_template(name=name, locale=locale)
+        module = template.make_module(vars=context)
+        return str(module.subject), str(module)
+
+
+email_templates = EmailTemplates(
+    templates_dir=EMAIL_TEMPLATES_DIR,
+    default_locale=EMAIL_DEFAULT_LOCALE,
+)
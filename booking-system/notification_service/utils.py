@@ -1,40 +1,184 @@
 import smtplib
 import logging
-from config import SMTP_USER, SMTP_PASSWORD, SMTP_HOST, SMTP_PORT
-from email.message import EmailMessage
+import time
+from queue import Empty, LifoQueue
+from threading import BoundedSemaphore
+from config import (
+    SMTP_USER,
+    SMTP_PASSWORD,
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_USE_SSL,
+    SMTP_TIMEOUT,
+    SMTP_POOL_SIZE,
+    SMTP_HEALTHCHECK_INTERVAL
+)
+from email.header import Header
+from email.message import Message
+from email.mime.text import MIMEText
+from templates import email_templates
 
 
 
-def get_email_template_dashboard(username, email, booking):
-    email_message = EmailMessage()
-    email_message['Subject'] = 'Подтверждение Бронирования Номера'
+def get_email_template_dashboard(username, email, booking, locale=None):
+    # Тема и тело - из предкомпилированного шаблона templates/<локаль>/booking_confirmation.html
+    subject, html = email_templates.render(
+        name="booking_confirmation",
+        locale=locale,
+        username=username,
+        booking=booking
+    )
+    # MIMEText собирается на порядок быстрее EmailMessage.set_content
+    # (без разбора заголовков через headerregistry), а на проводе письмо то же
+    email_message = MIMEText(html, 'html', 'utf-8')
+    email_message['Subject'] = Header(subject, 'utf-8')
     email_message['From'] = SMTP_USER
-    email_message['TO'] = email
-
-    email_message.set_content(
-        f'''
-        <div>
-            <h1 style="color: blue;">Здравствуйте, {username},</h1>
-            <p>Ваше бронирование подтверждено! Вот детали вашего бронирования:</p>
-            <ul>
-                <li><strong>Номер:</strong> {booking['room_id']}</li>
-                <li><strong>Дата заезда:</strong> {booking['check_in_date']}</li>
-                <li><strong>Дата выезда:</strong> {booking['check_out_date']}</li>
-            </ul>
-            <p>Спасибо, что выбрали нас!</p>
-            <img src="https://example.com/hotel-room.jpg" width="600" alt="Фото номера">
-        </div>
-        ''',
-        subtype='html'
+    email_message['To'] = email
+    return email_message
+
+
+def get_email_digest_template(username, email, bookings, locale=None):
+    # Одно письмо на несколько бронирований одного получателя
+    subject, html = email_templates.render(
+        name="booking_digest",
+        locale=locale,
+        username=username,
+        bookings=bookings
     )
+    email_message = MIMEText(html, 'html', 'utf-8')
+    email_message['Subject'] = Header(subject, 'utf-8')
+    email_message['From'] = SMTP_USER
+    email_message['To'] = email
     return email_message
 
 
-def send_email(username, email, booking):
+class SMTPConnectionPool:
+    """Пул авторизованных SMTP-сессий.
+
+    TLS-рукопожатие и login выполняются один раз на сессию, а не на письмо.
+    Сессию, простоявшую дольше healthcheck_interval, проверяем NOOP;
+    если сервер разорвал соединение посреди отправки - переподключаемся
+    и повторяем письмо один раз.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str | None,
+        password: str | None,
+        size: int,
+        use_ssl: bool,
+        timeout: float,
+        healthcheck_interval: float,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        # Свободные сессии: (соединение, время последнего использования)
+        self.idle: LifoQueue[tuple[smtplib.SMTP, float]] = LifoQueue()
+        # Не больше size сессий одновременно
+        self.slots = BoundedSemaphore(size)
+
+    def open_connection(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.user:
+            server.login(self.user, self.password)
+        return server
+
+    @staticmethod
+    def close_connection(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def is_healthy(self, server: smtplib.SMTP, last_used: float) -> bool:
+        if time.monotonic() - last_used < self.healthcheck_interval:
+            return True
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def get_connection(self) -> smtplib.SMTP:
+        while True:
+            try:
+                server, last_used = self.idle.get_nowait()
+            except Empty:
+                return self.open_connection()
+            if self.is_healthy(server, last_used):
+                return server
+            self.close_connection(server)
+
+    def send_messages(self, messages: list[Message]) -> None:
+        """Отправляет пачку писем через одну сессию."""
+        with self.slots:
+            server = self.get_connection()
+            healthy = True
+            try:
+                for message in messages:
+                    try:
+                        server.send_message(message)
+                    except smtplib.SMTPServerDisconnected:
+                        logging.info("SMTP server disconnected, reconnecting")
+                        # Пока новая сессия не открыта, в server - закрытая: если
+                        # подключение или login упадут, в пул ее не возвращаем
+                        healthy = False
+                        server.close()
+                        server = self.open_connection()
+                        healthy = True
+                        server.send_message(message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                healthy = False
+                raise
+            finally:
+                # Битую сессию в пул не возвращаем
+                if healthy:
+                    self.idle.put((server, time.monotonic()))
+                else:
+                    server.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                server, _ = self.idle.get_nowait()
+            except Empty:
+                return
+            self.close_connection(server)
+
+
+smtp_pool = SMTPConnectionPool(
+    host=SMTP_HOST,
+    port=int(SMTP_PORT or 0),
+    user=SMTP_USER,
+    password=SMTP_PASSWORD,
+    size=SMTP_POOL_SIZE,
+    use_ssl=SMTP_USE_SSL,
+    timeout=SMTP_TIMEOUT,
+    healthcheck_interval=SMTP_HEALTHCHECK_INTERVAL,
+)
+
+
+def send_email(username, email, booking, locale=None):
     # Логика отправки письма
-    email_message = get_email_template_dashboard(username, email, booking)
-    with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT) as server:
-        server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(email_message)
+    email_message = get_email_template_dashboard(username, email, booking, locale)
+    smtp_pool.send_messages([email_message])
     logging.info(f"Sending email to {email}")
 
+
+def send_digest_email(username, email, bookings, locale=None):
+    email_message = get_email_digest_template(username, email, bookings, locale)
+    smtp_pool.send_messages([email_message])
+    logging.info(f"Sending digest of {len(bookings)} bookings to {email}")
+
+
+def send_emails(email_messages: list[Message]):
+    # Пачка писем - одна SMTP-сессия из пула
+    smtp_pool.send_messages(email_messages)
+    logging.info(f"Sending {len(email_messages)} emails")
@@ -11,6 +11,17 @@ public_key_path: Path = REVIEW_SERVICE_DIR / "certs" / "jwt-public.pem"
 
 class PostgresDatabaseURL(BaseModel):
     url: str
+    echo: bool = False
+    echo_pool: bool = False
+    # Пул соединений; у sync и async engine пулы отдельные, с одинаковыми параметрами
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Сколько секунд ждать свободное соединение до TimeoutError (QueuePool limit)
+    pool_timeout: float = 30.0
+    # Соединения старше стольких секунд переоткрываются; -1 - никогда
+    pool_recycle: int = 1800
+    # Перед выдачей из пула соединение проверяется (разорванные не достаются сессии)
+    pool_pre_ping: bool = True
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
         "uq": "uq_%(table_name)s_%(column_0_N_name)s",
@@ -24,6 +35,8 @@ class AuthJWT(BaseModel):
     private_key: str = private_key_path.read_text()
     public_key: str = public_key_path.read_text()
     algorithm: str = "RS256"
+    # Сколько проверенных токенов держать в памяти (см. review/auth.py)
+    token_cache_size: int = 10_000
 
 
 class Settings(BaseSettings):
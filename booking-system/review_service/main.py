@@ -1,14 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from database import db_helper
+from database.metrics import router as metrics_router
 from review.routers import router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Закрываем пул соединений asyncpg
+    await db_helper.async_dispose()
+
+
 # An instance of FastAPI (for authentication service)
-review_app = FastAPI()
+review_app = FastAPI(lifespan=lifespan)
 
 # Attaching routers to authentication_app
 review_app.include_router(router)
+# Метрики пула соединений с БД (Prometheus)
+review_app.include_router(metrics_router)
 
 # CORS for frontend(soon)
 origins = []
@@ -18,5 +31,6 @@ review_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
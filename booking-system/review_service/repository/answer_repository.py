@@ -5,7 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from review.models import Answer
 from review.schemas.reviews_answers_schemas import AnswerIn, AnswerUpdate
-from database.database import Session
+from database.database import AsyncSession
 
 
 class AbstractRepository(ABC):
@@ -32,50 +32,55 @@ class AbstractRepository(ABC):
 
 class AnswerRepository(AbstractRepository):
     @staticmethod
-    def get_answers(
-        session: Session,
+    async def get_answers(
+        session: AsyncSession,
         **filters
     ) -> list[Answer]:
         skip = filters.pop('skip', 0)
         limit = filters.pop('limit', 10)
+        after_id: int | None = filters.pop('after_id', None)
         stmt = (
             select(Answer)
             .options(
                 joinedload(Answer.review),
             )
             .filter_by(**filters)
-            .offset(skip)
             .limit(limit)
             .order_by(Answer.id)
         )
-        answers: list[Answer] = session.scalars(stmt).all()
+        # Курсор - keyset по первичному ключу, без OFFSET
+        if after_id is not None:
+            stmt = stmt.where(Answer.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        answers: list[Answer] = (await session.scalars(stmt)).all()
         return answers
     
     @staticmethod
-    def create_answer(
-        session: Session,
+    async def create_answer(
+        session: AsyncSession,
         answer_in: AnswerIn,
         reviewer_id: int,
     ) -> Answer:
         try:
             answer = Answer(**answer_in.model_dump(), reviewer_id=reviewer_id)
             session.add(answer)
-            session.commit()
+            await session.commit()
             return answer
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not add new answer"
             )    
 
     @staticmethod
-    def update_answer(
-        session: Session,
+    async def update_answer(
+        session: AsyncSession,
         answer_update: AnswerUpdate,
         answer_id: int
     ) -> Answer:
-        answer: Answer = session.get(Answer, answer_id)
+        answer: Answer = await session.get(Answer, answer_id)
         if not answer:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, 
@@ -84,33 +89,33 @@ class AnswerRepository(AbstractRepository):
         try:
             for name, value in answer_update.model_dump(exclude_unset=True).items():
                 setattr(answer, name, value)
-            session.commit()
-            answer_with_review = (
-                session.query(Answer)
+            await session.commit()
+            answer_with_review: Answer = await session.scalar(
+                select(Answer)
                 .filter_by(id=answer_id)
                 .options(
                     joinedload(Answer.review),
                 )
-            ).first()
+            )
             return answer_with_review
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not update answer"
             )
         
     @staticmethod
-    def delete_answer(
-        session: Session,
+    async def delete_answer(
+        session: AsyncSession,
         answer_id: int
     ) -> None:
         try:
-            answer: Answer = session.get(Answer, answer_id)
-            session.delete(answer)
-            session.commit()
+            answer: Answer = await session.get(Answer, answer_id)
+            await session.delete(answer)
+            await session.commit()
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not delete answer"
@@ -5,7 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from review.models import Review
 from review.schemas.reviews_answers_schemas import ReviewIn, ReviewUpdate
-from database.database import Session
+from database.database import AsyncSession
 
 
 class AbstractRepository(ABC):
@@ -32,49 +32,55 @@ class AbstractRepository(ABC):
 
 class ReviewRepository(AbstractRepository):
     @staticmethod
-    def get_reviews(
-        session: Session,
+    async def get_reviews(
+        session: AsyncSession,
         **filters
     ) -> list[Review]:
         skip = filters.pop('skip', 0)
         limit = filters.pop('limit', 10)
+        after_id: int | None = filters.pop('after_id', None)
         stmt = (
             select(Review)
             .options(
                 selectinload(Review.answers),
                 )
             .filter_by(**filters)
-            .offset(skip)
             .limit(limit)
             .order_by(Review.id)
         )
-        reviews: list[Review] = session.scalars(stmt).all()
+        # Курсор - keyset по первичному ключу, без OFFSET
+        if after_id is not None:
+            stmt = stmt.where(Review.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        reviews: list[Review] = (await session.scalars(stmt)).all()
         return reviews
     
     @staticmethod
-    def create_review(
-        session: Session,
+    async def create_review(
+        session: AsyncSession,
         review_in: ReviewIn
     ) -> Review:
         try:
-            review = Review(**review_in.model_dump(exclude_unset=True))
+            # Пустой список ответов сразу помечен загруженным - без lazy load после commit
+            review = Review(**review_in.model_dump(exclude_unset=True), answers=[])
             session.add(review)
-            session.commit()
+            await session.commit()
             return review
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not add new review"
             )    
 
     @staticmethod
-    def update_review(
-        session: Session,
+    async def update_review(
+        session: AsyncSession,
         review_update: ReviewUpdate,
         review_id: int
     ) -> Review:
-        review: Review = session.get(Review, review_id)
+        review: Review = await session.get(Review, review_id)
         if not review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, 
@@ -83,33 +89,33 @@ class ReviewRepository(AbstractRepository):
         try:
             for name, value in review_update.model_dump(exclude_unset=True).items():
                 setattr(review, name, value)
-            session.commit()
-            review_with_answers = (
-                session.query(Review)
+            await session.commit()
+            review_with_answers: Review = await session.scalar(
+                select(Review)
                 .filter_by(id=review_id)
                 .options(
                     selectinload(Review.answers),
                 )
-            ).first()
+            )
             return review_with_answers
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not update review"
             )
         
     @staticmethod
-    def delete_review(
-        session: Session,
+    async def delete_review(
+        session: AsyncSession,
         review_id: int
     ) -> None:
         try:
-            review: Review = session.get(Review, review_id)
-            session.delete(review)
-            session.commit()
+            review: Review = await session.get(Review, review_id)
+            await session.delete(review)
+            await session.commit()
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not delete review"
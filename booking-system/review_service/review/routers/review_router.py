@@ -1,12 +1,13 @@
 import logging
 from typing import Annotated, Any
 from service.review_service import ReviewService, get_review_service
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import db_helper
 from review.schemas.reviews_answers_schemas import ReviewOut, ReviewIn, ReviewUpdate
 from review.schemas.user import User
 from review.utils import get_current_active_user, get_admin_user, get_review_filters
+from review.pagination import set_next_cursor
 
 # Logger setup
 logging.basicConfig(
@@ -24,43 +25,46 @@ router = APIRouter(
 
 
 @router.get("/", response_model=list[ReviewOut])
-def get_reviews(
+async def get_reviews(
+    response: Response,
     review_service: Annotated[ReviewService, Depends(get_review_service)],
     user: Annotated[User, Depends(get_current_active_user)],
-    session : Annotated[Session, Depends(db_helper.session_getter)],
+    session : Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     filters: dict[str, Any] = Depends(get_review_filters),
 ) -> list[ReviewOut]:
     if user:
-        return review_service.list_reviews(
+        reviews = await review_service.list_reviews(
             session=session,
             **filters
         )
+        set_next_cursor(response=response, items=reviews, limit=filters['limit'])
+        return reviews
 
 
 @router.post("/", response_model=ReviewOut, status_code=status.HTTP_201_CREATED)
-def create_review(
+async def create_review(
     review_in: ReviewIn,
     user: Annotated[User, Depends(get_current_active_user)],
     review_service: Annotated[ReviewService, Depends(get_review_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
 ) -> ReviewOut:
     if user:
-        return review_service.create_review(
+        return await review_service.create_review(
             review_in=review_in,
             session=session,
         )
 
 
 @router.patch("/{review_id}/", response_model=ReviewOut)
-def update_review(
+async def update_review(
     review_id: int,
     review_update: ReviewUpdate,
     user: Annotated[User, Depends(get_current_active_user)],
     review_service: Annotated[ReviewService, Depends(get_review_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
 ) -> ReviewOut:
     if user:
-        return review_service.update_review(
+        return await review_service.update_review(
             review_id=review_id,
             review_update=review_update,
             session=session,
@@ -68,14 +72,14 @@ def update_review(
 
 
 @router.delete("/{review_id}/", status_code=status.HTTP_204_NO_CONTENT)
-def delete_review(
+async def delete_review(
     review_id: int,
     user: Annotated[User, Depends(get_current_active_user)],
     review_service: Annotated[ReviewService, Depends(get_review_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
 ) -> None:
     if user:
-        return review_service.delete_review(
+        return await review_service.delete_review(
             review_id=review_id,
             session=session,
             user=user
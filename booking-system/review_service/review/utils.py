@@ -7,7 +7,8 @@ from datetime import (
 )
 
 from review.schemas.user import User
-from review.schemas.token import TokenPayload
+from review.auth import decode_token
+from review.pagination import resolve_after_id
 
 from fastapi import (
     Depends,
@@ -23,7 +24,6 @@ from pydantic import (
     ValidationError
 )
 
-from config import settings
 
 
 
@@ -35,13 +35,7 @@ reusable_oauth = OAuth2PasswordBearer(
 
 def get_current_user(token: str = Depends(reusable_oauth)) -> User:
     try:
-        payload = jwt.decode(
-            jwt=token,
-            key=settings.auth_jwt.public_key,
-            algorithms=[settings.auth_jwt.algorithm]
-        )
-
-        token_data: TokenPayload = TokenPayload(**payload)
+        token_data, user = decode_token(token)
         if datetime.fromtimestamp(token_data.exp) < datetime.now():
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,12 +48,6 @@ def get_current_user(token: str = Depends(reusable_oauth)) -> User:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user: User = User(
-        username=token_data.username,
-        email=token_data.email,
-        admin=token_data.admin
-    )
-
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -93,6 +81,7 @@ def get_review_filters(
     rating: Optional[int] = Query(default=None, ge=0),
     skip: int = Query(default=0, ge=0), 
     limit: int = Query(default=10, ge=1),
+    cursor: Optional[str] = Query(default=None),
 ) -> dict[str, Any]:
     filters = {}
     if id:
@@ -106,6 +95,7 @@ def get_review_filters(
 
     filters['skip'] = skip
     filters['limit'] = limit
+    filters['after_id'] = resolve_after_id(cursor=cursor, skip=skip)
     return filters
 
 
@@ -116,6 +106,7 @@ def get_answer_filters(
     reviewer_id: Optional[int] = Query(default=None, ge=0),
     skip: int = Query(default=0, ge=0), 
     limit: int = Query(default=10, ge=1),
+    cursor: Optional[str] = Query(default=None),
 ) -> dict[str, Any]:
     filters = {}
     if id:
@@ -129,4 +120,5 @@ def get_answer_filters(
 
     filters['skip'] = skip
     filters['limit'] = limit
+    filters['after_id'] = resolve_after_id(cursor=cursor, skip=skip)
     return filters
\ No newline at end of file
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from review.schemas.reviews_answers_schemas import AnswerIn, AnswerOut, AnswerUpdate
 from review.schemas.user import User
 from review.models import Answer
@@ -32,12 +32,12 @@ class AbstractAnswerService(ABC):
 
 class AnswerService(AbstractAnswerService):
     @staticmethod
-    def list_answers(
-        session: Session,
+    async def list_answers(
+        session: AsyncSession,
         answer_repository: AnswerRepository = get_answer_repository(),
         **filters,
     ) -> list[AnswerOut]:
-        answers: list[Answer] = answer_repository.get_answers(
+        answers: list[Answer] = await answer_repository.get_answers(
             session=session,
             **filters
         )
@@ -59,18 +59,18 @@ class AnswerService(AbstractAnswerService):
 
 
     @staticmethod
-    def create_answer(
-        session: Session,
+    async def create_answer(
+        session: AsyncSession,
         answer_in: AnswerIn,
         answer_repository: AnswerRepository = get_answer_repository(),
         review_service: ReviewService = get_review_service()
     ) -> AnswerOut:
-        review = review_service.list_reviews(
+        review = (await review_service.list_reviews(
             session=session,
             id=answer_in.review_id
-        )[0]
+        ))[0]
         print(review.user_id)
-        answer: Answer = answer_repository.create_answer(
+        answer: Answer = await answer_repository.create_answer(
             session=session,
             answer_in=answer_in,
             reviewer_id=review.user_id
@@ -90,13 +90,13 @@ class AnswerService(AbstractAnswerService):
 
 
     @staticmethod
-    def update_answer(
+    async def update_answer(
         answer_id: int,
-        session: Session,
+        session: AsyncSession,
         answer_update: AnswerUpdate,
         answer_repository: AnswerRepository = get_answer_repository(),
     ) -> AnswerOut:
-        answer: Answer = answer_repository.update_answer(
+        answer: Answer = await answer_repository.update_answer(
             answer_id=answer_id,
             session=session,
             answer_update=answer_update
@@ -117,14 +117,14 @@ class AnswerService(AbstractAnswerService):
     
 
     @staticmethod
-    def delete_answer(
+    async def delete_answer(
         answer_id: int,
-        session: Session,
+        session: AsyncSession,
         user: User,
         answer_repository: AnswerRepository = get_answer_repository()
     ) -> None:
         if user.admin:
-            return answer_repository.delete_answer(
+            return await answer_repository.delete_answer(
                 answer_id=answer_id,
                 session=session,
             ) 
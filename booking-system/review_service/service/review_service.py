@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from review.schemas.reviews_answers_schemas import ReviewIn, ReviewOut, ReviewUpdate
 from review.schemas.user import User
 from review.models import Review
@@ -31,12 +31,12 @@ class AbstractReviewService(ABC):
 
 class ReviewService(AbstractReviewService):
     @staticmethod
-    def list_reviews(
-        session: Session,
+    async def list_reviews(
+        session: AsyncSession,
         review_repository: ReviewRepository = get_review_repository(),
         **filters,
     ) -> list[ReviewOut]:
-        reviews: list[Review] = review_repository.get_reviews(
+        reviews: list[Review] = await review_repository.get_reviews(
             session=session,
             **filters
         )
@@ -45,12 +45,12 @@ class ReviewService(AbstractReviewService):
 
 
     @staticmethod
-    def create_review(
-        session: Session,
+    async def create_review(
+        session: AsyncSession,
         review_in: ReviewIn,
         review_repository: ReviewRepository = get_review_repository(),
     ) -> ReviewOut:
-        review: Review = review_repository.create_review(
+        review: Review = await review_repository.create_review(
             session=session,
             review_in=review_in
         )
@@ -58,13 +58,13 @@ class ReviewService(AbstractReviewService):
 
 
     @staticmethod
-    def update_review(
+    async def update_review(
         review_id: int,
-        session: Session,
+        session: AsyncSession,
         review_update: ReviewUpdate,
         review_repository: ReviewRepository = get_review_repository(),
     ) -> ReviewOut:
-        review: Review = review_repository.update_review(
+        review: Review = await review_repository.update_review(
             review_id=review_id,
             session=session,
             review_update=review_update
@@ -74,14 +74,14 @@ class ReviewService(AbstractReviewService):
     
 
     @staticmethod
-    def delete_review(
+    async def delete_review(
         review_id: int,
-        session: Session,
+        session: AsyncSession,
         user: User,
         review_repository: ReviewRepository = get_review_repository()
     ) -> None:
         if user.admin:
-            return review_repository.delete_review(
+            return await review_repository.delete_review(
                 review_id=review_id,
                 session=session,
             ) 
@@ -0,0 +1,123 @@
+import logging
+from datetime import date
+
+import httpx
+from fastapi import HTTPException, status
+
+from config import settings
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+BOOKING_CONFLICTS = "booking/conflicts"
+
+
+class BookingServiceClient:
+    """Один общий httpx.AsyncClient на процесс (keep-alive пул соединений до booking_service).
+
+    Открывается и закрывается в lifespan приложения, поэтому запросы
+    не платят за TCP-рукопожатие на каждый вызов.
+    """
+    client: httpx.AsyncClient | None = None
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+    ) -> None:
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+    async def start(self) -> None:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+            )
+            logger.info(f"Booking service client started: {self.base_url}")
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            logger.info("Booking service client closed")
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        token: str,
+        **kwargs
+    ) -> httpx.Response:
+        if self.client is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Booking service client is not started"
+            )
+        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            return await self.client.request(
+                method=method,
+                url=url,
+                headers=headers,
+                **kwargs
+            )
+        except httpx.HTTPError as exc:
+            # Отказ соединения, таймауты, обрыв протокола - booking_service недоступен
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Booking service unavailable: {exc!r}"
+            )
+
+    async def get_booked_dates(
+        self,
+        room_id: int,
+        dates: list[date],
+        token: str
+    ) -> list[date]:
+        # booking_service сам отвечает, какие из дат уже заняты бронированиями этого номера
+        response = await self.request(
+            method="POST",
+            url=f"/{BOOKING_CONFLICTS}/",
+            token=token,
+            json={
+                'room_id': room_id,
+                'dates': [day.isoformat() for day in dates]
+            }
+        )
+        if response.is_error:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Booking service error: {response.text}"
+            )
+        return [date.fromisoformat(day) for day in response.json()['dates']]
+
+
+booking_client = BookingServiceClient(
+    base_url=settings.booking_service.url,
+    timeout=settings.booking_service.timeout,
+    max_connections=settings.booking_service.max_connections,
+    max_keepalive_connections=settings.booking_service.max_keepalive_connections,
+    keepalive_expiry=settings.booking_service.keepalive_expiry,
+)
+
+
+# Зависимость для получения клиента booking_service
+def get_booking_client() -> BookingServiceClient:
+    return booking_client
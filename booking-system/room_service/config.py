@@ -7,10 +7,23 @@ ROOM_SERVICE_DIR = Path(__file__).parent
 
 private_key_path: Path = ROOM_SERVICE_DIR / "certs" / "jwt-private.pem"
 public_key_path: Path = ROOM_SERVICE_DIR / "certs" / "jwt-public.pem"
+# Публичный ключ booking_service - им подписаны его сервисные токены
+booking_service_public_key_path: Path = ROOM_SERVICE_DIR / "certs" / "booking-service-public.pem"
 
 
 class PostgresDatabaseURL(BaseModel):
     url: str
+    echo: bool = False
+    echo_pool: bool = False
+    # Пул соединений; у sync и async engine пулы отдельные, с одинаковыми параметрами
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Сколько секунд ждать свободное соединение до TimeoutError (QueuePool limit)
+    pool_timeout: float = 30.0
+    # Соединения старше стольких секунд переоткрываются; -1 - никогда
+    pool_recycle: int = 1800
+    # Перед выдачей из пула соединение проверяется (разорванные не достаются сессии)
+    pool_pre_ping: bool = True
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
         "uq": "uq_%(table_name)s_%(column_0_N_name)s",
@@ -24,6 +37,25 @@ class AuthJWT(BaseModel):
     private_key: str = private_key_path.read_text()
     public_key: str = public_key_path.read_text()
     algorithm: str = "RS256"
+    # Сколько проверенных токенов держать в памяти (см. room/auth.py)
+    token_cache_size: int = 10_000
+    booking_service_public_key: str = booking_service_public_key_path.read_text()
+
+
+class Hold(BaseModel):
+    # На сколько секунд захватываются даты, если клиент не указал ttl
+    default_ttl: int = 30
+    max_ttl: int = 300
+    # Как часто фоновая задача снимает истекшие захваты
+    sweep_interval: float = 10.0
+
+
+class BookingServiceAPI(BaseModel):
+    url: str = "http://booking_service:8003"
+    timeout: float = 5.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
 
 
 class Settings(BaseSettings):
@@ -33,6 +65,8 @@ class Settings(BaseSettings):
         env_nested_delimiter="__"
     )
     auth_jwt: AuthJWT = AuthJWT()
+    hold: Hold = Hold()
+    booking_service: BookingServiceAPI = BookingServiceAPI()
     db: PostgresDatabaseURL
 
 
@@ -0,0 +1,102 @@
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest
+)
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+# Метка engine - pool_logging_name движка ("sync" / "async")
+POOL_SIZE = Gauge(
+    "db_pool_size", "Размер пула соединений", ["engine"]
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Соединения, выданные из пула", ["engine"]
+)
+POOL_CHECKED_IN = Gauge(
+    "db_pool_checked_in", "Свободные соединения в пуле", ["engine"]
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Соединения сверх pool_size (отрицательное - пул еще не заполнен)", ["engine"]
+)
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Выдачи соединений из пула", ["engine"]
+)
+POOL_CONNECTIONS = Counter(
+    "db_pool_connections_total", "Новые соединения с Postgres", ["engine"]
+)
+POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total", "Соединения, выброшенные из пула как битые", ["engine"]
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Ожидание соединения дольше pool_timeout (QueuePool limit)", ["engine"]
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Время получения соединения из пула",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+
+class InstrumentedPoolMixin:
+    """Замеряет ожидание соединения и считает таймауты пула.
+
+    У SQLAlchemy нет события "начали ждать соединение", поэтому время
+    меряем вокруг Pool.connect; остальное - через события пула.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(engine=self.logging_name).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(engine=self.logging_name).observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine) -> None:
+    name: str = engine.pool.logging_name
+    # engine.pool берем при каждом сборе: после dispose() пул пересоздается
+    POOL_SIZE.labels(engine=name).set_function(lambda: engine.pool.size())
+    POOL_CHECKED_OUT.labels(engine=name).set_function(lambda: engine.pool.checkedout())
+    POOL_CHECKED_IN.labels(engine=name).set_function(lambda: engine.pool.checkedin())
+    POOL_OVERFLOW.labels(engine=name).set_function(lambda: engine.pool.overflow())
+
+    # Слушатели на Engine переживают пересоздание пула
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        POOL_CONNECTIONS.labels(engine=name).inc()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.labels(engine=name).inc()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        POOL_INVALIDATIONS.labels(engine=name).inc()
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
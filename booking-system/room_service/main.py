@@ -1,14 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from clients.booking_client import booking_client
+from database import db_helper
+from database.metrics import router as metrics_router
 from room.routers import router
+from service.hold_sweeper import hold_sweeper
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Общий пул HTTP-соединений до booking_service живет все время работы приложения
+    await booking_client.start()
+    # Истекшие захваты дат снимаются в фоне
+    await hold_sweeper.start()
+    yield
+    await hold_sweeper.stop()
+    await booking_client.close()
+    # Закрываем пул соединений asyncpg
+    await db_helper.async_dispose()
 
 
 # An instance of FastAPI (for authentication service)
-room_app = FastAPI()
+room_app = FastAPI(lifespan=lifespan)
 
 # Attaching routers to authentication_app
 room_app.include_router(router)
+# Метрики пула соединений с БД (Prometheus)
+room_app.include_router(metrics_router)
 
 # CORS for frontend(soon)
 origins = []
@@ -18,4 +39,5 @@ room_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
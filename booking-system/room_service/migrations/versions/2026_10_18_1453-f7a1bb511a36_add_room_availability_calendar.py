@@ -0,0 +1,45 @@
+"""add room availability calendar
+
+Revision ID: f7a1bb511a36
+Revises: 071bc0dabf50
+Create Date: 2026-10-18 14:53:33.364777
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a1bb511a36'
+down_revision: Union[str, None] = '071bc0dabf50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('room_availability_calendar',
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('days', postgresql.BIT(length=366), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['room_id'], ['room.id'], name=op.f('fk_room_availability_calendar_room_id_room')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_room_availability_calendar')),
+    sa.UniqueConstraint('room_id', 'year', name=op.f('uq_room_availability_calendar_room_id_year'))
+    )
+    # Переносим существующие строки room_available_date в битовый календарь:
+    # день года N -> бит N слева, биты одного года собираем через bit_or
+    op.execute("""
+        INSERT INTO room_availability_calendar (room_id, year, days)
+        SELECT
+            room_id,
+            EXTRACT(YEAR FROM date)::int,
+            bit_or(B'1'::bit(366) >> (EXTRACT(DOY FROM date)::int - 1))
+        FROM room_available_date
+        GROUP BY room_id, EXTRACT(YEAR FROM date)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('room_availability_calendar')
@@ -0,0 +1,26 @@
+"""add room available date (date, room_id) index
+
+Revision ID: 3c9e52d8a0b4
+Revises: f7a1bb511a36
+Create Date: 2026-10-18 15:02:11.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e52d8a0b4'
+down_revision: Union[str, None] = 'f7a1bb511a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_room_available_date_date_room_id', 'room_available_date', ['date', 'room_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_room_available_date_date_room_id', table_name='room_available_date')
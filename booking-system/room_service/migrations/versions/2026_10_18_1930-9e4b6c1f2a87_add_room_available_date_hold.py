@@ -0,0 +1,36 @@
+"""add room available date hold
+
+Revision ID: 9e4b6c1f2a87
+Revises: 3c9e52d8a0b4
+Create Date: 2026-10-18 19:30:48.210374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b6c1f2a87'
+down_revision: Union[str, None] = '3c9e52d8a0b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('room_available_date', sa.Column('held_until', sa.TIMESTAMP(), nullable=True))
+    op.add_column('room_available_date', sa.Column('hold_id', sa.Uuid(), nullable=True))
+    op.create_index(
+        'ix_room_available_date_held_until',
+        'room_available_date',
+        ['held_until'],
+        unique=False,
+        postgresql_where=sa.text('held_until IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_room_available_date_held_until', table_name='room_available_date', postgresql_where=sa.text('held_until IS NOT NULL'))
+    op.drop_column('room_available_date', 'hold_id')
+    op.drop_column('room_available_date', 'held_until')
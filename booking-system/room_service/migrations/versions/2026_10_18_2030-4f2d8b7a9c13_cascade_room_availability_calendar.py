@@ -0,0 +1,44 @@
+"""cascade room availability calendar
+
+Revision ID: 4f2d8b7a9c13
+Revises: 9e4b6c1f2a87
+Create Date: 2026-10-18 20:30:12.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2d8b7a9c13'
+down_revision: Union[str, None] = '9e4b6c1f2a87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint(
+        op.f('fk_room_availability_calendar_room_id_room'),
+        'room_availability_calendar',
+        type_='foreignkey'
+    )
+    op.create_foreign_key(
+        op.f('fk_room_availability_calendar_room_id_room'),
+        'room_availability_calendar', 'room',
+        ['room_id'], ['id'],
+        ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        op.f('fk_room_availability_calendar_room_id_room'),
+        'room_availability_calendar',
+        type_='foreignkey'
+    )
+    op.create_foreign_key(
+        op.f('fk_room_availability_calendar_room_id_room'),
+        'room_availability_calendar', 'room',
+        ['room_id'], ['id']
+    )
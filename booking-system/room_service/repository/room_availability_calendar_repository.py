@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Select, String, and_, cast, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import BIT, insert
+from database.database import AsyncSession
+from room.models import RoomAvailabilityCalendar
+from room.availability_bitmap import (
+    DAYS_IN_BITMAP,
+    AvailabilityBitmap,
+    split_dates_by_year,
+    split_range_by_year
+)
+
+
+ALL_DAYS_MASK = (1 << DAYS_IN_BITMAP) - 1
+
+
+def bits_param(mask: int):
+    # Строку '0101...' приводим к BIT(366) на стороне Postgres
+    return cast(literal(AvailabilityBitmap.mask_to_bits(mask), String), BIT(DAYS_IN_BITMAP))
+
+
+class AbstractRepository(ABC):
+    @staticmethod
+    @abstractmethod
+    def get_free_rooms():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def claim_dates():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def release_dates():
+        raise NotImplementedError
+
+
+class RoomAvailabilityCalendarRepository(AbstractRepository):
+    """Битовый календарь свободных дней: одна строка BIT(366) на (номер, год).
+
+    Методы claim/release не делают commit - они выполняются внутри
+    транзакции вызывающего кода вместе с изменениями room_available_date.
+    Захваты дат (held_until) календарь не отражает - их учитывает вызывающий код.
+    """
+
+    @staticmethod
+    def get_free_rooms(
+        date_from: date,
+        date_to: date,
+    ) -> Select:
+        # Номера, у которых свободен каждый день диапазона: на номер читается
+        # не больше строки на год вместо строки на день
+        masks: dict[int, int] = split_range_by_year(date_from, date_to)
+        return (
+            select(RoomAvailabilityCalendar.room_id)
+            .where(
+                or_(*[
+                    and_(
+                        RoomAvailabilityCalendar.year == year,
+                        RoomAvailabilityCalendar.days.op("&")(bits_param(mask)) == bits_param(mask)
+                    )
+                    for year, mask in masks.items()
+                ])
+            )
+            .group_by(RoomAvailabilityCalendar.room_id)
+            .having(func.count() == len(masks))
+        )
+
+    @staticmethod
+    async def claim_dates(
+        room_id: int,
+        dates: Iterable[date],
+        session: AsyncSession,
+    ) -> None:
+        await RoomAvailabilityCalendarRepository.claim_masks(
+            room_id=room_id,
+            masks=split_dates_by_year(dates),
+            session=session
+        )
+
+    @staticmethod
+    async def release_dates(
+        room_id: int,
+        dates: Iterable[date],
+        session: AsyncSession,
+    ) -> None:
+        await RoomAvailabilityCalendarRepository.release_masks(
+            room_id=room_id,
+            masks=split_dates_by_year(dates),
+            session=session
+        )
+
+    @staticmethod
+    async def claim_masks(
+        room_id: int,
+        masks: dict[int, int],
+        session: AsyncSession,
+    ) -> None:
+        # Строки room_available_date - источник истины: снимаем биты без проверки,
+        # что они были выставлены
+        for year, mask in masks.items():
+            stmt = (
+                update(RoomAvailabilityCalendar)
+                .where(
+                    RoomAvailabilityCalendar.room_id == room_id,
+                    RoomAvailabilityCalendar.year == year
+                )
+                .values(days=RoomAvailabilityCalendar.days.op("&")(bits_param(ALL_DAYS_MASK & ~mask)))
+            )
+            await session.execute(stmt)
+
+    @staticmethod
+    async def release_masks(
+        room_id: int,
+        masks: dict[int, int],
+        session: AsyncSession,
+    ) -> None:
+        for year, mask in masks.items():
+            stmt = insert(RoomAvailabilityCalendar).values(
+                room_id=room_id,
+                year=year,
+                days=bits_param(mask)
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["room_id", "year"],
+                set_={"days": RoomAvailabilityCalendar.days.op("|")(stmt.excluded.days)}
+            )
+            await session.execute(stmt)
+
+
+# Зависимость для получения репозитория
+def get_room_availability_calendar_repository() -> RoomAvailabilityCalendarRepository:
+    return RoomAvailabilityCalendarRepository
@@ -1,11 +1,22 @@
+import uuid
 from abc import ABC, abstractmethod
-from datetime import date
+from datetime import date, datetime, timedelta
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import DATE, any_, bindparam, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from room.schemas.room_available_date_schemas import DatesToDelete, RoomAvailableDateIn
-from database.database import Session
+from database.database import AsyncSession
 from room.models import RoomAvailableDate
+from repository.room_availability_calendar_repository import RoomAvailabilityCalendarRepository
+
+
+def is_not_held():
+    # Дата свободна от захвата: его нет или он истек (просроченные строки чистит фоновая задача)
+    return or_(
+        RoomAvailableDate.held_until.is_(None),
+        RoomAvailableDate.held_until < func.now()
+    )
 
 
 class AbstractRepository(ABC):
@@ -14,65 +25,283 @@ class AbstractRepository(ABC):
     def get_room_available_dates():
         raise NotImplementedError
     
+    @staticmethod
+    @abstractmethod
+    def count_room_available_dates():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def get_room_available_dates_in_range():
+        raise NotImplementedError
+    
     @staticmethod
     @abstractmethod
     def create_room_available_date():
         raise NotImplementedError
     
+    @staticmethod
+    @abstractmethod
+    def create_room_available_dates():
+        raise NotImplementedError
+    
     @staticmethod
     @abstractmethod
     def delete_room_available_dates():
         raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def hold_room_available_dates():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def release_hold():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def release_expired_holds():
+        raise NotImplementedError
     
 
 class RoomAvailableDateRepository(AbstractRepository):
     @staticmethod
-    def get_room_available_dates(
+    async def get_room_available_dates(
         room_id: int,
-        session: Session,
+        session: AsyncSession,
     ) -> list[RoomAvailableDate]:
-        dates: list[RoomAvailableDate] = session.query(RoomAvailableDate).filter_by(room_id=room_id).all()
+        dates: list[RoomAvailableDate] = (
+            await session.scalars(select(RoomAvailableDate).filter_by(room_id=room_id))
+        ).all()
         return dates
+    
+    @staticmethod
+    async def count_room_available_dates(
+        room_id: int,
+        date_from: date,
+        date_to: date,
+        session: AsyncSession,
+    ) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(RoomAvailableDate)
+            .where(
+                RoomAvailableDate.room_id == room_id,
+                RoomAvailableDate.date.between(date_from, date_to)
+            )
+        )
+        return await session.scalar(stmt)
+
+    @staticmethod
+    async def get_room_available_dates_in_range(
+        room_id: int,
+        date_from: date,
+        date_to: date,
+        session: AsyncSession,
+    ) -> list[date]:
+        stmt = (
+            select(RoomAvailableDate.date)
+            .where(
+                RoomAvailableDate.room_id == room_id,
+                RoomAvailableDate.date.between(date_from, date_to)
+            )
+            .order_by(RoomAvailableDate.date)
+        )
+        return list((await session.scalars(stmt)).all())
 
 
     @staticmethod
-    def create_room_available_date(
-        session: Session,
+    async def create_room_available_date(
+        session: AsyncSession,
         room_available_date_in: RoomAvailableDateIn
     ) -> RoomAvailableDate:
         try:
             room_available_date: RoomAvailableDate = RoomAvailableDate(**room_available_date_in.model_dump())
             session.add(room_available_date)
-            session.commit()
+            # Битовый календарь обновляем в той же транзакции
+            await RoomAvailabilityCalendarRepository.release_dates(
+                room_id=room_available_date_in.room_id,
+                dates=[room_available_date_in.date],
+                session=session
+            )
+            await session.commit()
             return room_available_date
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not add new date"
             )
         
     @staticmethod
-    def delete_room_available_dates(
+    async def create_room_available_dates(
+        room_id: int,
+        dates: list[date],
+        session: AsyncSession
+    ) -> list[date]:
+        # Один многострочный INSERT; уже существующие даты молча пропускаем
+        stmt = (
+            insert(RoomAvailableDate)
+            .values([{"room_id": room_id, "date": available_date} for available_date in dates])
+            .on_conflict_do_nothing(index_elements=["room_id", "date"])
+            .returning(RoomAvailableDate.date)
+        )
+        try:
+            created_dates: list[date] = sorted((await session.scalars(stmt)).all())
+            await RoomAvailabilityCalendarRepository.release_dates(
+                room_id=room_id,
+                dates=created_dates,
+                session=session
+            )
+            await session.commit()
+            return created_dates
+        except Exception:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not add new dates"
+            )
+        
+    @staticmethod
+    async def delete_room_available_dates(
         room_id: int,
         room_available_dates_dates: DatesToDelete,
-        session: Session
-    ) -> None:
+        session: AsyncSession
+    ) -> list[date]:
+        requested_dates: set[date] = set(room_available_dates_dates.dates)
+        # Чужой действующий захват дату не отдает; свой (по hold_id) - отдает
+        not_held_by_others = is_not_held()
+        if room_available_dates_dates.hold_id is not None:
+            not_held_by_others = or_(
+                not_held_by_others,
+                RoomAvailableDate.hold_id == room_available_dates_dates.hold_id
+            )
+        # Одним запросом забираем все даты; RETURNING показывает, какие реально были свободны
+        stmt = (
+            delete(RoomAvailableDate)
+            .where(
+                RoomAvailableDate.room_id == room_id,
+                RoomAvailableDate.date == any_(
+                    bindparam("dates", value=list(requested_dates), type_=ARRAY(DATE))
+                ),
+                not_held_by_others
+            )
+            .returning(RoomAvailableDate.date)
+        )
         try:
-            for room_available_dates_date in room_available_dates_dates.dates:
-                stmt = select(RoomAvailableDate).where(
-                    (RoomAvailableDate.date == room_available_dates_date) &
-                    (RoomAvailableDate.room_id == room_id)
-                )
-                room_available_date: RoomAvailableDate = session.scalars(stmt).first()
-                session.delete(room_available_date)
-                session.commit()
+            claimed_dates: set[date] = set((await session.scalars(stmt)).all())
+            # Строки room_available_date - источник истины, битовый календарь только зеркалим
+            await RoomAvailabilityCalendarRepository.claim_dates(
+                room_id=room_id,
+                dates=claimed_dates,
+                session=session
+            )
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not delete date"
             )
+        missing_dates: list[date] = sorted(requested_dates - claimed_dates)
+        if missing_dates:
+            # Все или ничего: если хоть одной даты нет, календарь не трогаем
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Not all dates are available",
+                    "missing_dates": [missing_date.isoformat() for missing_date in missing_dates]
+                }
+            )
+        await session.commit()
+        return sorted(claimed_dates)
+
+
+    @staticmethod
+    async def hold_room_available_dates(
+        room_id: int,
+        date_from: date,
+        date_to: date,
+        ttl: int,
+        session: AsyncSession
+    ) -> tuple[uuid.UUID, datetime, list[date]]:
+        # Один атомарный UPDATE: конкурент, захвативший даты раньше, блокирует строки,
+        # и после его commit условие is_not_held() для нас уже ложно
+        hold_id: uuid.UUID = uuid.uuid4()
+        stmt = (
+            update(RoomAvailableDate)
+            .where(
+                RoomAvailableDate.room_id == room_id,
+                RoomAvailableDate.date.between(date_from, date_to),
+                is_not_held()
+            )
+            .values(
+                held_until=func.now() + timedelta(seconds=ttl),
+                hold_id=hold_id
+            )
+            .returning(RoomAvailableDate.date, RoomAvailableDate.held_until)
+        )
+        try:
+            rows = (await session.execute(stmt)).all()
+        except Exception:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can not hold dates"
+            )
+        held_dates: set[date] = {row.date for row in rows}
+        days: int = (date_to - date_from).days + 1
+        if len(held_dates) != days:
+            # Все или ничего: захват частично не оставляем
+            await session.rollback()
+            missing_dates = [
+                date_from + timedelta(days=day)
+                for day in range(days)
+                if date_from + timedelta(days=day) not in held_dates
+            ]
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Not all dates are available",
+                    "missing_dates": [missing_date.isoformat() for missing_date in missing_dates]
+                }
+            )
+        await session.commit()
+        return hold_id, rows[0].held_until, sorted(held_dates)
+
+    @staticmethod
+    async def release_hold(
+        room_id: int,
+        hold_id: uuid.UUID,
+        session: AsyncSession
+    ) -> list[date]:
+        stmt = (
+            update(RoomAvailableDate)
+            .where(
+                RoomAvailableDate.room_id == room_id,
+                RoomAvailableDate.hold_id == hold_id
+            )
+            .values(held_until=None, hold_id=None)
+            .returning(RoomAvailableDate.date)
+        )
+        released_dates: list[date] = sorted((await session.scalars(stmt)).all())
+        await session.commit()
+        return released_dates
+
+    @staticmethod
+    async def release_expired_holds(
+        session: AsyncSession
+    ) -> int:
+        # Истекший захват и так не мешает (см. is_not_held), это уборка для частичного индекса
+        result = await session.execute(
+            update(RoomAvailableDate)
+            .where(RoomAvailableDate.held_until < func.now())
+            .values(held_until=None, hold_id=None)
+        )
+        await session.commit()
+        return result.rowcount
 
 
 # Зависимость для получения репозитория
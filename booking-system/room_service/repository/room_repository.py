@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
+from datetime import date
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Row, and_, func, not_, select
 from sqlalchemy.orm import selectinload
-from room.models import Room
+from room.enums import RoomType
+from room.models import Room, RoomAvailableDate, RoomTypeInfo
 from room.schemas.room_schemas import RoomIn, RoomUpdate
-from database.database import Session
+from database.database import AsyncSession
+from repository.room_availability_calendar_repository import RoomAvailabilityCalendarRepository
+from repository.room_available_date_repository import is_not_held
 
 
 class AbstractRepository(ABC):
@@ -14,6 +18,11 @@ class AbstractRepository(ABC):
     def get_rooms():
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def search_rooms():
+        raise NotImplementedError
+
     @staticmethod
     @abstractmethod
     def create_room():
@@ -32,50 +41,156 @@ class AbstractRepository(ABC):
 
 class RoomRepository(AbstractRepository):
     @staticmethod
-    def get_rooms(
-        session: Session,
+    async def get_rooms(
+        session: AsyncSession,
+        date_from: date,
+        date_to: date,
+        include_available_dates: bool = False,
         **filters
-    ) -> list[Room]:
+    ) -> list[Row[tuple[Room, date | None, int]]]:
         skip = filters.pop('skip', 0)
         limit = filters.pop('limit', 10)
-        stmt = (
-            select(Room)
-            .options(
-                selectinload(Room.available_dates),
-                selectinload(Room.room_types)
+        after_id: int | None = filters.pop('after_id', None)
+        # Тип и свободная дата - не колонки room, filter_by их не применит
+        room_type: RoomType | None = filters.pop('type', None)
+        available_date: date | None = filters.pop('available_dates', None)
+        # Сводка считается коррелированными подзапросами по индексу (room_id, date)
+        # и только для номеров текущей страницы
+        next_free_date = (
+            select(func.min(RoomAvailableDate.date))
+            .where(
+                RoomAvailableDate.room_id == Room.id,
+                RoomAvailableDate.date >= date_from
+            )
+            .scalar_subquery()
+        )
+        free_days = (
+            select(func.count())
+            .select_from(RoomAvailableDate)
+            .where(
+                RoomAvailableDate.room_id == Room.id,
+                RoomAvailableDate.date.between(date_from, date_to)
+            )
+            .scalar_subquery()
+        )
+        options = [selectinload(Room.room_types)]
+        if include_available_dates:
+            # Календарь отдаем только в пределах запрошенного окна
+            options.append(
+                selectinload(
+                    Room.available_dates.and_(
+                        RoomAvailableDate.date.between(date_from, date_to)
+                    )
                 )
+            )
+        stmt = (
+            select(
+                Room,
+                next_free_date.label("next_free_date"),
+                free_days.label("free_days")
+            )
+            .options(*options)
             .filter_by(**filters)
-            .offset(skip)
+            .where(*RoomRepository.room_conditions(
+                room_type=room_type,
+                available_date=available_date
+            ))
             .limit(limit)
             .order_by(Room.id)
         )
-        rooms: list[Room] = session.scalars(stmt).all()
+        # Курсор - keyset по первичному ключу, без OFFSET
+        if after_id is not None:
+            stmt = stmt.where(Room.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        rooms = (await session.execute(stmt)).all()
         return rooms
     
     @staticmethod
-    def create_room(
-        session: Session,
+    def room_conditions(
+        room_type: RoomType | None = None,
+        available_date: date | None = None,
+        price_min: int | None = None,
+        price_max: int | None = None,
+    ) -> list:
+        conditions = []
+        if room_type is not None:
+            conditions.append(Room.room_types.any(RoomTypeInfo.name == room_type))
+        if available_date is not None:
+            conditions.append(Room.available_dates.any(RoomAvailableDate.date == available_date))
+        if price_min is not None:
+            conditions.append(Room.price >= price_min)
+        if price_max is not None:
+            conditions.append(Room.price <= price_max)
+        return conditions
+
+    @staticmethod
+    async def search_rooms(
+        session: AsyncSession,
+        check_in: date,
+        check_out: date,
+        after_id: int | None = None,
+        limit: int = 10,
+        room_type: RoomType | None = None,
+        price_min: int | None = None,
+        price_max: int | None = None,
+    ) -> list[Room]:
+        # Номера, у которых свободен каждый день диапазона, берем из битового
+        # календаря: строка на (номер, год) вместо строки на день
+        free_rooms = RoomAvailabilityCalendarRepository.get_free_rooms(
+            date_from=check_in,
+            date_to=check_out
+        ).subquery()
+        stmt = (
+            select(Room)
+            .join(free_rooms, free_rooms.c.room_id == Room.id)
+            .options(selectinload(Room.room_types))
+            .where(
+                # Календарь захватов не знает: номер с действующим захватом в диапазоне не свободен
+                ~Room.available_dates.any(and_(
+                    RoomAvailableDate.date.between(check_in, check_out),
+                    not_(is_not_held())
+                )),
+                *RoomRepository.room_conditions(
+                    room_type=room_type,
+                    price_min=price_min,
+                    price_max=price_max
+                )
+            )
+            .order_by(Room.id)
+            .limit(limit)
+        )
+        # Курсор - keyset по первичному ключу
+        if after_id is not None:
+            stmt = stmt.where(Room.id > after_id)
+        rooms: list[Room] = (await session.scalars(stmt)).all()
+        return rooms
+
+    @staticmethod
+    async def create_room(
+        session: AsyncSession,
         room_in: RoomIn
     ) -> Room:
         try:
-            room = Room(**room_in.model_dump())
+            # Пустые коллекции сразу помечены загруженными - без lazy load после commit
+            room = Room(**room_in.model_dump(), available_dates=[], room_types=[])
             session.add(room)
-            session.commit()
+            await session.commit()
             return room
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not add new room"
             )    
 
     @staticmethod
-    def update_room(
-        session: Session,
+    async def update_room(
+        session: AsyncSession,
         room_update: RoomUpdate,
         room_id: int
     ) -> Room:
-        room: Room = session.get(Room, room_id)
+        room: Room = await session.get(Room, room_id)
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, 
@@ -84,34 +199,34 @@ class RoomRepository(AbstractRepository):
         try:
             for name, value in room_update.model_dump(exclude_unset=True).items():
                 setattr(room, name, value)
-            session.commit()
-            room_with_dates_and_types = (
-                session.query(Room)
+            await session.commit()
+            room_with_dates_and_types: Room = await session.scalar(
+                select(Room)
                 .filter_by(id=room_id)
                 .options(
                     selectinload(Room.available_dates),
                     selectinload(Room.room_types)
                 )
-            ).first()
+            )
             return room_with_dates_and_types
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not update room"
             )
         
     @staticmethod
-    def delete_room(
-        session: Session,
+    async def delete_room(
+        session: AsyncSession,
         room_id: int
     ) -> None:
         try:
-            room: Room = session.get(Room, room_id)
-            session.delete(room)
-            session.commit()
+            room: Room = await session.get(Room, room_id)
+            await session.delete(room)
+            await session.commit()
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not delete room"
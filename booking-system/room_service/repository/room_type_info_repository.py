@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 
 from fastapi import HTTPException, status
+from sqlalchemy import select
 from room.schemas.room_type_schemas import RoomTypeInfoIn
-from database.database import Session
+from database.database import AsyncSession
 from room.models import RoomTypeInfo
 
 
@@ -25,41 +26,43 @@ class AbstractRepository(ABC):
 
 class RoomTypeInfoRepository(AbstractRepository):
     @staticmethod
-    def get_room_type_info(
+    async def get_room_type_info(
         room_id: int,
-        session: Session,
+        session: AsyncSession,
     ) -> list[RoomTypeInfo]:
-        room_types_info: list[RoomTypeInfo] = session.query(RoomTypeInfo).filter_by(room_id=room_id).all()
+        room_types_info: list[RoomTypeInfo] = (
+            await session.scalars(select(RoomTypeInfo).filter_by(room_id=room_id))
+        ).all()
         return room_types_info
     
     @staticmethod
-    def create_room_type(
+    async def create_room_type(
         room_type_info_in: RoomTypeInfoIn,
-        session: Session
+        session: AsyncSession
     ) -> RoomTypeInfo:
         try:
             room_type_info: RoomTypeInfo = RoomTypeInfo(**room_type_info_in.model_dump())
             session.add(room_type_info)
-            session.commit()
+            await session.commit()
             return room_type_info
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not add new room type"
             )
 
     @staticmethod
-    def delete_room_type(
-        session: Session,
+    async def delete_room_type(
+        session: AsyncSession,
         room_type_info_id: int
     ) -> None:
         try:
-            room_type_info: RoomTypeInfo = session.get(RoomTypeInfo, room_type_info_id)
-            session.delete(room_type_info)
-            session.commit()
+            room_type_info: RoomTypeInfo = await session.get(RoomTypeInfo, room_type_info_id)
+            await session.delete(room_type_info)
+            await session.commit()
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can not delete room type"
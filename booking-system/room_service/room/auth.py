@@ -0,0 +1,132 @@
+import base64
+import binascii
+import hmac
+import json
+import time
+from collections import OrderedDict
+from threading import Lock
+
+import jwt
+from jwt.algorithms import get_default_algorithms
+
+from room.schemas.token import ServiceTokenPayload, TokenPayload
+from room.schemas.user import User
+from config import settings
+
+
+# Право сервисного токена booking_service вернуть даты номеру (восстановление саги)
+ROOM_DATES_RESTORE_SCOPE = "room_available_date:restore"
+
+
+# PEM разбирается в объект ключа один раз при импорте, а не на каждый запрос
+public_key = get_default_algorithms()[settings.auth_jwt.algorithm].prepare_key(
+    settings.auth_jwt.public_key
+)
+booking_service_public_key = get_default_algorithms()[settings.auth_jwt.algorithm].prepare_key(
+    settings.auth_jwt.booking_service_public_key
+)
+
+
+class TokenCache:
+    """Ограниченный LRU-кэш проверенных токенов по jti.
+
+    Запись живет до exp токена. Вместе с payload и пользователем хранится
+    сам токен: попадание засчитывается только при полном совпадении строки,
+    поэтому чужой токен с тем же jti подпись не обойдет.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[str, tuple[str, TokenPayload, User]] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, jti: str, token: str) -> tuple[TokenPayload, User] | None:
+        with self.lock:
+            entry = self.entries.get(jti)
+            if entry is None:
+                return None
+            cached_token, payload, user = entry
+            if not hmac.compare_digest(cached_token, token):
+                return None
+            if payload.exp <= time.time():
+                del self.entries[jti]
+                return None
+            self.entries.move_to_end(jti)
+            return payload, user
+
+    def put(self, token: str, payload: TokenPayload, user: User) -> None:
+        with self.lock:
+            self.entries[payload.jti] = (token, payload, user)
+            self.entries.move_to_end(payload.jti)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache(maxsize=settings.auth_jwt.token_cache_size)
+
+
+def get_unverified_payload(token: str) -> dict:
+    # Только base64 + json сегмента payload, без проверки подписи:
+    # годится лишь для выбора ключа кэша или ключа проверки
+    try:
+        segment = token.split(".")[1]
+        payload = json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+    except (IndexError, ValueError, binascii.Error):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def get_unverified_jti(token: str) -> str | None:
+    jti = get_unverified_payload(token).get("jti")
+    return jti if isinstance(jti, str) else None
+
+
+def is_service_token(token: str) -> bool:
+    # Подпись проверит decode_service_token - ключом booking_service, а не authentication_service
+    return get_unverified_payload(token).get("type") == "service"
+
+
+def decode_token(token: str) -> tuple[TokenPayload, User]:
+    """Возвращает payload и пользователя токена, проверяя RS256-подпись только при промахе кэша.
+
+    Ошибки - jwt.PyJWTError и pydantic.ValidationError, как у jwt.decode.
+    """
+    jti = get_unverified_jti(token)
+    if jti is not None:
+        cached = token_cache.get(jti=jti, token=token)
+        if cached is not None:
+            return cached
+    payload = TokenPayload(
+        **jwt.decode(
+            jwt=token,
+            key=public_key,
+            algorithms=[settings.auth_jwt.algorithm]
+        )
+    )
+    user = User(
+        username=payload.username,
+        email=payload.email,
+        admin=payload.admin
+    )
+    token_cache.put(token=token, payload=payload, user=user)
+    return payload, user
+
+
+def decode_service_token(token: str) -> ServiceTokenPayload:
+    """Проверяет сервисный токен booking_service его публичным ключом.
+
+    Пользовательский ключ authentication_service такой токен не примет и наоборот.
+    Ошибки - jwt.PyJWTError и pydantic.ValidationError, как у decode_token.
+    """
+    return ServiceTokenPayload(
+        **jwt.decode(
+            jwt=token,
+            key=booking_service_public_key,
+            algorithms=[settings.auth_jwt.algorithm],
+            options={"require": ["exp"]}
+        )
+    )
@@ -0,0 +1,58 @@
+from datetime import date
+from typing import Iterable
+
+
+# Год хранится как BIT(366): первый (левый) бит - 1 января, бит 366 - 31 декабря високосного года
+DAYS_IN_BITMAP = 366
+
+
+class AvailabilityBitmap:
+    """Маски дней для календаря свободных дней номера на один год.
+
+    Внутри - обычный int (Python сам умеет побитовые операции над длинными числами),
+    наружу - строка из '0'/'1' длиной 366, которую Postgres приводит к BIT(366).
+    """
+
+    @staticmethod
+    def day_index(day: date) -> int:
+        return day.timetuple().tm_yday - 1
+
+    @staticmethod
+    def day_mask(day: date) -> int:
+        return 1 << (DAYS_IN_BITMAP - 1 - AvailabilityBitmap.day_index(day))
+
+    @staticmethod
+    def range_mask(date_from: date, date_to: date) -> int:
+        # Обе даты внутри одного года, границы включительные
+        start = AvailabilityBitmap.day_index(date_from)
+        end = AvailabilityBitmap.day_index(date_to)
+        return ((1 << (end - start + 1)) - 1) << (DAYS_IN_BITMAP - 1 - end)
+
+    @staticmethod
+    def dates_mask(dates: Iterable[date]) -> int:
+        mask = 0
+        for day in dates:
+            mask |= AvailabilityBitmap.day_mask(day)
+        return mask
+
+    @staticmethod
+    def mask_to_bits(mask: int) -> str:
+        return format(mask, f"0{DAYS_IN_BITMAP}b")
+
+
+def split_range_by_year(date_from: date, date_to: date) -> dict[int, int]:
+    """Маски диапазона [date_from, date_to] по годам: {год: маска}."""
+    masks: dict[int, int] = {}
+    for year in range(date_from.year, date_to.year + 1):
+        start = max(date_from, date(year, 1, 1))
+        end = min(date_to, date(year, 12, 31))
+        masks[year] = AvailabilityBitmap.range_mask(start, end)
+    return masks
+
+
+def split_dates_by_year(dates: Iterable[date]) -> dict[int, int]:
+    """Маски произвольного набора дат по годам: {год: маска}."""
+    masks: dict[int, int] = {}
+    for day in dates:
+        masks[day.year] = masks.get(day.year, 0) | AvailabilityBitmap.day_mask(day)
+    return masks
@@ -3,11 +3,15 @@ from sqlalchemy import (
     ForeignKey, 
     MetaData,
     UniqueConstraint, 
+    Index,
     func,
     Enum,
     DATE,
-    Date
+    Date,
+    Uuid
 )
+from sqlalchemy.dialects.postgresql import BIT
+import uuid
 from datetime import date, datetime
 
 from sqlalchemy.orm import (
@@ -21,6 +25,7 @@ from sqlalchemy.orm import (
 from config import settings
 
 from room.enums import RoomType
+from room.availability_bitmap import DAYS_IN_BITMAP
     
 
 
@@ -42,11 +47,36 @@ class RoomAvailableDate(Base):
 
     room_id: Mapped[int] = mapped_column(ForeignKey('room.id'))
     date: Mapped[Date] = mapped_column(DATE)
+    # Короткий захват даты под бронирование: до held_until забрать ее можно только с этим hold_id
+    held_until: Mapped[datetime | None] = mapped_column(TIMESTAMP)
+    hold_id: Mapped[uuid.UUID | None] = mapped_column(Uuid)
     
     room = relationship("Room", back_populates="available_dates")
 
     __table_args__ = (
         UniqueConstraint('room_id', 'date'), 
+        # Для поиска свободных номеров по диапазону дат
+        Index('ix_room_available_date_date_room_id', 'date', 'room_id'),
+        # Для фоновой очистки истекших захватов: в индексе только захваченные даты
+        Index(
+            'ix_room_available_date_held_until',
+            'held_until',
+            postgresql_where=held_until.isnot(None)
+        ),
+    )
+
+
+class RoomAvailabilityCalendar(Base):
+    __tablename__= "room_availability_calendar"
+
+    # Календарь - производные данные: удаляется вместе с номером
+    room_id: Mapped[int] = mapped_column(ForeignKey('room.id', ondelete="CASCADE"))
+    year: Mapped[int]
+    # Бит на каждый день года: 1 - день свободен (см. room/availability_bitmap.py)
+    days: Mapped[str] = mapped_column(BIT(DAYS_IN_BITMAP))
+
+    __table_args__ = (
+        UniqueConstraint('room_id', 'year'), 
     )
 
 
@@ -1,13 +1,26 @@
 from datetime import date
+from uuid import UUID
 import logging
 from typing import Annotated
 from service.room_available_date_service import RoomAvailableDateService, get_room_available_date_service
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import db_helper
-from room.schemas.room_available_date_schemas import RoomAvailableDateOut, RoomAvailableDateIn, DatesToDelete
+from room.schemas.room_available_date_schemas import (
+    RoomAvailableDateOut, 
+    RoomAvailableDateIn, 
+    DatesToDelete,
+    RoomAvailabilityCheckOut,
+    ReservedDatesOut,
+    RestoredDatesOut,
+    DateRangeIn,
+    HoldIn,
+    HoldOut
+)
+from room.schemas.token import ServiceTokenPayload
 from room.schemas.user import User
-from room.utils import get_current_active_user, get_admin_user, reusable_oauth
+from room.utils import get_current_active_user, get_admin_user, get_user_or_service, reusable_oauth
+from room.auth import ROOM_DATES_RESTORE_SCOPE
 
 # Logger setup
 logging.basicConfig(
@@ -26,47 +39,116 @@ router = APIRouter(
 
 
 @router.get("/{room_id}/", response_model=list[RoomAvailableDateOut])
-def get_room_available_dates(
+async def get_room_available_dates(
     room_id: int,
     user: Annotated[User, Depends(get_current_active_user)],
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     room_available_date_service: Annotated[RoomAvailableDateService, Depends(get_room_available_date_service)]
 ) -> list[RoomAvailableDateOut]:
     if user:
-        return room_available_date_service.get_room_available_dates_by_id(
+        return await room_available_date_service.get_room_available_dates_by_id(
+            room_id=room_id,
+            session=session
+        )
+
+
+@router.get("/{room_id}/check/", response_model=RoomAvailabilityCheckOut)
+async def check_room_available_dates(
+    room_id: int,
+    user: Annotated[User, Depends(get_current_active_user)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
+    room_available_date_service: Annotated[RoomAvailableDateService, Depends(get_room_available_date_service)],
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+) -> RoomAvailabilityCheckOut:
+    if user:
+        return await room_available_date_service.check_room_available_dates(
             room_id=room_id,
+            date_from=date_from,
+            date_to=date_to,
             session=session
         )
 
 
 @router.post("/", response_model=RoomAvailableDateOut, status_code=status.HTTP_201_CREATED)
-def create_room_available_date(
+async def create_room_available_date(
     room_available_date_in: RoomAvailableDateIn,
     user: Annotated[User, Depends(get_current_active_user)],
     token: Annotated[str, Depends(reusable_oauth)],
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     room_available_date_service: Annotated[RoomAvailableDateService, Depends(get_room_available_date_service)]
 ) -> RoomAvailableDateOut:
     if user:
-        return room_available_date_service.create_room_available_date(
+        return await room_available_date_service.create_room_available_date(
             room_available_date_in=room_available_date_in,        
             session=session,
             token=token    
         )
 
 
-@router.delete("/{room_id}/", status_code=status.HTTP_204_NO_CONTENT)
-def delete_room_available_dates(
+@router.post("/{room_id}/bulk/", response_model=RestoredDatesOut, status_code=status.HTTP_201_CREATED)
+async def create_room_available_dates(
+    room_id: int,
+    date_range_in: DateRangeIn,
+    # Возврат дат: пользователь или booking_service с сервисным токеном (восстановление саги)
+    user: Annotated[User | ServiceTokenPayload, Depends(get_user_or_service(ROOM_DATES_RESTORE_SCOPE))],
+    token: Annotated[str, Depends(reusable_oauth)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
+    room_available_date_service: Annotated[RoomAvailableDateService, Depends(get_room_available_date_service)]
+) -> RestoredDatesOut:
+    if user:
+        return await room_available_date_service.create_room_available_dates(
+            room_id=room_id,
+            date_range_in=date_range_in,
+            session=session,
+            token=token
+        )
+
+
+@router.delete("/{room_id}/", response_model=ReservedDatesOut)
+async def delete_room_available_dates(
     room_id: int,
     room_available_dates_dates: DatesToDelete,
     user: Annotated[User, Depends(get_current_active_user)],
-    session: Annotated[Session, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     room_available_date_service: Annotated[RoomAvailableDateService, Depends(get_room_available_date_service)]
-) -> None:
+) -> ReservedDatesOut:
     if user:
-        return room_available_date_service.delete_room_available_dates(
+        return await room_available_date_service.delete_room_available_dates(
             room_available_dates_dates=room_available_dates_dates,
             session=session,
             room_id=room_id
         )
 
+
+@router.post("/{room_id}/hold/", response_model=HoldOut, status_code=status.HTTP_201_CREATED)
+async def hold_room_available_dates(
+    room_id: int,
+    hold_in: HoldIn,
+    user: Annotated[User, Depends(get_current_active_user)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
+    room_available_date_service: Annotated[RoomAvailableDateService, Depends(get_room_available_date_service)]
+) -> HoldOut:
+    # Даты захватываются на ttl секунд; забрать их (DELETE) можно только с этим hold_id
+    if user:
+        return await room_available_date_service.hold_room_available_dates(
+            room_id=room_id,
+            hold_in=hold_in,
+            session=session
+        )
+
+
+@router.delete("/{room_id}/hold/{hold_id}/", status_code=status.HTTP_204_NO_CONTENT)
+async def release_room_available_dates_hold(
+    room_id: int,
+    hold_id: UUID,
+    user: Annotated[User, Depends(get_current_active_user)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
+    room_available_date_service: Annotated[RoomAvailableDateService, Depends(get_room_available_date_service)]
+) -> None:
+    if user:
+        return await room_available_date_service.release_room_available_dates_hold(
+            room_id=room_id,
+            hold_id=hold_id,
+            session=session
+        )
@@ -1,12 +1,21 @@
+from datetime import date
 import logging
 from typing import Annotated, Any
 from service.room_service import RoomService, get_room_service
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import db_helper
-from room.schemas.room_schemas import RoomOut, RoomIn, RoomUpdate
+from room.schemas.room_schemas import (
+    RoomOut,
+    RoomIn,
+    RoomUpdate,
+    RoomListOut,
+    RoomWithDatesListOut,
+    RoomShortOut
+)
 from room.schemas.user import User
-from room.utils import get_current_active_user, get_admin_user, get_filters
+from room.utils import get_current_active_user, get_admin_user, get_filters, get_search_filters
+from room.pagination import set_next_cursor
 
 # Logger setup
 logging.basicConfig(
@@ -21,44 +30,70 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Room Operations"])
 
 
-@router.get("/", response_model=list[RoomOut])
-def get_rooms(
+@router.get("/", response_model=list[RoomWithDatesListOut | RoomListOut])
+async def get_rooms(
+    response: Response,
     room_service: Annotated[RoomService, Depends(get_room_service)],
     user: Annotated[User, Depends(get_current_active_user)],
-    session : Annotated[Session, Depends(db_helper.session_getter)],
+    session : Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
     filters: dict[str, Any] = Depends(get_filters),
-) -> list[RoomOut]:
+    include: str | None = Query(default=None),
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+) -> list[RoomWithDatesListOut | RoomListOut]:
+    if user:
+        rooms = await room_service.list_rooms(
+            session=session,
+            include=include,
+            date_from=date_from,
+            date_to=date_to,
+            **filters
+        )
+        set_next_cursor(response=response, items=rooms, limit=filters['limit'])
+        return rooms
+
+
+@router.get("/search/", response_model=list[RoomShortOut])
+async def search_rooms(
+    response: Response,
+    room_service: Annotated[RoomService, Depends(get_room_service)],
+    user: Annotated[User, Depends(get_current_active_user)],
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)],
+    filters: dict[str, Any] = Depends(get_search_filters),
+) -> list[RoomShortOut]:
     if user:
-        return room_service.list_rooms(
+        rooms = await room_service.search_rooms(
             session=session,
             **filters
         )
+        set_next_cursor(response=response, items=rooms, limit=filters['limit'])
+        return rooms
 
 
 @router.post("/", response_model=RoomOut, status_code=status.HTTP_201_CREATED)
-def create_room(
+async def create_room(
     room_in: RoomIn,
     user: Annotated[User, Depends(get_admin_user)],
     room_service: Annotated[RoomService, Depends(get_room_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
 ) -> RoomOut:
     if user:
-        return room_service.create_room(
+        return await room_service.create_room(
             room_in=room_in,
             session=session,
         )
 
 
 @router.patch("/{room_id}/", response_model=RoomOut)
-def update_room(
+async def update_room(
     room_id: int,
     room_update: RoomUpdate,
     user: Annotated[User, Depends(get_admin_user)],
     room_service: Annotated[RoomService, Depends(get_room_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
 ) -> RoomOut:
     if user:
-        return room_service.update_room(
+        return await room_service.update_room(
             room_id=room_id,
             room_update=room_update,
             session=session,
@@ -66,14 +101,14 @@ def update_room(
 
 
 @router.delete("/{room_id}/", status_code=status.HTTP_204_NO_CONTENT)
-def delete_room(
+async def delete_room(
     room_id: int,
     user: Annotated[User, Depends(get_admin_user)],
     room_service: Annotated[RoomService, Depends(get_room_service)],
-    session: Annotated[Session, Depends(db_helper.session_getter)]
+    session: Annotated[AsyncSession, Depends(db_helper.async_session_getter)]
 ) -> None:
     if user:
-        return room_service.delete_room(
+        return await room_service.delete_room(
             room_id=room_id,
             session=session
         )
\ No newline at end of file
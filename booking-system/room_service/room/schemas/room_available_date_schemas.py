@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from datetime import date
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime
 
 
 class RoomAvailableDateBase(BaseModel):
@@ -22,4 +23,42 @@ class RoomAvailableDateOut(RoomAvailableDate):
 
 
 class DatesToDelete(BaseModel):
-    dates: list[str]
\ No newline at end of file
+    dates: list[date]
+    # Захваченные даты можно забрать только по id захвата
+    hold_id: UUID | None = None
+
+
+class RoomDates(BaseModel):
+    room_id: int
+    dates: list[date]
+
+
+class ReservedDatesOut(RoomDates):
+    pass
+
+
+class RestoredDatesOut(RoomDates):
+    pass
+
+
+class DateRangeIn(BaseModel):
+    date_from: date
+    date_to: date
+
+
+class HoldIn(DateRangeIn):
+    # Секунды; без значения - settings.hold.default_ttl, не больше settings.hold.max_ttl
+    ttl: int | None = Field(default=None, gt=0)
+
+
+class HoldOut(RoomDates):
+    hold_id: UUID
+    held_until: datetime
+
+
+class RoomAvailabilityCheckOut(BaseModel):
+    room_id: int
+    date_from: date
+    date_to: date
+    available: bool
+    missing_dates: list[date] = []
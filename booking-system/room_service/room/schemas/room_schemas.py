@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, ConfigDict
 from room.schemas.room_type_schemas import RoomTypeInfo
 from room.schemas.room_available_date_schemas import RoomAvailableDate
@@ -22,6 +22,23 @@ class RoomOut(RoomBase):
     updated_at: datetime
     room_types: list[RoomTypeInfo]
     available_dates: list[RoomAvailableDate]
+
+
+class RoomShortOut(RoomBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    room_types: list[RoomTypeInfo]
+
+
+class RoomListOut(RoomShortOut):
+    # Сводка по окну [from, to] вместо полного календаря
+    next_free_date: date | None = None
+    free_days: int = 0
+
+
+class RoomWithDatesListOut(RoomListOut):
+    available_dates: list[RoomAvailableDate]
     
 
 
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -11,4 +13,16 @@ class TokenPayload(BaseModel):
     email: str
     admin: bool
     jti: str
-    iat: int
\ No newline at end of file
+    iat: int
+
+
+class ServiceTokenPayload(BaseModel):
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+    type: Literal["service"]
+    # Имя сервиса, а не пользователя
+    sub: str
+    scope: list[str]
+    exp: int
+    jti: str
+    iat: int
@@ -8,8 +8,10 @@ from datetime import (
     datetime
 )
 
+from room.schemas.token import ServiceTokenPayload
 from room.schemas.user import User
-from room.schemas.token import TokenPayload
+from room.auth import decode_service_token, decode_token, is_service_token
+from room.pagination import resolve_after_id
 
 from fastapi import (
     Depends,
@@ -25,7 +27,6 @@ from pydantic import (
     ValidationError
 )
 
-from config import settings
 
 
 
@@ -37,13 +38,7 @@ reusable_oauth = OAuth2PasswordBearer(
 
 def get_current_user(token: str = Depends(reusable_oauth)) -> User:
     try:
-        payload = jwt.decode(
-            jwt=token,
-            key=settings.auth_jwt.public_key,
-            algorithms=[settings.auth_jwt.algorithm]
-        )
-
-        token_data: TokenPayload = TokenPayload(**payload)
+        token_data, user = decode_token(token)
         if datetime.fromtimestamp(token_data.exp) < datetime.now():
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,12 +51,6 @@ def get_current_user(token: str = Depends(reusable_oauth)) -> User:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user: User = User(
-        username=token_data.username,
-        email=token_data.email,
-        admin=token_data.admin
-    )
-
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -88,6 +77,28 @@ def get_admin_user(user: Annotated[User, Depends(get_current_active_user)]) -> U
     )
 
 
+def get_user_or_service(scope: str):
+    """Зависимость для межсервисных эндпоинтов: активный пользователь или сервис с правом scope."""
+    def get_caller(token: str = Depends(reusable_oauth)) -> User | ServiceTokenPayload:
+        if not is_service_token(token):
+            return get_current_active_user(get_current_user(token))
+        try:
+            service = decode_service_token(token)
+        except (jwt.PyJWTError, ValidationError):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if scope not in service.scope:
+            raise HTTPException(
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                detail="Not enough rights"
+            )
+        return service
+    return get_caller
+
+
 def get_filters(
     id: Optional[int] = Query(default=None, ge=0),
     number: Optional[str] = Query(default=None),
@@ -97,6 +108,7 @@ def get_filters(
     available_dates: Optional[date] = Query(default=None),
     skip: int = Query(default=0, ge=0), 
     limit: int = Query(default=10, ge=1),
+    cursor: Optional[str] = Query(default=None),
 ) -> dict[str, Any]:
     filters = {}
     if id:
@@ -113,4 +125,25 @@ def get_filters(
         filters['available_dates'] = available_dates
     filters['skip'] = skip
     filters['limit'] = limit
-    return filters
\ No newline at end of file
+    filters['after_id'] = resolve_after_id(cursor=cursor, skip=skip)
+    return filters
+
+
+def get_search_filters(
+    check_in: date = Query(),
+    check_out: date = Query(),
+    type: Optional[RoomType] = Query(default=None),
+    price_min: Optional[int] = Query(default=None, ge=0),
+    price_max: Optional[int] = Query(default=None, ge=0),
+    limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+) -> dict[str, Any]:
+    return {
+        'check_in': check_in,
+        'check_out': check_out,
+        'room_type': type,
+        'price_min': price_min,
+        'price_max': price_max,
+        'after_id': resolve_after_id(cursor=cursor, skip=0),
+        'limit': limit
+    }
\ No newline at end of file
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+from config import settings
+from database import db_helper
+from repository.room_available_date_repository import RoomAvailableDateRepository, get_room_available_date_repository
+
+# Logger setup
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(filename)s:%(lineno)s - %(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Use a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class HoldSweeper:
+    """Фоновая задача, которая снимает истекшие захваты дат.
+
+    Истекший захват уже не мешает ни новому захвату, ни бронированию,
+    поэтому задача нужна не для корректности, а чтобы held_until/hold_id
+    не копились и частичный индекс по held_until оставался маленьким.
+    """
+    task: asyncio.Task | None = None
+
+    def __init__(
+        self,
+        interval: float,
+        room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
+    ) -> None:
+        self.interval = interval
+        self.room_available_date_repository = room_available_date_repository
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+            logger.info("Hold sweeper started")
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+            logger.info("Hold sweeper stopped")
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Hold sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> int:
+        async with db_helper.async_session_factory() as session:
+            released: int = await self.room_available_date_repository.release_expired_holds(
+                session=session
+            )
+        if released:
+            logger.info(f"Released {released} expired date holds")
+        return released
+
+
+hold_sweeper = HoldSweeper(interval=settings.hold.sweep_interval)
+
+
+# Зависимость для получения задачи очистки захватов
+def get_hold_sweeper() -> HoldSweeper:
+    return hold_sweeper
@@ -1,43 +1,73 @@
 from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from uuid import UUID
 
 from fastapi import HTTPException, status
-import httpx
-from sqlalchemy.orm import Session
-from room.schemas.room_available_date_schemas import DatesToDelete, RoomAvailableDateOut, RoomAvailableDateIn
+from sqlalchemy.ext.asyncio import AsyncSession
+from room.schemas.room_available_date_schemas import (
+    DatesToDelete, 
+    RoomAvailableDateOut, 
+    RoomAvailableDateIn,
+    RoomAvailabilityCheckOut,
+    ReservedDatesOut,
+    RestoredDatesOut,
+    DateRangeIn,
+    HoldIn,
+    HoldOut
+)
 from room.schemas.user import User
 from room.models import RoomAvailableDate
+from config import settings
+from clients.booking_client import BookingServiceClient, get_booking_client
 from repository.room_available_date_repository import RoomAvailableDateRepository, get_room_available_date_repository
 
 
-BOOKING_MICROSERVICE_URL = "http://booking_service:8003"
-BOOKING = "booking"
-
 class AbstractService(ABC):
     @staticmethod
     @abstractmethod
     def get_room_available_dates_by_id():
         raise NotImplementedError
     
+    @staticmethod
+    @abstractmethod
+    def check_room_available_dates():
+        raise NotImplementedError
+    
     @staticmethod
     @abstractmethod
     def create_room_available_date():
         raise NotImplementedError
     
+    @staticmethod
+    @abstractmethod
+    def create_room_available_dates():
+        raise NotImplementedError
+    
 
     @staticmethod
     @abstractmethod
     def delete_room_available_dates():
         raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def hold_room_available_dates():
+        raise NotImplementedError
+
+    @staticmethod
+    @abstractmethod
+    def release_room_available_dates_hold():
+        raise NotImplementedError
     
 
 class RoomAvailableDateService(AbstractService):
     @staticmethod
-    def get_room_available_dates_by_id(
+    async def get_room_available_dates_by_id(
         room_id: int,
-        session: Session,
+        session: AsyncSession,
         room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
     ) -> list[RoomAvailableDateOut]:
-        dates: list[RoomAvailableDate] = room_available_date_repository.get_room_available_dates(
+        dates: list[RoomAvailableDate] = await room_available_date_repository.get_room_available_dates(
             session=session,
             room_id=room_id
         )
@@ -46,35 +76,68 @@ class RoomAvailableDateService(AbstractService):
 
 
     @staticmethod
-    def create_room_available_date(
-        session: Session,
+    async def check_room_available_dates(
+        room_id: int,
+        date_from: date,
+        date_to: date,
+        session: AsyncSession,
+        room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
+    ) -> RoomAvailabilityCheckOut:
+        if date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'to' date must not be earlier than 'from' date"
+            )
+        # Границы включительные, как и у бронирования
+        days: int = (date_to - date_from).days + 1
+        count: int = await room_available_date_repository.count_room_available_dates(
+            room_id=room_id,
+            date_from=date_from,
+            date_to=date_to,
+            session=session
+        )
+        missing_dates: list[date] = []
+        if count != days:
+            # Даты читаем только при промахе и только внутри запрошенного диапазона
+            available_dates = set(await room_available_date_repository.get_room_available_dates_in_range(
+                room_id=room_id,
+                date_from=date_from,
+                date_to=date_to,
+                session=session
+            ))
+            missing_dates = [
+                date_from + timedelta(days=day)
+                for day in range(days)
+                if date_from + timedelta(days=day) not in available_dates
+            ]
+        return RoomAvailabilityCheckOut(
+            room_id=room_id,
+            date_from=date_from,
+            date_to=date_to,
+            available=not missing_dates,
+            missing_dates=missing_dates
+        )
+
+
+    @staticmethod
+    async def create_room_available_date(
+        session: AsyncSession,
         token: str,
         room_available_date_in: RoomAvailableDateIn,
         room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
+        booking_client: BookingServiceClient = get_booking_client(),
     ) -> RoomAvailableDateOut:
-        with httpx.Client() as client:
-            headers = {"Authorization": f"Bearer {token}"}
-            url = f"{BOOKING_MICROSERVICE_URL}/{BOOKING}/"
-            try:
-                response = client.get(
-                    url=url,
-                    headers=headers,
-                    params={
-                        'check_date': room_available_date_in.date
-                    }
-                )
-                response_data = response.json()
-                print(response_data)
-                if response_data:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST, 
-                        detail="The room is already booked for this date."
-                    )
-            except httpx.HTTPStatusError as exc:
-                raise HTTPException(status_code=exc.response.status_code, detail=str(exc))
-            except httpx.ConnectError as exc:
-                raise HTTPException(status_code=500, detail=f"Connection refused: {str(exc)}")
-        room_available_date: RoomAvailableDate = room_available_date_repository.create_room_available_date(
+        booked_dates: list[date] = await booking_client.get_booked_dates(
+            room_id=room_available_date_in.room_id,
+            dates=[room_available_date_in.date],
+            token=token
+        )
+        if booked_dates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, 
+                detail="The room is already booked for this date."
+            )
+        room_available_date: RoomAvailableDate = await room_available_date_repository.create_room_available_date(
             session=session,
             room_available_date_in=room_available_date_in
         )
@@ -83,17 +146,105 @@ class RoomAvailableDateService(AbstractService):
 
 
     @staticmethod
-    def delete_room_available_dates(
+    async def create_room_available_dates(
+        room_id: int,
+        date_range_in: DateRangeIn,
+        session: AsyncSession,
+        token: str,
+        room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
+        booking_client: BookingServiceClient = get_booking_client(),
+    ) -> RestoredDatesOut:
+        if date_range_in.date_to < date_range_in.date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'date_to' must not be earlier than 'date_from'"
+            )
+        days: int = (date_range_in.date_to - date_range_in.date_from).days + 1
+        dates: list[date] = [date_range_in.date_from + timedelta(days=day) for day in range(days)]
+        # Один запрос в booking_service на весь набор дат вместо запроса на каждую дату
+        booked_dates: list[date] = await booking_client.get_booked_dates(
+            room_id=room_id,
+            dates=dates,
+            token=token
+        )
+        if booked_dates:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "The room is already booked for some of these dates.",
+                    "dates": [booked_date.isoformat() for booked_date in booked_dates]
+                }
+            )
+        restored_dates: list[date] = await room_available_date_repository.create_room_available_dates(
+            room_id=room_id,
+            dates=dates,
+            session=session
+        )
+        return RestoredDatesOut(
+            room_id=room_id,
+            dates=restored_dates
+        )
+
+
+    @staticmethod
+    async def delete_room_available_dates(
         room_id: int,
         room_available_dates_dates: DatesToDelete,
-        session: Session,
+        session: AsyncSession,
         room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
-    ) -> None:
-        return room_available_date_repository.delete_room_available_dates(
+    ) -> ReservedDatesOut:
+        reserved_dates: list[date] = await room_available_date_repository.delete_room_available_dates(
             room_available_dates_dates=room_available_dates_dates,
             session=session,
             room_id=room_id
         )
+        return ReservedDatesOut(
+            room_id=room_id,
+            dates=reserved_dates
+        )
+
+
+    @staticmethod
+    async def hold_room_available_dates(
+        room_id: int,
+        hold_in: HoldIn,
+        session: AsyncSession,
+        room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
+    ) -> HoldOut:
+        if hold_in.date_to < hold_in.date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'date_to' must not be earlier than 'date_from'"
+            )
+        ttl: int = min(hold_in.ttl or settings.hold.default_ttl, settings.hold.max_ttl)
+        hold_id, held_until, held_dates = await room_available_date_repository.hold_room_available_dates(
+            room_id=room_id,
+            date_from=hold_in.date_from,
+            date_to=hold_in.date_to,
+            ttl=ttl,
+            session=session
+        )
+        return HoldOut(
+            room_id=room_id,
+            dates=held_dates,
+            hold_id=hold_id,
+            held_until=held_until
+        )
+
+
+    @staticmethod
+    async def release_room_available_dates_hold(
+        room_id: int,
+        hold_id: UUID,
+        session: AsyncSession,
+        room_available_date_repository: RoomAvailableDateRepository = get_room_available_date_repository(),
+    ) -> None:
+        # Повторное снятие (или снятие истекшего захвата) - не ошибка
+        await room_available_date_repository.release_hold(
+            room_id=room_id,
+            hold_id=hold_id,
+            session=session
+        )
 
 
 # Зависимость для получения сервиса
@@ -1,17 +1,34 @@
 from abc import ABC, abstractmethod
+from datetime import date, timedelta
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from room.schemas.room_schemas import RoomIn, RoomOut, RoomUpdate
+from sqlalchemy.ext.asyncio import AsyncSession
+from room.schemas.room_schemas import (
+    RoomIn,
+    RoomOut,
+    RoomUpdate,
+    RoomListOut,
+    RoomWithDatesListOut,
+    RoomShortOut
+)
 from room.schemas.user import User
 from room.models import Room
 from repository.room_repository import RoomRepository, get_room_repository
 
+
+# Окно сводки по умолчанию, если from/to не переданы
+DEFAULT_AVAILABILITY_WINDOW_DAYS = 30
+
 class AbstractRoomService(ABC):
     @staticmethod
     @abstractmethod
     def list_rooms():
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def search_rooms():
+        raise NotImplementedError
+
     @staticmethod
     @abstractmethod
     def create_room():
@@ -31,26 +48,83 @@ class AbstractRoomService(ABC):
 
 class RoomService(AbstractRoomService):
     @staticmethod
-    def list_rooms(
-        session: Session,
+    async def list_rooms(
+        session: AsyncSession,
+        include: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
         room_repository: RoomRepository = get_room_repository(),
         **filters,
-    ) -> list[RoomOut]:
-        rooms: list[Room] = room_repository.get_rooms(
+    ) -> list[RoomListOut | RoomWithDatesListOut]:
+        if include not in (None, "available_dates"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only 'available_dates' can be included"
+            )
+        include_available_dates: bool = include == "available_dates"
+        if include_available_dates and (date_from is None or date_to is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'from' and 'to' are required to include available dates"
+            )
+        date_from = date_from or date.today()
+        date_to = date_to or date_from + timedelta(days=DEFAULT_AVAILABILITY_WINDOW_DAYS - 1)
+        if date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'to' date must not be earlier than 'from' date"
+            )
+        rooms = await room_repository.get_rooms(
             session=session,
+            date_from=date_from,
+            date_to=date_to,
+            include_available_dates=include_available_dates,
             **filters
         )
-        rooms_schemas = [RoomOut.model_validate(room, from_attributes=True) for room in rooms]
+        schema = RoomWithDatesListOut if include_available_dates else RoomListOut
+        rooms_schemas = [
+            schema.model_validate(room, from_attributes=True).model_copy(
+                update={
+                    "next_free_date": next_free_date,
+                    "free_days": free_days
+                }
+            )
+            for room, next_free_date, free_days in rooms
+        ]
         return rooms_schemas
 
 
     @staticmethod
-    def create_room(
-        session: Session,
+    async def search_rooms(
+        session: AsyncSession,
+        check_in: date,
+        check_out: date,
+        limit: int = 10,
+        room_repository: RoomRepository = get_room_repository(),
+        **filters,
+    ) -> list[RoomShortOut]:
+        if check_out < check_in:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'check_out' date must not be earlier than 'check_in' date"
+            )
+        rooms: list[Room] = await room_repository.search_rooms(
+            session=session,
+            check_in=check_in,
+            check_out=check_out,
+            limit=limit,
+            **filters
+        )
+        return [RoomShortOut.model_validate(room, from_attributes=True) for room in rooms]
+
+
+    @staticmethod
+    async def create_room(
+        session: AsyncSession,
         room_in: RoomIn,
         room_repository: RoomRepository = get_room_repository(),
     ) -> RoomOut:
-        room: Room = room_repository.create_room(
+        room: Room = await room_repository.create_room(
             session=session,
             room_in=room_in
         )
@@ -58,13 +132,13 @@ class RoomService(AbstractRoomService):
 
 
     @staticmethod
-    def update_room(
+    async def update_room(
         room_id: int,
-        session: Session,
+        session: AsyncSession,
         room_update: RoomUpdate,
         room_repository: RoomRepository = get_room_repository(),
     ) -> RoomOut:
-        room: Room = room_repository.update_room(
+        room: Room = await room_repository.update_room(
             room_id=room_id,
             session=session,
             room_update=room_update
@@ -74,12 +148,12 @@ class RoomService(AbstractRoomService):
     
 
     @staticmethod
-    def delete_room(
+    async def delete_room(
         room_id: int,
-        session: Session,
+        session: AsyncSession,
         room_repository: RoomRepository = get_room_repository()
     ) -> None:
-        return room_repository.delete_room(
+        return await room_repository.delete_room(
             room_id=room_id,
             session=session,
         ) 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from room.schemas.room_type_schemas import RoomTypeInfoIn, RoomTypeInfoOut
 from room.models import RoomTypeInfo
 from repository.room_type_info_repository import RoomTypeInfoRepository, get_room_type_info_repository
@@ -24,12 +24,12 @@ class AbstractService(ABC):
 
 class RoomTypeService(AbstractService):
     @staticmethod
-    def get_room_type_info(
+    async def get_room_type_info(
         room_id: int,
-        session: Session,
+        session: AsyncSession,
         room_type_info_repository: RoomTypeInfoRepository = get_room_type_info_repository(),
     ) -> list[RoomTypeInfoOut]:
-        room_types_info: list[RoomTypeInfoOut] = room_type_info_repository.get_room_type_info(
+        room_types_info: list[RoomTypeInfoOut] = await room_type_info_repository.get_room_type_info(
             session=session,
             room_id=room_id
         )
@@ -38,12 +38,12 @@ class RoomTypeService(AbstractService):
 
 
     @staticmethod
-    def create_room_type(
-        session: Session,
+    async def create_room_type(
+        session: AsyncSession,
         room_type_info_in: RoomTypeInfoIn,
         room_type_info_repository: RoomTypeInfoRepository = get_room_type_info_repository(),
     ) -> RoomTypeInfoOut:
-        room_type_info: RoomTypeInfo = room_type_info_repository.create_room_type(
+        room_type_info: RoomTypeInfo = await room_type_info_repository.create_room_type(
             session=session,
             room_type_info_in=room_type_info_in
         )
@@ -52,12 +52,12 @@ class RoomTypeService(AbstractService):
 
     
     @staticmethod
-    def delete_room_type(
-        session: Session,
+    async def delete_room_type(
+        session: AsyncSession,
         room_type_info_id: int,
         room_type_info_repository: RoomTypeInfoRepository = get_room_type_info_repository(),
     ) -> None:
-        return room_type_info_repository.delete_room_type(
+        return await room_type_info_repository.delete_room_type(
             session=session,
             room_type_info_id=room_type_info_id
         )